@@ -1,5 +1,6 @@
 import os.path
 import shutil
+import sys
 
 from setuptools import Command, setup
 from setuptools.command.build import build
@@ -34,13 +35,38 @@ class build_client(Command):
             shutil.copytree("client_build", self.client_dir)
 
 
+class build_shape_table(Command):
+    def initialize_options(self) -> None:
+        self.build_lib = None
+        self.editable_mode = False
+
+    def finalize_options(self) -> None:
+        self.set_undefined_options("build_py", ("build_lib", "build_lib"))
+
+    def run(self) -> None:
+        """Build the precomputed shape table file."""
+
+        if self.editable_mode or not self.build_lib:
+            return
+
+        sys.path.insert(0, "src")
+        from zundamahjong.mahjong.shape_table import write_shape_table_file
+
+        write_shape_table_file(
+            os.path.join(self.build_lib, "zundamahjong", "mahjong", "shape_table.bin")
+        )
+
+
 class custom_build(build):
-    sub_commands = [("build_client", None)] + build.sub_commands
+    sub_commands = (
+        [("build_client", None)] + build.sub_commands + [("build_shape_table", None)]
+    )
 
 
 setup(
     cmdclass={
         "build_client": build_client,
+        "build_shape_table": build_shape_table,
         "build": custom_build,
     },
 )
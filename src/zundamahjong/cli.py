@@ -29,15 +29,192 @@ dev_args.add_argument(
     "--vite-port", type=int, help="port on which to run the Vite development server"
 )
 
+subparsers = parser.add_subparsers(dest="command", title="commands")
+
+build_shape_table_parser = subparsers.add_parser(
+    "build-shape-table",
+    help="build the precomputed shape table file and exit",
+    description="Build the precomputed table of suit shapes, winning shapes"
+    + " and waits, which is loaded when the server starts.",
+)
+
+build_shape_table_parser.add_argument(
+    "-o",
+    "--output",
+    help="path of the file to write (defaults to the file inside the package)",
+)
+
+simulate_parser = subparsers.add_parser(
+    "simulate",
+    help="play games between computer players and exit",
+    description="Play games of mahjong between computer players without"
+    + " starting the server, and write the result of each round as a line of JSON.",
+)
+
+simulate_parser.add_argument(
+    "-n", "--games", type=int, default=100, help="number of games to play"
+)
+
+simulate_parser.add_argument(
+    "--seed", type=int, default=0, help="seed of the random number generators"
+)
+
+simulate_parser.add_argument(
+    "--policy",
+    action="append",
+    help="policy of the next player (random, greedy or tsumogiri);"
+    + " policies are repeated for the remaining players (defaults to greedy)",
+)
+
+simulate_parser.add_argument(
+    "--options", help="path of a JSON file with the game options to use"
+)
+
+simulate_parser.add_argument(
+    "--max-rounds",
+    type=int,
+    default=100,
+    help="largest number of rounds to play in each game",
+)
+
+simulate_parser.add_argument(
+    "-j",
+    "--workers",
+    type=int,
+    help="number of worker processes (defaults to one per CPU)",
+)
+
+simulate_parser.add_argument(
+    "-o", "--output", help="path of the JSONL file to write (defaults to stdout)"
+)
+
+replay_parser = subparsers.add_parser(
+    "replay",
+    help="check action logs by replaying their games and exit",
+    description="Replay every game in some action logs, checking that every"
+    + " action is legal and that every round has the logged result.",
+)
+
+replay_parser.add_argument("logs", nargs="+", help="paths of the action logs")
+
+replay_parser.add_argument(
+    "-j",
+    "--workers",
+    type=int,
+    default=1,
+    help="number of worker processes (defaults to 1)",
+)
+
+
+def build_shape_table(output: str | None) -> None:
+    from .mahjong.shape_table import default_shape_table_path, write_shape_table_file
+
+    path = default_shape_table_path if output is None else output
+    write_shape_table_file(path)
+    print(f"Wrote shape table to {path}")
+
+
+def simulate(args: argparse.Namespace) -> None:
+    import sys
+    import time
+    from contextlib import ExitStack
+    from pathlib import Path
+
+    from .mahjong.game_options import GameOptions
+    from .mahjong.simulator import run_simulation
+
+    if args.options is None:
+        options = GameOptions()
+    else:
+        options = GameOptions.model_validate_json(Path(args.options).read_text())
+    policy_names: list[str] = args.policy or ["greedy"]
+    round_count = 0
+    start_time = time.perf_counter()
+    with ExitStack() as stack:
+        output = (
+            sys.stdout
+            if args.output is None
+            else stack.enter_context(open(args.output, "w"))
+        )
+        for results in run_simulation(
+            args.games,
+            seed=args.seed,
+            options=options,
+            policy_names=policy_names,
+            max_rounds=args.max_rounds,
+            workers=args.workers,
+        ):
+            for result in results:
+                print(result.model_dump_json(), file=output)
+            round_count += len(results)
+    elapsed = time.perf_counter() - start_time
+    print(
+        f"Played {args.games} games ({round_count} rounds) in {elapsed:.2f}s"
+        + f" ({args.games / elapsed:.2f} games/s)",
+        file=sys.stderr,
+    )
+
+
+def replay(args: argparse.Namespace) -> None:
+    import sys
+    import time
+
+    from .mahjong.action_log import replay_action_log
+    from .mahjong.exceptions import InvalidMoveException, ReplayMismatchException
+
+    failed = False
+    for path in args.logs:
+        game_count = 0
+        round_count = 0
+        action_count = 0
+        start_time = time.perf_counter()
+        try:
+            with open(path, "rb") as file:
+                for logged_game in replay_action_log(file, workers=args.workers):
+                    game_count += 1
+                    round_count += len(logged_game.rounds)
+                    action_count += sum(
+                        len(logged_round.actions) for logged_round in logged_game.rounds
+                    )
+        except (
+            OSError,
+            ValueError,
+            InvalidMoveException,
+            ReplayMismatchException,
+        ) as e:
+            print(f"{path}: game {game_count}: {e}", file=sys.stderr)
+            failed = True
+            continue
+        elapsed = time.perf_counter() - start_time
+        print(
+            f"{path}: replayed {game_count} games ({round_count} rounds,"
+            + f" {action_count} actions) in {elapsed:.2f}s"
+            + f" ({action_count / elapsed:.0f} actions/s)"
+        )
+    if failed:
+        sys.exit(1)
+
 
 def main() -> None:
+    args = parser.parse_args()
+
+    if args.command == "build-shape-table":
+        build_shape_table(args.output)
+        return
+
+    if args.command == "simulate":
+        simulate(args)
+        return
+
+    if args.command == "replay":
+        replay(args)
+        return
+
     from .server import app as flask_app
 
     app: Flask | ProxyMiddleware = flask_app
     """Object which we eventually pass to :py:func:`werkzeug.run_simple`."""
 
-    args = parser.parse_args()
-
     if args.port is None:
         port = int(os.getenv("FLASK_PORT", 5000))
 
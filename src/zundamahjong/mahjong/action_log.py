@@ -0,0 +1,411 @@
+"""
+A compact binary format for logging the actions of games of mahjong,
+so that games can be archived and replayed.
+
+A log starts with a header, followed by any number of games. Each game
+starts with a record holding its options and seed, followed by its rounds.
+Each round starts with a record holding its deck (unless the deck is
+shuffled with the game's seed, see :py:func:`.game.get_round_rng`),
+then one record per action, and ends with a record of the round's result.
+
+An action record is one byte holding the player index and the
+:py:class:`ActionType`, followed by two bytes for each tile the action uses,
+so most actions take one or three bytes.
+Logs are written with an :py:class:`ActionLogWriter`, read with
+:py:func:`read_action_log` and checked with :py:func:`replay_game`
+or :py:func:`replay_action_log`.
+"""
+
+import os
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from struct import Struct, error
+from typing import BinaryIO, NamedTuple, final
+
+from .action import (
+    Action,
+    ActionType,
+    AddKanAction,
+    ClosedKanAction,
+    HandTileAction,
+    OpenCallAction,
+    OpenKanAction,
+    SimpleAction,
+)
+from .call import CallType, OpenCall
+from .exceptions import ReplayMismatchException
+from .game import Game
+from .game_options import GameOptions
+from .round import RoundStatus
+from .scoring import Scoring
+from .tile import TileId
+
+action_log_magic = b"ZMLOG\0"
+"The bytes at the start of every action log."
+action_log_version = 2
+"The version of the action log format."
+
+_header_struct = Struct("<6sB")
+_game_struct = Struct("<BQI")
+_deck_struct = Struct("<H")
+_result_struct = Struct("<Bhh")
+
+_game_tag = 0xF0
+_seed_game_tag = 0xF1
+_round_tag = 0xF2
+_deck_round_tag = 0xF3
+_round_end_tag = 0xFF
+_no_player = 0xFF
+
+_action_structs = {
+    ActionType.DISCARD: Struct("<H"),
+    ActionType.RIICHI: Struct("<H"),
+    ActionType.FLOWER: Struct("<H"),
+    ActionType.CHII: Struct("<HH"),
+    ActionType.PON: Struct("<HH"),
+    ActionType.OPEN_KAN: Struct("<HHH"),
+    ActionType.ADD_KAN: Struct("<HBHHH"),
+    ActionType.CLOSED_KAN: Struct("<HHHH"),
+}
+
+
+@final
+class LoggedRound(NamedTuple):
+    "Represents a round of mahjong read from an action log."
+
+    deck_tiles: list[TileId] | None
+    """
+    The deck of the round, or ``None`` if the deck was shuffled
+    with the game's seed.
+    """
+    actions: list[tuple[int, Action]]
+    "The index of the player and the action of each action in the round."
+    win_player: int | None
+    "The index of the winning player, or ``None`` if the round was a draw."
+    han: int
+    "The han value of the winning hand, or 0 if the round was a draw."
+    fu: int
+    "The fu value of the winning hand, or 0 if the round was a draw."
+
+
+@final
+class LoggedGame(NamedTuple):
+    "Represents a game of mahjong read from an action log."
+
+    options: GameOptions
+    "The options of the game."
+    seed: int | None
+    "The seed of the game, or ``None`` if every round's deck is logged."
+    rounds: list[LoggedRound]
+    "The rounds of the game."
+
+
+def _encode_action(player: int, action: Action) -> bytes:
+    data = bytes((player << 4 | action.action_type,))
+    if isinstance(action, SimpleAction):
+        return data
+    if isinstance(action, HandTileAction):
+        fields: tuple[int, ...] = (action.tile,)
+    elif isinstance(action, (OpenCallAction, OpenKanAction)):
+        fields = action.other_tiles
+    elif isinstance(action, AddKanAction):
+        pon_call = action.pon_call
+        fields = (
+            action.tile,
+            pon_call.called_player_index,
+            pon_call.called_tile,
+            *pon_call.other_tiles,
+        )
+    else:
+        fields = action.tiles
+    return data + _action_structs[action.action_type].pack(*fields)
+
+
+def _decode_action(action_type: ActionType, fields: tuple[int, ...]) -> Action:
+    match action_type:
+        case (
+            ActionType.PASS
+            | ActionType.CONTINUE
+            | ActionType.DRAW
+            | ActionType.RON
+            | ActionType.TSUMO
+        ):
+            return SimpleAction(action_type=action_type)
+        case ActionType.DISCARD | ActionType.RIICHI | ActionType.FLOWER:
+            return HandTileAction(action_type=action_type, tile=fields[0])
+        case ActionType.CHII | ActionType.PON:
+            return OpenCallAction(
+                action_type=action_type, other_tiles=(fields[0], fields[1])
+            )
+        case ActionType.OPEN_KAN:
+            return OpenKanAction(other_tiles=(fields[0], fields[1], fields[2]))
+        case ActionType.ADD_KAN:
+            return AddKanAction(
+                tile=fields[0],
+                pon_call=OpenCall(
+                    call_type=CallType.PON,
+                    called_player_index=fields[1],
+                    called_tile=fields[2],
+                    other_tiles=(fields[3], fields[4]),
+                ),
+            )
+        case ActionType.CLOSED_KAN:
+            return ClosedKanAction(tiles=(fields[0], fields[1], fields[2], fields[3]))
+
+
+@final
+class ActionLogWriter:
+    """
+    Writes games of mahjong to an action log as they are played.
+
+    For each game, call :py:meth:`start_game`, then for each round call
+    :py:meth:`start_round`, :py:meth:`write_action` for each action
+    in the round's history and :py:meth:`end_round`.
+
+    :param file: The binary file to write the log to.
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+        self._seed: int | None = None
+        self._file.write(_header_struct.pack(action_log_magic, action_log_version))
+
+    def start_game(self, options: GameOptions, seed: int | None = None) -> None:
+        """
+        Start logging a game.
+
+        :param options: The options of the game.
+        :param seed: (Optional) The seed of the game (see
+                     :py:attr:`.game.Game.seed`). If this is ``None``,
+                     every round's deck must be passed to :py:meth:`start_round`.
+        """
+        options_data = options.model_dump_json(exclude_defaults=True).encode()
+        tag = _game_tag if seed is None else _seed_game_tag
+        try:
+            self._file.write(
+                _game_struct.pack(tag, seed or 0, len(options_data)) + options_data
+            )
+        except error as e:
+            raise ValueError(f"Cannot log the seed {seed}") from e
+        self._seed = seed
+
+    def start_round(self, deck_tiles: Sequence[TileId] | None = None) -> None:
+        """
+        Start logging a round of the current game.
+
+        :param deck_tiles: (Optional) The deck of the round, if it was not
+                           shuffled with the game's seed.
+        """
+        if deck_tiles is None:
+            if self._seed is None:
+                raise ValueError("A deck is needed for a game without a seed")
+            self._file.write(bytes((_round_tag,)))
+            return
+        self._file.write(
+            bytes((_deck_round_tag,))
+            + _deck_struct.pack(len(deck_tiles))
+            + Struct(f"<{len(deck_tiles)}H").pack(*deck_tiles)
+        )
+
+    def write_action(self, player: int, action: Action) -> None:
+        """
+        Log an action performed in the current round.
+
+        :param player: The index of the player who performed the action.
+        :param action: The action.
+        """
+        self._file.write(_encode_action(player, action))
+
+    def end_round(self, scoring: Scoring | None) -> None:
+        """
+        Finish logging the current round.
+
+        :param scoring: The :py:class:`Scoring` of the round's win,
+                        or ``None`` if the round was a draw.
+        """
+        if scoring is None:
+            result = _result_struct.pack(_no_player, 0, 0)
+        else:
+            try:
+                result = _result_struct.pack(
+                    scoring.win_player, scoring.han, scoring.fu
+                )
+            except error as e:
+                raise ValueError(
+                    f"Cannot log {scoring.han} han and {scoring.fu} fu"
+                ) from e
+        self._file.write(bytes((_round_end_tag,)) + result)
+
+
+def _read_exact(file: BinaryIO, size: int) -> bytes:
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError("Unexpected end of action log")
+    return data
+
+
+def _read_round(file: BinaryIO, tag: int) -> LoggedRound:
+    read = file.read
+    deck_tiles: list[TileId] | None = None
+    if tag == _deck_round_tag:
+        (tile_count,) = _deck_struct.unpack(_read_exact(file, _deck_struct.size))
+        deck_struct = Struct(f"<{tile_count}H")
+        deck_tiles = list(deck_struct.unpack(_read_exact(file, deck_struct.size)))
+    actions: list[tuple[int, Action]] = []
+    while True:
+        data = read(1)
+        if not data:
+            raise ValueError("Unexpected end of action log")
+        byte = data[0]
+        if byte == _round_end_tag:
+            win_player, han, fu = _result_struct.unpack(
+                _read_exact(file, _result_struct.size)
+            )
+            return LoggedRound(
+                deck_tiles=deck_tiles,
+                actions=actions,
+                win_player=None if win_player == _no_player else win_player,
+                han=han,
+                fu=fu,
+            )
+        try:
+            action_type = ActionType(byte & 0xF)
+        except ValueError:
+            raise ValueError(f"Invalid action record {byte:#x}") from None
+        action_struct = _action_structs.get(action_type)
+        fields: tuple[int, ...] = ()
+        if action_struct is not None:
+            fields = action_struct.unpack(_read_exact(file, action_struct.size))
+        actions.append((byte >> 4, _decode_action(action_type, fields)))
+
+
+def read_action_log(file: BinaryIO) -> Iterator[LoggedGame]:
+    """
+    Read the games in an action log, one at a time.
+
+    This raises a :py:class:`ValueError` if the log is not a valid action log.
+
+    :param file: The binary file to read the log from.
+    """
+    header = file.read(_header_struct.size)
+    if len(header) != _header_struct.size or _header_struct.unpack(header) != (
+        action_log_magic,
+        action_log_version,
+    ):
+        raise ValueError("Not an action log, or an unsupported version")
+    game: LoggedGame | None = None
+    while data := file.read(1):
+        tag = data[0]
+        if tag in (_game_tag, _seed_game_tag):
+            if game is not None:
+                yield game
+            _, seed, options_length = _game_struct.unpack(
+                data + _read_exact(file, _game_struct.size - 1)
+            )
+            options = GameOptions.model_validate_json(_read_exact(file, options_length))
+            game = LoggedGame(
+                options=options,
+                seed=seed if tag == _seed_game_tag else None,
+                rounds=[],
+            )
+        elif tag in (_round_tag, _deck_round_tag) and game is not None:
+            game.rounds.append(_read_round(file, tag))
+        else:
+            raise ValueError(f"Invalid record {tag:#x}")
+    if game is not None:
+        yield game
+
+
+def replay_game(logged_game: LoggedGame) -> Game:
+    """
+    Replay a logged game, checking that every action is legal and that every
+    round has the logged result.
+
+    Actions are performed directly with :py:meth:`.round.Round.do_action`.
+    Actions that the round performs by itself (e.g. replacing flowers at the
+    start of the round) are checked against the log instead of being performed.
+
+    This raises an :py:class:`InvalidMoveException` if an action is illegal,
+    and a :py:class:`ReplayMismatchException` if the replayed game does not
+    match the log in any other way.
+
+    :param logged_game: The :py:class:`LoggedGame` to replay.
+    :return: The replayed :py:class:`Game`.
+    """
+    if not logged_game.rounds:
+        raise ReplayMismatchException("The game has no rounds")
+    game: Game | None = None
+    for round_index, logged_round in enumerate(logged_game.rounds):
+        if logged_round.deck_tiles is None and logged_game.seed is None:
+            raise ReplayMismatchException(f"Round {round_index} has no deck")
+        if game is None:
+            game = Game(
+                first_deck_tiles=logged_round.deck_tiles,
+                options=logged_game.options,
+                seed=logged_game.seed,
+            )
+        elif game.can_start_next_round:
+            game.start_next_round(logged_round.deck_tiles)
+        else:
+            raise ReplayMismatchException(f"Round {round_index} cannot be started")
+        round = game.round
+        for action_index, (player, action) in enumerate(logged_round.actions):
+            if action_index < len(round.history):
+                if round.history[action_index] != (player, action):
+                    raise ReplayMismatchException(
+                        f"Action {action_index} of round {round_index} does not"
+                        + " match the action performed by the round"
+                    )
+                continue
+            round.do_action(player, action)
+        if round.status != RoundStatus.END or len(round.history) != len(
+            logged_round.actions
+        ):
+            raise ReplayMismatchException(f"Round {round_index} did not end")
+        scoring = game.scoring
+        result = (
+            (None, 0, 0)
+            if scoring is None
+            else (scoring.win_player, scoring.han, scoring.fu)
+        )
+        if result != (logged_round.win_player, logged_round.han, logged_round.fu):
+            raise ReplayMismatchException(
+                f"Round {round_index} ended with {result} instead of"
+                + f" {(logged_round.win_player, logged_round.han, logged_round.fu)}"
+            )
+    assert game is not None
+    return game
+
+
+def _check_game(logged_game: LoggedGame) -> None:
+    replay_game(logged_game)
+
+
+def replay_action_log(
+    file: BinaryIO, *, workers: int | None = 1
+) -> Iterator[LoggedGame]:
+    """
+    Replay every game in an action log with :py:func:`replay_game`,
+    and yield each game once it has been checked.
+
+    :param file: The binary file to read the log from.
+    :param workers: The number of worker processes. If this is 1 the games are
+                    replayed in the current process, and if this is ``None``
+                    one worker is used per CPU. With more than one worker
+                    the whole log is read before any game is replayed.
+    """
+    logged_games = read_action_log(file)
+    if workers == 1:
+        for logged_game in logged_games:
+            replay_game(logged_game)
+            yield logged_game
+        return
+    game_list = list(logged_games)
+    worker_count = workers if workers is not None else os.cpu_count() or 1
+    chunk_size = max(1, min(64, len(game_list) // (4 * worker_count)))
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        for logged_game, _ in zip(
+            game_list,
+            executor.map(_check_game, game_list, chunksize=chunk_size),
+        ):
+            yield logged_game
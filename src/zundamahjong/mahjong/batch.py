@@ -0,0 +1,221 @@
+"""
+Batch versions of the winning hand and wait checks in :py:mod:`.form_hand`,
+for evaluating many hands at once (e.g. when analysing a dataset of hands).
+
+Hands are given as a matrix with one row per hand and one column per
+non-flower tile value (see :py:data:`batch_tile_values`), containing the
+number of copies of each tile value in the hand. Every hand is looked up in
+the shape tables of :py:mod:`.shape_table` at once, so the results are the
+same as calling the scalar functions on each hand.
+
+This module needs NumPy, which can be installed with the optional
+dependencies ``zundamahjong[batch]``. NumPy is only imported when one of
+the batch functions is called.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import cache
+from typing import TYPE_CHECKING
+
+from .shape_table import (
+    KEY_BITS,
+    honour_suit_size,
+    number_suit_size,
+    suit_tables,
+    suit_waits_tables,
+)
+from .tile import TileId, TileValue, all_tiles, get_tile_id_counts, orphans
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import ArrayLike, NDArray
+
+batch_tile_values: tuple[TileValue, ...] = tuple(sorted(all_tiles))
+"""
+A tuple containing the :py:class:`TileValue` of each column of a batch
+count matrix, i.e. the 34 non-flower tile values in ascending order.
+"""
+
+_suit_sizes = (number_suit_size, number_suit_size, number_suit_size, honour_suit_size)
+_suit_starts = (0, 9, 18, 27)
+_orphan_columns = [batch_tile_values.index(tile) for tile in sorted(orphans)]
+
+
+@cache
+def _get_suit_lookup_arrays(
+    suit_index: int,
+) -> tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.int64]]:
+    """
+    Return the sorted complete keys of a suit's shape table, and the sorted
+    keys and wait masks of its waits table, as arrays that can be searched.
+    """
+    import numpy as np
+
+    complete_keys = np.array(sorted(suit_tables[suit_index]), dtype=np.int64)
+    waits_table = suit_waits_tables[suit_index]
+    wait_keys = np.array(sorted(waits_table), dtype=np.int64)
+    wait_masks = np.array(
+        [waits_table[key] for key in sorted(waits_table)], dtype=np.int64
+    )
+    return complete_keys, wait_keys, wait_masks
+
+
+def _find_keys(
+    sorted_keys: NDArray[np.int64], keys: NDArray[np.int64]
+) -> tuple[NDArray[np.bool_], NDArray[np.intp]]:
+    "Return which keys are in a sorted key array, and where they are."
+    import numpy as np
+
+    positions = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    return sorted_keys[positions] == keys, positions
+
+
+def _as_count_matrix(tile_counts: ArrayLike) -> NDArray[np.int64]:
+    import numpy as np
+
+    counts = np.asarray(tile_counts, dtype=np.int64)
+    if counts.ndim != 2 or counts.shape[1] != len(batch_tile_values):
+        raise ValueError(
+            f"Expected a count matrix with {len(batch_tile_values)} columns,"
+            f" got an array of shape {counts.shape}"
+        )
+    return counts
+
+
+def _get_suit_shapes(
+    counts: NDArray[np.int64],
+) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+    "Return the suit keys and suit sizes of each hand, as two N×4 arrays."
+    import numpy as np
+
+    suit_keys = np.zeros((len(counts), 4), dtype=np.int64)
+    suit_sizes = np.zeros((len(counts), 4), dtype=np.int64)
+    for suit_index, (start, size) in enumerate(zip(_suit_starts, _suit_sizes)):
+        suit_counts = counts[:, start : start + size]
+        weights = np.left_shift(1, KEY_BITS * np.arange(size, dtype=np.int64))
+        suit_keys[:, suit_index] = suit_counts @ weights
+        suit_sizes[:, suit_index] = suit_counts.sum(axis=1)
+    return suit_keys, suit_sizes
+
+
+def _get_complete_suits(suit_keys: NDArray[np.int64]) -> NDArray[np.bool_]:
+    "Return whether each suit of each hand is complete, as an N×4 array."
+    import numpy as np
+
+    complete = np.zeros(suit_keys.shape, dtype=np.bool_)
+    for suit_index in range(4):
+        complete_keys = _get_suit_lookup_arrays(suit_index)[0]
+        complete[:, suit_index] = _find_keys(complete_keys, suit_keys[:, suit_index])[0]
+    return complete
+
+
+def get_batch_tile_counts(hands: Iterable[Iterable[TileId]]) -> NDArray[np.int64]:
+    """
+    Return the count matrix of some hands, for use with the other batch
+    functions. Flowers are not counted.
+
+    :param hands: The hands, each given as the :py:class:`TileId` s of its tiles.
+    """
+    import numpy as np
+
+    return np.array(
+        [
+            [tile_counts[tile] for tile in batch_tile_values]
+            for tile_counts in map(get_tile_id_counts, hands)
+        ],
+        dtype=np.int64,
+    ).reshape(-1, len(batch_tile_values))
+
+
+def batch_is_winning(tile_counts: ArrayLike) -> NDArray[np.bool_]:
+    """
+    Determine whether each of a batch of hands forms a winning hand.
+
+    This is the batch version of :py:func:`.form_hand.is_count_winning`.
+
+    :param tile_counts: An N×34 matrix containing the number of copies of
+                        each tile value in each hand, with columns indexed
+                        as in :py:data:`batch_tile_values`.
+    :return: An array of N booleans, which are True for the winning hands.
+    """
+    import numpy as np
+
+    counts = _as_count_matrix(tile_counts)
+    tile_count = counts.sum(axis=1)
+    suit_keys, suit_sizes = _get_suit_shapes(counts)
+    standard = (
+        _get_complete_suits(suit_keys).all(axis=1)
+        & (np.count_nonzero(suit_sizes % 3, axis=1) == 1)
+        & (tile_count % 3 == 2)
+    )
+    orphan_counts = counts[:, _orphan_columns]
+    seven_pairs = ((counts == 0) | (counts == 2)).all(axis=1)
+    thirteen_orphans = (orphan_counts > 0).all(axis=1) & (
+        orphan_counts.sum(axis=1) == 14
+    )
+    result: NDArray[np.bool_] = standard | (
+        (tile_count == 14) & (seven_pairs | thirteen_orphans)
+    )
+    return result
+
+
+def batch_get_waits(tile_counts: ArrayLike) -> NDArray[np.bool_]:
+    """
+    Calculate the tiles that complete each of a batch of hands.
+
+    This is the batch version of :py:func:`.form_hand.get_count_waits`.
+
+    :param tile_counts: An N×34 matrix containing the number of copies of
+                        each tile value in each hand, with columns indexed
+                        as in :py:data:`batch_tile_values`.
+    :return: An N×34 boolean matrix, whose entry in row :math:`i` and column
+             :math:`j` is True if the tile value ``batch_tile_values[j]``
+             completes hand :math:`i`.
+    """
+    import numpy as np
+
+    counts = _as_count_matrix(tile_counts)
+    waits = np.zeros(counts.shape, dtype=np.bool_)
+    tile_count = counts.sum(axis=1)
+    waiting = tile_count % 3 == 1
+
+    suit_keys, suit_sizes = _get_suit_shapes(counts)
+    complete = _get_complete_suits(suit_keys)
+    remainders = suit_sizes % 3
+    ones = np.count_nonzero(remainders == 1, axis=1)
+    twos = np.count_nonzero(remainders == 2, axis=1)
+    # Either one suit has one extra tile, or two suits have two extra tiles
+    # (one of them holds the pair); only those suits can receive the wait.
+    standard = waiting & (((ones == 1) & (twos == 0)) | ((ones == 0) & (twos == 2)))
+    for suit_index, (start, size) in enumerate(zip(_suit_starts, _suit_sizes)):
+        _, wait_keys, wait_masks = _get_suit_lookup_arrays(suit_index)
+        others_complete = np.delete(complete, suit_index, axis=1).all(axis=1)
+        found, positions = _find_keys(wait_keys, suit_keys[:, suit_index])
+        masks = np.where(
+            standard & (remainders[:, suit_index] != 0) & others_complete & found,
+            wait_masks[positions],
+            0,
+        )
+        for index in range(size):
+            waits[:, start + index] |= (masks >> index) & 1 == 1
+
+    thirteen_tiles = waiting & (tile_count == 13)
+    seven_pairs = (
+        thirteen_tiles
+        & (counts <= 2).all(axis=1)
+        & (np.count_nonzero(counts, axis=1) == 7)
+        & (np.count_nonzero(counts == 1, axis=1) == 1)
+    )
+    waits |= seven_pairs[:, np.newaxis] & (counts == 1)
+
+    orphan_counts = counts[:, _orphan_columns]
+    only_orphans = thirteen_tiles & (orphan_counts.sum(axis=1) == tile_count)
+    distinct_orphans = np.count_nonzero(orphan_counts, axis=1)
+    thirteen_sided = only_orphans & (distinct_orphans == 13)
+    missing_one = only_orphans & (distinct_orphans == 12)
+    waits[:, _orphan_columns] |= thirteen_sided[:, np.newaxis] | (
+        missing_one[:, np.newaxis] & (orphan_counts == 0)
+    )
+    return waits
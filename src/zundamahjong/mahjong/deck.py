@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-from collections import deque
 from collections.abc import Iterable
-from random import shuffle
+from random import Random, shuffle
 from typing import final
 
 from .tile import N, TileId
@@ -47,6 +46,25 @@ A list of :py:class:`TileId` s of the flowers used in a three-player deck.
 """
 
 
+def get_deck_tiles(player_count: int, use_flowers: bool) -> list[TileId]:
+    """
+    Return a list of the :py:class:`TileId` s of the tiles used in a deck,
+    in unshuffled order.
+
+    :param player_count: The number of players (3 or 4).
+    :param use_flowers: Whether the deck contains flowers.
+    """
+    if player_count == 3:
+        tiles = three_player_deck.copy()
+        if use_flowers:
+            tiles.extend(three_player_flowers)
+    else:
+        tiles = four_player_deck.copy()
+        if use_flowers:
+            tiles.extend(four_player_flowers)
+    return tiles
+
+
 @final
 class Deck:
     """
@@ -57,35 +75,79 @@ class Deck:
     """
 
     def __init__(self, tiles: Iterable[TileId]) -> None:
-        self._tiles = deque(tiles)
+        self.restore(tiles)
 
     @classmethod
-    def shuffled_deck(cls, tiles: list[TileId]) -> Deck:
+    def shuffled_deck(cls, tiles: list[TileId], rng: Random | None = None) -> Deck:
         """
         Creates a new :py:class:`Deck` containing the given list of
         :py:class:`TileId` s, shuffled.
 
         :param tiles: A list of the :py:class:`TileId` s the new
                       :py:class:`Deck` will contain.
+        :param rng: (Optional) The random number generator to shuffle the
+                    tiles with. If set to ``None``, the global random number
+                    generator of the :py:mod:`random` module is used.
         """
         new_deck = tiles.copy()
-        shuffle(new_deck)
+        if rng is None:
+            shuffle(new_deck)
+        else:
+            rng.shuffle(new_deck)
         return cls(new_deck)
 
+    def __len__(self) -> int:
+        return self._end - self._start
+
     @property
     def tiles(self) -> tuple[TileId, ...]:
         "Returns the list of :py:class:`TileId` s remaining in the deck."
-        return tuple(self._tiles)
+        return tuple(self._tiles[self._start : self._end])
+
+    @property
+    def position(self) -> tuple[int, int]:
+        """
+        The number of tiles removed from the front and the back of the deck
+        so far, which can be passed to :py:meth:`seek` to put them back.
+        """
+        return self._start, len(self._tiles) - self._end
+
+    def seek(self, position: tuple[int, int]) -> None:
+        """
+        Return the deck to an earlier :py:attr:`position`, putting back
+        the tiles removed since then.
+
+        :param position: The :py:attr:`position` of the deck to return to.
+        """
+        self._start = position[0]
+        self._end = len(self._tiles) - position[1]
+
+    def restore(self, tiles: Iterable[TileId]) -> None:
+        """
+        Replace the remaining tiles of the deck, e.g. with the
+        :py:attr:`tiles` of the deck at an earlier point of the round.
+
+        :param tiles: The :py:class:`TileId` s the deck will contain.
+        """
+        self._tiles = list(tiles)
+        self._start = 0
+        self._end = len(self._tiles)
 
     def pop(self) -> TileId:
         """
         Removes the first remaining tile of the deck, and returns its
         :py:class:`TileId`."""
-        return self._tiles.popleft()
+        if self._start >= self._end:
+            raise IndexError("pop from an empty deck")
+        self._start += 1
+        return self._tiles[self._start - 1]
 
     def popleft(self) -> TileId:
         """
         Removes the tile at the back of the deck, and returns its
         :py:class:`TileId`.
         """
-        return self._tiles.pop()
+        if self._start >= self._end:
+            raise IndexError("pop from an empty deck")
+        self._end -= 1
+        return self._tiles[self._end]
@@ -1,9 +1,11 @@
 from collections import deque
-from collections.abc import Sequence
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from collections.abc import Set as AbstractSet
+from typing import NamedTuple, final
 
 from pydantic import BaseModel
 
-from .tile import TileId
+from .tile import TileId, TileValue, get_tile_value
 
 
 class Discard(BaseModel):
@@ -28,17 +30,134 @@ class Discard(BaseModel):
     "Whether the tile was part of a closed kan."
 
 
+@final
+class DiscardPoolSnapshot(NamedTuple):
+    """
+    Represents the state of a :py:class:`DiscardPool` at some point of a round.
+    See :py:meth:`DiscardPool.snapshot`.
+    """
+
+    discards: tuple[Discard, ...]
+    "The discards in the pool."
+    own_values: dict[int, frozenset[TileValue]]
+    "The values of each player's own discards."
+    old_values: frozenset[TileValue]
+    "The values of the old discards."
+    temporary_values: dict[int, frozenset[TileValue]]
+    "The values each player is in temporary furiten on."
+    riichi_values: dict[int, frozenset[TileValue]]
+    "The values each player is in riichi furiten on."
+    version: int
+    "The version of the pool."
+
+
+def _freeze_values(
+    values: dict[int, set[TileValue]],
+) -> dict[int, frozenset[TileValue]]:
+    return {
+        player: frozenset(player_values) for player, player_values in values.items()
+    }
+
+
+def _thaw_values(
+    values: dict[int, frozenset[TileValue]],
+) -> dict[int, set[TileValue]]:
+    return {player: set(player_values) for player, player_values in values.items()}
+
+
+def _copy_new_discards(discards: Iterable[Discard]) -> Iterator[Discard]:
+    """
+    Yield the discards, copying the new ones.
+
+    A discard is only changed while it is new (when it becomes old or is
+    called), so old discards can be shared between copies of a pool.
+    """
+    for discard in discards:
+        yield discard.model_copy() if discard.is_new else discard
+
+
+def _set_values(
+    values: dict[int, set[TileValue]], player: int, player_values: set[TileValue] | None
+) -> None:
+    if player_values is None:
+        values.pop(player, None)
+    else:
+        values[player] = player_values
+
+
 class DiscardPool:
-    "Represents the list of discarded tiles in a round of mahjong."
+    """
+    Represents the list of discarded tiles in a round of mahjong.
+
+    Also keeps track of the :py:class:`TileValue` s each player is in furiten
+    on, updating them as discards are added, called and become old.
+    """
 
     def __init__(self) -> None:
         self._discards: deque[Discard] = deque()
+        self._own_values: dict[int, set[TileValue]] = {}
+        self._old_values: set[TileValue] = set()
+        self._temporary_values: dict[int, set[TileValue]] = {}
+        self._riichi_values: dict[int, set[TileValue]] = {}
+        self._version = 0
+        self._undo_log: list[Callable[[], None]] = []
+
+    def snapshot(self) -> DiscardPoolSnapshot:
+        "Return the current state of the pool, to be passed to :py:meth:`restore`."
+        return DiscardPoolSnapshot(
+            discards=tuple(_copy_new_discards(self._discards)),
+            own_values=_freeze_values(self._own_values),
+            old_values=frozenset(self._old_values),
+            temporary_values=_freeze_values(self._temporary_values),
+            riichi_values=_freeze_values(self._riichi_values),
+            version=self._version,
+        )
+
+    def restore(self, snapshot: DiscardPoolSnapshot) -> None:
+        """
+        Return the pool to an earlier state.
+
+        :param snapshot: The :py:class:`DiscardPoolSnapshot` of the state,
+                         returned by :py:meth:`snapshot`.
+        """
+        self._discards = deque(_copy_new_discards(snapshot.discards))
+        self._own_values = _thaw_values(snapshot.own_values)
+        self._old_values = set(snapshot.old_values)
+        self._temporary_values = _thaw_values(snapshot.temporary_values)
+        self._riichi_values = _thaw_values(snapshot.riichi_values)
+        self._version = snapshot.version
+        self._undo_log.clear()
+
+    @property
+    def change_count(self) -> int:
+        """
+        The number of changes made to the pool that can be undone.
+        This can be passed to :py:meth:`undo_changes` to undo every change
+        made after it was read.
+
+        Restoring a snapshot resets this to zero.
+        """
+        return len(self._undo_log)
+
+    def undo_changes(self, change_count: int) -> None:
+        """
+        Undo the latest changes to the pool, in reverse order.
+
+        :param change_count: The :py:attr:`change_count` to return to.
+        """
+        while len(self._undo_log) > change_count:
+            self._undo_log.pop()()
 
     @property
     def discards(self) -> Sequence[Discard]:
         "A sequence of :py:class:`Discard` s representing the discarded tiles."
         return self._discards
 
+    @property
+    def version(self) -> int:
+        "A number that increases every time the discard pool changes."
+        return self._version
+
     @property
     def last_discarded_tile(self) -> TileId | None:
         """
@@ -52,11 +171,40 @@ class DiscardPool:
             return None
         return last_discard.tile
 
+    def own_discard_values(self, player: int) -> AbstractSet[TileValue]:
+        """
+        The :py:class:`TileValue` s of every tile a player has discarded
+        (including tiles added to kans or used to form closed kans).
+
+        :param player: The index of the player.
+        """
+        return self._own_values.get(player, set())
+
+    def temporary_furiten_values(self, player: int) -> AbstractSet[TileValue]:
+        """
+        The :py:class:`TileValue` s of the player's last discard, and of every
+        old discard since then (apart from closed kans).
+
+        :param player: The index of the player.
+        """
+        return self._temporary_values.get(player, self._old_values)
+
+    def riichi_furiten_values(self, player: int) -> AbstractSet[TileValue]:
+        """
+        The :py:class:`TileValue` s of the player's riichi discard, and of every
+        old discard since then (apart from closed kans).
+        If the player has not called riichi, this is empty.
+
+        :param player: The index of the player.
+        """
+        return self._riichi_values.get(player, set())
+
     def append(
         self,
         player: int,
         tile: TileId,
         *,
+        is_riichi: bool = False,
         is_added_kan: bool = False,
         is_closed_kan: bool = False,
     ) -> None:
@@ -65,9 +213,12 @@ class DiscardPool:
 
         :param player: The index of the player who discarded the tile.
         :param tile: The :py:class:`TileId` of the discarded tile.
-        :param is_riichi: Whether the player was in riichi when they discarded the tile.
-        :param is_kan: (Defaults to false) Whether the tile was actually part of a kan
-                       instead of being discarded.
+        :param is_riichi: (Defaults to false) Whether the tile is the player's
+                          riichi discard.
+        :param is_added_kan: (Defaults to false) Whether the tile was actually
+                             added to a kan instead of being discarded.
+        :param is_closed_kan: (Defaults to false) Whether the tile was actually
+                              part of a closed kan instead of being discarded.
         """
         self._discards.append(
             Discard(
@@ -79,6 +230,29 @@ class DiscardPool:
                 is_closed_kan=is_closed_kan,
             )
         )
+        version = self._version
+        self._version += 1
+        tile_value = get_tile_value(tile)
+        own_values = self._own_values.get(player)
+        is_new_own_value = own_values is None or tile_value not in own_values
+        self._own_values.setdefault(player, set()).add(tile_value)
+        temporary_values = self._temporary_values.get(player)
+        self._temporary_values[player] = {tile_value}
+        riichi_values = self._riichi_values.get(player)
+        if is_riichi:
+            self._riichi_values[player] = {tile_value}
+
+        def undo_append() -> None:
+            self._discards.pop()
+            self._version = version
+            if own_values is None:
+                del self._own_values[player]
+            elif is_new_own_value:
+                own_values.discard(tile_value)
+            _set_values(self._temporary_values, player, temporary_values)
+            _set_values(self._riichi_values, player, riichi_values)
+
+        self._undo_log.append(undo_append)
 
     def unnew_last_discard(self) -> None:
         """
@@ -86,7 +260,7 @@ class DiscardPool:
         """
         if len(self._discards) == 0:
             return
-        self._discards[-1].is_new = False
+        self._make_old(self._discards[-1])
 
     def pop(self) -> TileId:
         """
@@ -95,6 +269,48 @@ class DiscardPool:
         :return: The :py:class:`TileId` representing the last discarded tile.
         """
         last_discard = self._discards[-1]
-        last_discard.is_new = False
+        self._make_old(last_discard)
         last_discard.is_called = True
+        version = self._version
+        self._version += 1
+
+        def undo_pop() -> None:
+            self._discards[-1] = self._discards[-1].model_copy(
+                update={"is_called": False}
+            )
+            self._version = version
+
+        self._undo_log.append(undo_pop)
         return last_discard.tile
+
+    def _make_old(self, discard: Discard) -> None:
+        if not discard.is_new:
+            return
+        discard.is_new = False
+        version = self._version
+        self._version += 1
+        tile_value = get_tile_value(discard.tile)
+        added_to: list[set[TileValue]] = []
+        if not discard.is_closed_kan:
+            for values in (
+                self._old_values,
+                *(
+                    temporary_values
+                    for player, temporary_values in self._temporary_values.items()
+                    if player != discard.player
+                ),
+                *self._riichi_values.values(),
+            ):
+                if tile_value not in values:
+                    values.add(tile_value)
+                    added_to.append(values)
+
+        def undo_make_old() -> None:
+            # Discards may be shared with snapshots, so they are replaced
+            # instead of being changed back.
+            self._discards[-1] = self._discards[-1].model_copy(update={"is_new": True})
+            self._version = version
+            for values in added_to:
+                values.discard(tile_value)
+
+        self._undo_log.append(undo_make_old)
@@ -3,13 +3,15 @@ class InvalidMoveException(Exception):
     Exception raised when an illegal action is performed on a :py:class:`Round`.
     """
 
-    pass
-
 
 class InvalidOperationException(Exception):
     """
     Exception raised when an operation is performed on a :py:class:`Game`
-    when it cannot be performed.
+    or a :py:class:`Round` when it cannot be performed.
     """
 
-    pass
+
+class ReplayMismatchException(Exception):
+    """
+    Exception raised when a replayed game does not match its action log.
+    """
@@ -1,16 +1,28 @@
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+from functools import cache
+from itertools import chain, product
 
-from .meld import Meld, MeldType, TileValueMeld
+from .meld import Meld, MeldType
+from .shape_table import (
+    KEY_BITS,
+    SuitKey,
+    get_count_suit_shapes,
+    get_standard_waits,
+    get_suit_decompositions,
+    get_suit_shapes,
+    get_suit_tile_value,
+    is_complete_hand,
+)
 from .tile import (
-    N,
     TileId,
     TileValue,
-    all_tiles,
+    get_tile_counts,
     get_tile_value,
-    get_tile_value_buckets,
     get_tile_values,
     orphans,
     remove_tile_value,
+    tile_value_ranks,
+    tile_value_suits,
 )
 
 
@@ -20,7 +32,35 @@ def is_winning(tiles: list[TileId]) -> bool:
 
     :param tiles: A list of :py:class:`TileId` s of the tiles in the hand.
     """
-    return len(formed_hand_possibilities(tiles)) > 0
+    tile_values = get_tile_values(tiles)
+    if len(tile_values) % 3 != 2:
+        return False
+    if get_suit_shapes(tile_values) is None:
+        return False
+    return is_count_winning(get_tile_counts(tile_values))
+
+
+def is_count_winning(tile_counts: Sequence[int]) -> bool:
+    """
+    Determine whether a hand forms a winning hand, given the number of copies
+    of each non-flower tile value in the hand.
+
+    Only the shapes of the suits are checked, so no melds are built.
+
+    :param tile_counts: The number of copies of each tile value in the hand,
+                        indexed by :py:class:`TileValue` (see
+                        :py:func:`get_tile_counts`).
+    """
+    tile_count = sum(tile_counts)
+    if tile_count % 3 != 2:
+        return False
+    if is_complete_hand(*get_count_suit_shapes(tile_counts)):
+        return True
+    return tile_count == 14 and (
+        all(count == 0 or count == 2 for count in tile_counts)
+        or all(tile_counts[tile] > 0 for tile in orphans)
+        and sum(tile_counts[tile] for tile in orphans) == 14
+    )
 
 
 def get_waits(tiles: list[TileId]) -> frozenset[TileValue]:
@@ -32,16 +72,129 @@ def get_waits(tiles: list[TileId]) -> frozenset[TileValue]:
     """
     if len(tiles) % 3 != 1:
         return frozenset()
-    tile_value_counts = dict(
-        (tile_value, len(bucket))
-        for (tile_value, bucket) in get_tile_value_buckets(tiles).items()
-    )
-    return frozenset(
-        tile_value
-        for tile_value in all_tiles
-        if tile_value_counts.get(tile_value, 0) < 4
-        and is_winning(tiles + [tile_value * N])
-    )
+    return _get_value_waits(get_tile_values(tiles))
+
+
+def get_count_waits(tile_counts: Sequence[int]) -> frozenset[TileValue]:
+    """
+    Calculate all tiles that can be added to the hand to form a winning hand,
+    given the number of copies of each non-flower tile value in the hand.
+
+    :param tile_counts: The number of copies of each tile value in the hand,
+                        indexed by :py:class:`TileValue` (see
+                        :py:func:`get_tile_counts`).
+    :return: A frozenset containing all the tiles that can complete the hand.
+    """
+    tile_count = sum(tile_counts)
+    if tile_count % 3 != 1:
+        return frozenset()
+    waits = get_standard_waits(*get_count_suit_shapes(tile_counts))
+    if tile_count == 13:
+        waits.extend(_get_seven_pairs_waits(tile_counts))
+        waits.extend(_get_thirteen_orphans_waits(tile_counts))
+    return frozenset(waits)
+
+
+def get_discard_waits(tiles: list[TileId]) -> dict[TileValue, frozenset[TileValue]]:
+    """
+    Calculate the waits of the hand after discarding each of its tiles.
+
+    Tiles with the same :py:class:`TileValue` leave the same hand behind,
+    so each value is only evaluated once. The suit shapes of the hand are
+    computed once, and only the suit of the discarded tile changes between
+    discards.
+
+    :param tiles: A list of the :py:class:`TileId` s of the tiles in the hand,
+                  before discarding.
+    :return: A dictionary mapping the :py:class:`TileValue` of each tile that
+             can be discarded to the frozenset of waits after discarding it.
+    """
+    tile_values = get_tile_values(tiles)
+    if len(tile_values) % 3 != 2:
+        return dict((tile_value, frozenset()) for tile_value in set(tile_values))
+    if get_suit_shapes(tile_values) is None:
+        # The hand contains a flower, so every discard is checked separately.
+        discard_waits: dict[TileValue, frozenset[TileValue]] = {}
+        for tile_value in set(tile_values):
+            remaining_values = tile_values.copy()
+            remaining_values.remove(tile_value)
+            discard_waits[tile_value] = _get_value_waits(remaining_values)
+        return discard_waits
+    return get_count_discard_waits(get_tile_counts(tile_values))
+
+
+def get_count_discard_waits(
+    tile_counts: Sequence[int],
+) -> dict[TileValue, frozenset[TileValue]]:
+    """
+    Calculate the waits of the hand after discarding each of its tiles,
+    given the number of copies of each non-flower tile value in the hand.
+
+    :param tile_counts: The number of copies of each tile value in the hand,
+                        indexed by :py:class:`TileValue` (see
+                        :py:func:`get_tile_counts`).
+    :return: A dictionary mapping the :py:class:`TileValue` of each tile that
+             can be discarded to the frozenset of waits after discarding it.
+    """
+    discard_values = [
+        tile_value for tile_value, count in enumerate(tile_counts) if count > 0
+    ]
+    tile_count = sum(tile_counts)
+    if tile_count % 3 != 2:
+        return dict((tile_value, frozenset()) for tile_value in discard_values)
+    discard_waits: dict[TileValue, frozenset[TileValue]] = {}
+    suit_keys, suit_sizes = get_count_suit_shapes(tile_counts)
+    check_special = tile_count == 14
+    remaining_counts = list(tile_counts)
+    for tile_value in discard_values:
+        suit_index = tile_value_suits[tile_value]
+        new_suit_keys = suit_keys.copy()
+        new_suit_keys[suit_index] -= 1 << (
+            KEY_BITS * (tile_value_ranks[tile_value] - 1)
+        )
+        new_suit_sizes = suit_sizes.copy()
+        new_suit_sizes[suit_index] -= 1
+        waits = get_standard_waits(new_suit_keys, new_suit_sizes)
+        if check_special:
+            remaining_counts[tile_value] -= 1
+            waits.extend(_get_seven_pairs_waits(remaining_counts))
+            waits.extend(_get_thirteen_orphans_waits(remaining_counts))
+            remaining_counts[tile_value] += 1
+        discard_waits[tile_value] = frozenset(waits)
+    return discard_waits
+
+
+def _get_value_waits(tile_values: list[TileValue]) -> frozenset[TileValue]:
+    if get_suit_shapes(tile_values) is None:
+        return frozenset()
+    return get_count_waits(get_tile_counts(tile_values))
+
+
+def _get_seven_pairs_waits(tile_counts: Sequence[int]) -> list[TileValue]:
+    singles: list[TileValue] = []
+    distinct_count = 0
+    for tile_value, count in enumerate(tile_counts):
+        if count == 0:
+            continue
+        if count > 2:
+            return []
+        distinct_count += 1
+        if count == 1:
+            singles.append(tile_value)
+    if distinct_count == 7 and len(singles) == 1:
+        return singles
+    return []
+
+
+def _get_thirteen_orphans_waits(tile_counts: Sequence[int]) -> list[TileValue]:
+    if sum(tile_counts[tile] for tile in orphans) != sum(tile_counts):
+        return []
+    distinct_tiles = {tile for tile in orphans if tile_counts[tile] > 0}
+    if len(distinct_tiles) == 13:
+        return list(orphans)
+    elif len(distinct_tiles) == 12:
+        return list(orphans - distinct_tiles)
+    return []
 
 
 def formed_hand_possibilities(tiles: list[TileId]) -> list[list[Meld]]:
@@ -53,201 +206,127 @@ def formed_hand_possibilities(tiles: list[TileId]) -> list[list[Meld]]:
     :return: A list of formed hands. Each formed hand is itself a list of
             :py:class:`Meld` s.
     """
-    formed_value_hands = _standard_formed_hand_possibilities(tiles)
-    if len(tiles) == 14:
-        formed_value_hands.extend(_form_seven_pairs(tiles))
-        formed_value_hands.extend(_form_thirteen_orphans(tiles))
-    return [
-        formed_hand
-        for formed_value_hand in formed_value_hands
-        for formed_hand in _reconstruct_formed_hand(tiles, formed_value_hand)
-    ]
+    return list(iter_formed_hands(tiles))
+
+
+def iter_formed_hands(tiles: list[TileId]) -> Iterator[list[Meld]]:
+    """
+    Iterate over the possibilities of forming a winning hand with the given
+    tiles, in the same order as :py:func:`formed_hand_possibilities`.
+
+    Each formed hand is only built when the iterator reaches it, so callers
+    that stop early do not pay for the rest.
+
+    :param tiles: A list of :py:class:`TileId` s of the tiles in the hand.
+                  The winning tile should be the last tile in this list.
+    """
+    tile_values = get_tile_values(tiles)
+    for value_melds in _iter_value_formed_hands(tile_values):
+        yield from _reconstruct_formed_hand(tiles, value_melds)
+
+
+_ValueMeld = tuple[MeldType, tuple[TileValue, ...]]
+"""
+A lightweight version of :py:class:`TileValueMeld` used while searching
+for formed hands, as its :py:class:`MeldType` and tile values.
+"""
 
 
 def _reconstruct_formed_hand(
-    tiles: Sequence[TileId], tile_value_melds: list[TileValueMeld]
+    tiles: Sequence[TileId], value_melds: Sequence[_ValueMeld]
 ) -> list[list[Meld]]:
-    winning_tile = tiles[-1]
-    winning_tile_value = get_tile_value(winning_tile)
+    winning_tile_value = get_tile_value(tiles[-1])
     tiles_copy = list(tiles)
-    melds_with_last_tile_indices = [
-        (index, meld.tiles.index(winning_tile_value))
-        for index, meld in enumerate(tile_value_melds)
-        if winning_tile_value in meld.tiles
-    ]
-    reconstructed_hand = [
-        Meld(
-            meld_type=tile_value_meld.meld_type,
-            tiles=[
-                remove_tile_value(tiles_copy, tile_value)
-                for tile_value in tile_value_meld.tiles
-            ],
-        )
-        for tile_value_meld in tile_value_melds
+    meld_tiles = [
+        [remove_tile_value(tiles_copy, tile_value) for tile_value in tile_values]
+        for _, tile_values in value_melds
     ]
+    # The melds are already known to be valid, so pydantic validation
+    # is skipped when building them.
     return [
         [
-            meld.model_copy(
-                update={
-                    "winning_tile_index": (
-                        winning_tile_index if meld_index == winning_meld_index else None
-                    )
-                },
-                deep=True,
+            Meld.model_construct(
+                meld_type=meld_type,
+                tiles=meld_tiles[meld_index].copy(),
+                winning_tile_index=(
+                    tile_values.index(winning_tile_value)
+                    if meld_index == winning_meld_index
+                    else None
+                ),
             )
-            for meld_index, meld in enumerate(reconstructed_hand)
+            for meld_index, (meld_type, tile_values) in enumerate(value_melds)
         ]
-        for (winning_meld_index, winning_tile_index) in melds_with_last_tile_indices
+        for winning_meld_index, (_, tile_values) in enumerate(value_melds)
+        if winning_tile_value in tile_values
     ]
 
 
-def _standard_formed_hand_possibilities(
-    tiles: list[TileId],
-) -> list[list[TileValueMeld]]:
-    tile_values = get_tile_values(tiles)
-    if len(tile_values) % 3 != 2:
-        return []
-    suits: list[list[TileValue]] = [[] for _ in range(4)]
-    for tile_value in sorted(tile_values):
-        if tile_value < 10:
-            suits[0].append(tile_value)
-        elif tile_value < 20:
-            suits[1].append(tile_value)
-        elif tile_value < 30:
-            suits[2].append(tile_value)
-        else:
-            suits[3].append(tile_value)
-    if sum(len(suit) % 3 != 0 for suit in suits) != 1:
-        return []
-    formed_hands: list[list[TileValueMeld]] = [[]]
-    for index, suit in enumerate(suits):
-        if len(formed_hands) == 0:
-            return formed_hands
-        if index < 3:
-            if len(suit) % 3 == 2:
-                suit_formed_hands = _split_suit_into_3melds_and_pair(suit)
+@cache
+def _get_suit_value_decompositions(
+    suit_index: int, key: SuitKey
+) -> tuple[tuple[_ValueMeld, ...], ...]:
+    decompositions: list[tuple[_ValueMeld, ...]] = []
+    for decomposition in get_suit_decompositions(suit_index, key):
+        value_melds: list[_ValueMeld] = []
+        for meld_type, index in decomposition:
+            tile_value = get_suit_tile_value(suit_index, index)
+            tile_values: tuple[TileValue, ...]
+            if meld_type == MeldType.CHI:
+                tile_values = (tile_value, tile_value + 1, tile_value + 2)
+            elif meld_type == MeldType.PON:
+                tile_values = (tile_value, tile_value, tile_value)
             else:
-                suit_formed_hands = _split_suit_into_3melds(suit)
-        else:
-            if len(suit) % 3 == 2:
-                suit_formed_hands = _split_suit_into_pons_and_pair(suit)
-            else:
-                suit_formed_hands = _split_suit_into_pons(suit)
-        formed_hands = [
-            formed_hand + suit_formed_hand
-            for formed_hand in formed_hands
-            for suit_formed_hand in suit_formed_hands
-        ]
-    return formed_hands
-
-
-def _split_suit_into_pons(tiles: list[TileValue]) -> list[list[TileValueMeld]]:
-    assert len(tiles) % 3 == 0
-    tile_counts = dict((tile, tiles.count(tile)) for tile in set(tiles))
-    assert all(count <= 4 for count in tile_counts.values())
-    if all(count == 3 for count in tile_counts.values()):
-        return [
-            [
-                TileValueMeld(meld_type=MeldType.PON, tiles=[tile, tile, tile])
-                for tile in tile_counts.keys()
-            ]
-        ]
-    else:
-        return []
+                tile_values = (tile_value, tile_value)
+            value_melds.append((meld_type, tile_values))
+        decompositions.append(tuple(value_melds))
+    return tuple(decompositions)
 
 
-def _split_suit_into_pons_and_pair(
-    tiles: list[TileValue],
-) -> list[list[TileValueMeld]]:
-    assert len(tiles) % 3 == 2
-    tile_counts = dict((tile, tiles.count(tile)) for tile in set(tiles))
-    assert all(count <= 4 for count in tile_counts.values())
-    if sum(count != 3 for count in tile_counts.values()) == 1:
-        return [
-            [
-                (
-                    TileValueMeld(meld_type=MeldType.PON, tiles=[tile, tile, tile])
-                    if count == 3
-                    else TileValueMeld(meld_type=MeldType.PAIR, tiles=[tile, tile])
-                )
-                for (tile, count) in tile_counts.items()
-            ]
-        ]
-    else:
-        return []
+def _iter_value_formed_hands(
+    tile_values: list[TileValue],
+) -> Iterator[tuple[_ValueMeld, ...]]:
+    yield from _iter_standard_formed_hands(tile_values)
+    if len(tile_values) == 14:
+        yield from _form_seven_pairs(tile_values)
+        yield from _form_thirteen_orphans(tile_values)
 
 
-def _split_suit_into_3melds(tiles: list[TileValue]) -> list[list[TileValueMeld]]:
-    assert len(tiles) % 3 == 0
-    assert tiles == sorted(tiles)
-    if len(tiles) == 0:
-        return [[]]
-    tiles = list(tiles)
-    tile = tiles[0]
-    formed_hands: list[list[TileValueMeld]] = []
-    if tiles[2] == tile:
-        remaining_tiles = tiles[3:]
-        formed_hands.extend(
-            [TileValueMeld(meld_type=MeldType.PON, tiles=[tile, tile, tile])]
-            + formed_hand
-            for formed_hand in _split_suit_into_3melds(remaining_tiles)
-        )
-    try:
-        remaining_tiles = tiles[1:]
-        remaining_tiles.remove(tile + 1)
-        remaining_tiles.remove(tile + 2)
-        formed_hands.extend(
-            [TileValueMeld(meld_type=MeldType.CHI, tiles=[tile, tile + 1, tile + 2])]
-            + formed_hand
-            for formed_hand in _split_suit_into_3melds(remaining_tiles)
-        )
-    except ValueError:
-        pass
-    return formed_hands
-
-
-def _split_suit_into_3melds_and_pair(
-    tiles: list[TileValue],
-) -> list[list[TileValueMeld]]:
-    assert len(tiles) % 3 == 2
-    assert tiles == sorted(tiles)
-    tile_sum = sum(tiles)
-    formed_hands: list[list[TileValueMeld]] = []
-    for index, tile in enumerate(tiles):
-        if index > 0 and tiles[index - 1] == tile:
-            continue
-        if index == len(tiles) - 1:
-            continue
-        if tiles[index + 1] != tile:
-            continue
-        if (tile_sum - 2 * tile) % 3 != 0:
+def _iter_standard_formed_hands(
+    tile_values: list[TileValue],
+) -> Iterator[tuple[_ValueMeld, ...]]:
+    if len(tile_values) % 3 != 2:
+        return
+    suit_shapes = get_suit_shapes(tile_values)
+    if suit_shapes is None:
+        return
+    suit_keys, suit_sizes = suit_shapes
+    if sum(suit_size % 3 != 0 for suit_size in suit_sizes) != 1:
+        return
+    suits_formed_hands: list[tuple[tuple[_ValueMeld, ...], ...]] = []
+    for suit_index, key in enumerate(suit_keys):
+        if key == 0:
             continue
-        remaining_tiles = tiles[:index] + tiles[index + 2 :]
-        formed_hands.extend(
-            [TileValueMeld(meld_type=MeldType.PAIR, tiles=[tile, tile])] + formed_hand
-            for formed_hand in _split_suit_into_3melds(remaining_tiles)
-        )
-    return formed_hands
+        suit_formed_hands = _get_suit_value_decompositions(suit_index, key)
+        if len(suit_formed_hands) == 0:
+            return
+        suits_formed_hands.append(suit_formed_hands)
+    for suit_formed_hands in product(*suits_formed_hands):
+        yield tuple(chain.from_iterable(suit_formed_hands))
 
 
-def _form_seven_pairs(tiles: list[TileId]) -> list[list[TileValueMeld]]:
-    tile_values = get_tile_values(tiles)
+def _form_seven_pairs(tile_values: list[TileValue]) -> list[tuple[_ValueMeld, ...]]:
     if len(tile_values) != 14:
         return []
     tile_counts = dict((tile, tile_values.count(tile)) for tile in set(tile_values))
     if all(count == 2 for count in tile_counts.values()):
-        return [
-            [
-                TileValueMeld(meld_type=MeldType.PAIR, tiles=[tile, tile])
-                for tile in tile_counts.keys()
-            ]
-        ]
+        return [tuple((MeldType.PAIR, (tile, tile)) for tile in tile_counts.keys())]
     else:
         return []
 
 
-def _form_thirteen_orphans(tiles: list[TileId]) -> list[list[TileValueMeld]]:
-    tile_values = get_tile_values(tiles)
+def _form_thirteen_orphans(
+    tile_values: list[TileValue],
+) -> list[tuple[_ValueMeld, ...]]:
     if len(tile_values) != 14:
         return []
     tiles_list = list(tile_values)
@@ -256,14 +335,7 @@ def _form_thirteen_orphans(tiles: list[TileId]) -> list[list[TileValueMeld]]:
             tiles_list.remove(tile)
         assert len(tiles_list) == 1
         if tiles_list[0] in orphans:
-            return [
-                [
-                    TileValueMeld(
-                        meld_type=MeldType.THIRTEEN_ORPHANS,
-                        tiles=sorted(list(tile_values)),
-                    )
-                ]
-            ]
+            return [((MeldType.THIRTEEN_ORPHANS, tuple(sorted(tile_values))),)]
         else:
             return []
     except ValueError:
@@ -1,3 +1,4 @@
+from random import Random, getrandbits
 from typing import final
 
 from .action import Action
@@ -10,6 +11,21 @@ from .tile import TileId
 from .win import Win
 
 
+def get_round_rng(seed: int, round_index: int) -> Random:
+    """
+    Return the random number generator used to shuffle the deck of a round
+    of a game.
+
+    Each round gets its own generator derived from the game's seed, so the
+    deck of any round can be regenerated without replaying the rounds
+    before it.
+
+    :param seed: The seed of the game.
+    :param round_index: The number of rounds played in the game before the round.
+    """
+    return Random(f"{seed}:{round_index}")
+
+
 @final
 class Game:
     """
@@ -19,6 +35,11 @@ class Game:
                              in the first round.
     :param options: (Optional) A :py:class:`GameOptions` object with the game
                     options to use. If this is ``None`` the default options are used.
+    :param seed: (Optional) The seed of the random number generators that
+                 shuffle the decks of the game's rounds
+                 (see :py:func:`get_round_rng`). If this is ``None`` a seed is
+                 drawn from the global random number generator of the
+                 :py:mod:`random` module.
     """
 
     def __init__(
@@ -26,6 +47,7 @@ class Game:
         *,
         first_deck_tiles: list[TileId] | None = None,
         options: GameOptions | None = None,
+        seed: int | None = None,
     ):
         if options is not None:
             _options = options
@@ -39,6 +61,8 @@ class Game:
         self._win: Win | None = None
         self._scoring: Scoring | None = None
         self._draw_count: int = 0
+        self._seed = seed if seed is not None else getrandbits(64)
+        self._round_index = 0
         self._create_round(first_deck_tiles)
 
     @property
@@ -46,6 +70,16 @@ class Game:
         "The number of players."
         return self._player_count
 
+    @property
+    def seed(self) -> int:
+        "The seed of the random number generators of the game's rounds."
+        return self._seed
+
+    @property
+    def round_index(self) -> int:
+        "The number of rounds played before the current round."
+        return self._round_index
+
     @property
     def wind_round(self) -> int:
         "The current wind round."
@@ -162,6 +196,7 @@ class Game:
             self._draw_count += 1
         else:
             self._draw_count = 0
+        self._round_index += 1
         self._create_round(deck_tiles)
 
     def _next_round(self) -> tuple[int, int]:
@@ -185,6 +220,7 @@ class Game:
             tiles=deck_tiles,
             options=self._options,
             round_end_callback=on_round_end,
+            rng=get_round_rng(self._seed, self._round_index),
         )
         self._win = None
         self._scoring = None
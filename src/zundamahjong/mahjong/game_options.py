@@ -1,3 +1,5 @@
+from collections.abc import Hashable
+
 from pydantic import BaseModel
 
 from .pattern import PatternData, default_pattern_data
@@ -164,3 +166,57 @@ class GameOptions(BaseModel):
     @property
     def game_length(self) -> tuple[int, int]:
         return (self.game_length_wind_rounds, self.game_length_sub_rounds)
+
+    def get_scored_patterns(self) -> dict[str, PatternData]:
+        """
+        Return the patterns that can affect the scoring of a hand,
+        with the han and fu that each of them score.
+
+        These are the patterns with non-zero han, or non-zero fu
+        if :py:attr:`calculate_fu` is set, together with ``SEVEN_PAIRS``
+        if seven-pairs hands score a fixed amount of fu.
+        Every other pattern can be skipped when scoring.
+
+        """
+        use_fixed_fu = self.calculate_fu and self.seven_pairs_use_fixed_fu
+        return {
+            pattern: pattern_data
+            for pattern, pattern_data in (
+                default_pattern_data | self.pattern_data
+            ).items()
+            if pattern_data.han != 0
+            or (self.calculate_fu and pattern_data.fu != 0)
+            or (use_fixed_fu and pattern == "SEVEN_PAIRS")
+        }
+
+    def get_scoring_key(self) -> Hashable:
+        """
+        Return a hashable key for the options that affect scoring,
+        which is the same for two options that score hands the same way.
+
+        The key is built from the current values of the options every time,
+        so it also reflects changes made to :py:attr:`pattern_data` or
+        :py:attr:`base_score_limits` in place.
+        """
+        return (
+            self.player_count,
+            self.score_dealer_ron_multiplier,
+            self.score_dealer_tsumo_multiplier,
+            self.score_nondealer_ron_multiplier,
+            self.score_nondealer_tsumo_nondealer_multiplier,
+            self.score_nondealer_tsumo_dealer_multiplier,
+            self.calculate_fu,
+            self.base_fu,
+            self.round_up_fu,
+            self.seven_pairs_use_fixed_fu,
+            self.seven_pairs_fixed_fu,
+            self.round_up_points,
+            tuple(
+                (score_limit.han, score_limit.score)
+                for score_limit in self.base_score_limits
+            ),
+            tuple(
+                (pattern, pattern_data.display_name, pattern_data.han, pattern_data.fu)
+                for pattern, pattern_data in self.get_scored_patterns().items()
+            ),
+        )
@@ -1,5 +1,6 @@
-from collections.abc import Sequence
-from typing import final
+from bisect import insort
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple, final
 
 from .action import (
     Action,
@@ -21,18 +22,47 @@ from .call import (
 )
 from .deck import Deck
 from .discard_pool import DiscardPool
-from .form_hand import get_waits, is_winning
+from .form_hand import (
+    get_count_discard_waits,
+    get_count_waits,
+    get_discard_waits,
+    is_count_winning,
+)
 from .tile import (
     TileId,
     TileValue,
+    flower_value_top,
     get_tile_value,
-    get_tile_value_buckets,
     get_tile_values,
     is_number,
     tile_id_is_flower,
+    tile_value_top,
 )
 
 
+@final
+class HandSnapshot(NamedTuple):
+    """
+    Represents the state of a :py:class:`Hand` at some point of a round.
+    See :py:meth:`Hand.snapshot`.
+    """
+
+    tiles: tuple[TileId, ...]
+    "The tiles in the hand, in order."
+    calls: tuple[Call, ...]
+    "The hand's calls."
+    flowers: tuple[TileId, ...]
+    "The hand's flowers."
+    riichi_discard_index: int | None
+    "The number of discards made before the hand called riichi."
+    waits: frozenset[TileValue] | None
+    "The cached waits of the hand, if they have been calculated."
+    discard_waits: dict[TileValue, frozenset[TileValue]] | None
+    "The cached discard waits of the hand, if they have been calculated."
+    version: int
+    "The version of the hand."
+
+
 @final
 class Hand:
     """
@@ -49,10 +79,14 @@ class Hand:
         self._deck = deck
         self._discard_pool = discard_pool
         self._tiles: list[TileId] = []
+        self._tile_counts = [0] * tile_value_top
+        self._tile_buckets: list[list[TileId]] = [[] for _ in range(flower_value_top)]
         self._calls: list[Call] = []
         self._flowers: list[TileId] = []
         self._waits: frozenset[TileValue] | None = None
+        self._discard_waits: dict[TileValue, frozenset[TileValue]] | None = None
         self._riichi_discard_index: int | None = None
+        self._version = 0
 
     @property
     def tiles(self) -> Sequence[TileId]:
@@ -70,6 +104,16 @@ class Hand:
         """
         return get_tile_values(self._tiles)
 
+    @property
+    def tile_counts(self) -> Sequence[int]:
+        """
+        Return the number of copies of each non-flower :py:class:`TileValue`
+        in the player's hand, indexed by tile value.
+
+        This is kept up to date as tiles are added to and removed from the hand.
+        """
+        return self._tile_counts
+
     @property
     def is_riichi(self) -> bool:
         """
@@ -108,9 +152,81 @@ class Hand:
         """
         return self._flowers
 
+    @property
+    def version(self) -> int:
+        """
+        A number that increases every time the hand changes, so that
+        values calculated from the hand can tell when they are stale.
+        """
+        return self._version
+
+    def snapshot(self) -> HandSnapshot:
+        "Return the current state of the hand, to be passed to :py:meth:`restore`."
+        return HandSnapshot(
+            tiles=tuple(self._tiles),
+            calls=tuple(self._calls),
+            flowers=tuple(self._flowers),
+            riichi_discard_index=self._riichi_discard_index,
+            waits=self._waits,
+            discard_waits=self._discard_waits,
+            version=self._version,
+        )
+
+    def restore(self, snapshot: HandSnapshot) -> None:
+        """
+        Return the hand to an earlier state.
+
+        :param snapshot: The :py:class:`HandSnapshot` of the state,
+                         returned by :py:meth:`snapshot`.
+        """
+        self._fill_tiles(snapshot.tiles)
+        self._calls = list(snapshot.calls)
+        self._flowers = list(snapshot.flowers)
+        self._riichi_discard_index = snapshot.riichi_discard_index
+        self._waits = snapshot.waits
+        self._discard_waits = snapshot.discard_waits
+        self._version = snapshot.version
+
+    def _on_change(self) -> None:
+        self._waits = None
+        self._discard_waits = None
+        self._version += 1
+
     def sort(self) -> None:
         "Sort the hand's tiles in ascending order of :py:class:`TileId` ."
         self._tiles.sort()
+        self._version += 1
+
+    def _add_tile(self, tile: TileId) -> None:
+        self._tiles.append(tile)
+        tile_value = get_tile_value(tile)
+        insort(self._tile_buckets[tile_value], tile)
+        if tile_value < tile_value_top:
+            self._tile_counts[tile_value] += 1
+
+    def _remove_tile(self, tile: TileId) -> None:
+        self._tiles.remove(tile)
+        tile_value = get_tile_value(tile)
+        self._tile_buckets[tile_value].remove(tile)
+        if tile_value < tile_value_top:
+            self._tile_counts[tile_value] -= 1
+
+    def _fill_tiles(self, tiles: Iterable[TileId]) -> None:
+        self._tiles = list(tiles)
+        self._tile_buckets = [[] for _ in range(flower_value_top)]
+        for tile in sorted(self._tiles):
+            self._tile_buckets[get_tile_value(tile)].append(tile)
+        self._tile_counts = [
+            len(bucket) for bucket in self._tile_buckets[:tile_value_top]
+        ]
+
+    def _set_tiles(self, tiles: list[TileId]) -> None:
+        "Replace the tiles in the hand, without touching the deck."
+        self._fill_tiles(tiles)
+        self._on_change()
+
+    def _has_flowers(self) -> bool:
+        return any(self._tile_buckets[tile_value_top:])
 
     def add_to_hand(self, tile_count: int) -> None:
         """
@@ -119,17 +235,18 @@ class Hand:
         :param tile_count: The number of tiles to draw (must be >= 0).
         """
         assert tile_count >= 0
-        self._tiles.extend(self._deck.pop() for _ in range(tile_count))
-        self._waits = None
+        for _ in range(tile_count):
+            self._add_tile(self._deck.pop())
+        self._on_change()
 
     def draw(self) -> None:
         "Draw a tile from the deck and add it to the hand."
-        self._tiles.append(self._deck.pop())
-        self._waits = None
+        self._add_tile(self._deck.pop())
+        self._on_change()
 
     def _draw_from_back(self) -> None:
         "Draw a tile from the back of the deck and add it to the hand."
-        self._tiles.append(self._deck.popleft())
+        self._add_tile(self._deck.popleft())
 
     def get_discards(self) -> list[Action]:
         """
@@ -153,10 +270,10 @@ class Hand:
 
         :param tile: The :py:class:`TileId` of the tile to discard.
         """
-        self._tiles.remove(tile)
+        self._remove_tile(tile)
         self._discard_pool.append(self._player_index, tile)
         self.sort()
-        self._waits = None
+        self._on_change()
 
     def get_riichis(self) -> list[Action]:
         """
@@ -170,10 +287,11 @@ class Hand:
             call.call_type == CallType.CLOSED_KAN for call in self._calls
         ):
             return []
+        discard_waits = self.discard_waits
         return [
             HandTileAction(action_type=ActionType.RIICHI, tile=tile)
-            for index, tile in enumerate(self._tiles)
-            if len(get_waits(self._tiles[:index] + self._tiles[index + 1 :])) > 0
+            for tile in self._tiles
+            if len(discard_waits[get_tile_value(tile)]) > 0
         ]
 
     def riichi(self, tile: TileId) -> None:
@@ -182,11 +300,11 @@ class Hand:
 
         :param tile: The :py:class:`TileId` of the tile to discard.
         """
-        self._tiles.remove(tile)
+        self._remove_tile(tile)
         self._riichi_discard_index = len(self._discard_pool.discards)
-        self._discard_pool.append(self._player_index, tile)
+        self._discard_pool.append(self._player_index, tile, is_riichi=True)
         self.sort()
-        self._waits = None
+        self._on_change()
 
     def get_chiis(self) -> list[Action]:
         """
@@ -205,11 +323,10 @@ class Hand:
         if not is_number(discard_value):
             return actions
         # get lists of tiles with values discard_value-2, ..., discard_value+2
-        nearby_tiles: list[list[TileId]] = [[], [], [], [], []]
-        for tile in self._tiles:
-            value_diff = get_tile_value(tile) - discard_value
-            if -2 <= value_diff <= 2:
-                nearby_tiles[value_diff + 2].append(tile)
+        nearby_tiles = [
+            self._tile_buckets[tile_value] if tile_value >= 0 else []
+            for tile_value in range(discard_value - 2, discard_value + 3)
+        ]
 
         if len(nearby_tiles[1]) > 0:
             # note this rules out discard_value = 1, 11, 21
@@ -253,8 +370,8 @@ class Hand:
         :param other_tiles: The tiles in the hand that are used to form a chii
                             :py:class:`OpenCall` with the last discarded tile.
         """
-        self._tiles.remove(other_tiles[0])
-        self._tiles.remove(other_tiles[1])
+        self._remove_tile(other_tiles[0])
+        self._remove_tile(other_tiles[1])
         self._calls.append(
             OpenCall(
                 call_type=CallType.CHI,
@@ -263,7 +380,7 @@ class Hand:
                 other_tiles=other_tiles,
             )
         )
-        self._waits = None
+        self._on_change()
 
     def get_pons(self) -> list[Action]:
         """
@@ -278,10 +395,7 @@ class Hand:
         last_discarded_tile = self._discard_pool.last_discarded_tile
         if last_discarded_tile is None:
             return actions
-        discard_value = get_tile_value(last_discarded_tile)
-        same_tiles = [
-            tile for tile in self._tiles if get_tile_value(tile) == discard_value
-        ]
+        same_tiles = self._tile_buckets[get_tile_value(last_discarded_tile)]
         if len(same_tiles) >= 2:
             actions.append(
                 OpenCallAction(
@@ -305,8 +419,8 @@ class Hand:
         :param other_tiles: The tiles in the hand that are used to form a pon
                             :py:class:`OpenCall` with the last discarded tile.
         """
-        self._tiles.remove(other_tiles[0])
-        self._tiles.remove(other_tiles[1])
+        self._remove_tile(other_tiles[0])
+        self._remove_tile(other_tiles[1])
         self._calls.append(
             OpenCall(
                 call_type=CallType.PON,
@@ -315,7 +429,7 @@ class Hand:
                 other_tiles=other_tiles,
             )
         )
-        self._waits = None
+        self._on_change()
 
     def get_open_kans(self) -> list[Action]:
         """
@@ -330,10 +444,7 @@ class Hand:
         last_discarded_tile = self._discard_pool.last_discarded_tile
         if last_discarded_tile is None:
             return actions
-        discard_value = get_tile_value(last_discarded_tile)
-        same_tiles = [
-            tile for tile in self._tiles if get_tile_value(tile) == discard_value
-        ]
+        same_tiles = self._tile_buckets[get_tile_value(last_discarded_tile)]
         if len(same_tiles) >= 3:
             actions.append(
                 OpenKanAction(
@@ -358,9 +469,9 @@ class Hand:
         :param other_tiles: The tiles in the hand that are used to form an
                             :py:class:`OpenKanCall` with the last discarded tile.
         """
-        self._tiles.remove(other_tiles[0])
-        self._tiles.remove(other_tiles[1])
-        self._tiles.remove(other_tiles[2])
+        self._remove_tile(other_tiles[0])
+        self._remove_tile(other_tiles[1])
+        self._remove_tile(other_tiles[2])
         self._calls.append(
             OpenKanCall(
                 call_type=CallType.OPEN_KAN,
@@ -371,23 +482,19 @@ class Hand:
         )
         self.sort()
         self._draw_from_back()
-        self._waits = None
+        self._on_change()
 
     def get_add_kans(self) -> list[Action]:
         """
         Return a list of :py:class:`Action` s of the hand's legal added kan actions.
         """
-        pon_values = dict(
-            (get_tile_value(call.called_tile), call)
-            for call in self._calls
-            if call.call_type == CallType.PON
-        )
         actions: list[Action] = []
-        for tile in self._tiles:
-            tile_value = get_tile_value(tile)
-            pon_call = pon_values.get(tile_value)
-            if pon_call is not None:
-                actions.append(AddKanAction(tile=tile, pon_call=pon_call))
+        for call in self._calls:
+            if call.call_type == CallType.PON:
+                actions.extend(
+                    AddKanAction(tile=tile, pon_call=call)
+                    for tile in self._tile_buckets[get_tile_value(call.called_tile)]
+                )
         return actions
 
     def add_kan(self, tile: TileId, pon_call: OpenCall) -> None:
@@ -401,7 +508,7 @@ class Hand:
                      pon :py:class:`OpenCall`.
         :param pon_call: The existing pon :py:class:`OpenCall`.
         """
-        self._tiles.remove(tile)
+        self._remove_tile(tile)
         call_index = self._calls.index(pon_call)
         self._calls[call_index] = AddKanCall(
             called_player_index=pon_call.called_player_index,
@@ -412,34 +519,40 @@ class Hand:
         self._discard_pool.append(self._player_index, tile, is_added_kan=True)
         self.sort()
         self._draw_from_back()
-        self._waits = None
+        self._on_change()
 
     def get_closed_kans(self) -> list[Action]:
         """
         Return a list of :py:class:`Action` s of the hand's legal closed kan actions.
         """
-        tile_value_buckets = get_tile_value_buckets(self._tiles)
         if self.is_riichi:
             last_tile_value = get_tile_value(self._tiles[-1])
-            bucket = tile_value_buckets[last_tile_value]
+            bucket = self._tile_buckets[last_tile_value]
             if len(bucket) >= 4:
-                kan_tiles = (bucket[0], bucket[1], bucket[2], bucket[3])
-                current_waits = self._calculate_waits(self._tiles[:-1])
-                tiles_copy = self._tiles.copy()
-                for tile in kan_tiles:
-                    tiles_copy.remove(tile)
-                new_waits = self._calculate_waits(tiles_copy)
+                # The kan's tiles are listed in hand order.
+                hand_bucket = sorted(bucket, key=self._tiles.index)
+                kan_tiles = (
+                    hand_bucket[0],
+                    hand_bucket[1],
+                    hand_bucket[2],
+                    hand_bucket[3],
+                )
+                tile_counts = self._tile_counts.copy()
+                tile_counts[last_tile_value] -= 1
+                current_waits = self._calculate_waits(tile_counts)
+                tile_counts[last_tile_value] -= 3
+                new_waits = self._calculate_waits(tile_counts)
                 if current_waits == new_waits:
                     return [ClosedKanAction(tiles=kan_tiles)]
             return []
-        actions: list[Action] = []
-        for bucket in tile_value_buckets.values():
-            if len(bucket) >= 4:
-                bucket.sort()
-                actions.append(
-                    ClosedKanAction(tiles=(bucket[0], bucket[1], bucket[2], bucket[3]))
-                )
-        return actions
+        kan_buckets = [bucket for bucket in self._tile_buckets if len(bucket) >= 4]
+        if len(kan_buckets) > 1:
+            # The kans are listed in the order their tiles first appear in the hand.
+            kan_buckets.sort(key=lambda bucket: min(map(self._tiles.index, bucket)))
+        return [
+            ClosedKanAction(tiles=(bucket[0], bucket[1], bucket[2], bucket[3]))
+            for bucket in kan_buckets
+        ]
 
     def closed_kan(self, tiles: tuple[TileId, TileId, TileId, TileId]) -> None:
         """
@@ -449,20 +562,22 @@ class Hand:
         :param tiles: A tuple of the :py:class:`TileId` s of the four tiles
                       used to make the closed kan.
         """
-        self._tiles.remove(tiles[0])
-        self._tiles.remove(tiles[1])
-        self._tiles.remove(tiles[2])
-        self._tiles.remove(tiles[3])
+        self._remove_tile(tiles[0])
+        self._remove_tile(tiles[1])
+        self._remove_tile(tiles[2])
+        self._remove_tile(tiles[3])
         self._calls.append(ClosedKanCall(tiles=tiles))
         self._discard_pool.append(self._player_index, tiles[0], is_closed_kan=True)
         self.sort()
         self._draw_from_back()
-        self._waits = None
+        self._on_change()
 
     def get_flowers(self) -> list[Action]:
         """
         Return a list of :py:class:`Action` s of the hand's legal flower actions.
         """
+        if not self._has_flowers():
+            return []
         return [
             HandTileAction(action_type=ActionType.FLOWER, tile=tile)
             for tile in self._tiles
@@ -476,17 +591,19 @@ class Hand:
 
         :param tile: The :py:class:`TileId` of the flower in the hand.
         """
-        self._tiles.remove(tile)
+        self._remove_tile(tile)
         self._flowers.append(tile)
         self.sort()
         self._draw_from_back()
-        self._waits = None
+        self._on_change()
 
     def can_tsumo(self) -> bool:
         """
         Return a bool indicating whether the hand forms a winning shape.
         """
-        return is_winning(self._tiles)
+        if self._has_flowers():
+            return False
+        return is_count_winning(self._tile_counts)
 
     @property
     def waits(self) -> frozenset[TileValue]:
@@ -498,20 +615,63 @@ class Hand:
         recalculated if the hand has not changed.
         """
         if self._waits is None:
-            self._waits = self._calculate_waits(self._tiles)
+            self._waits = self._calculate_waits(self._tile_counts)
         return self._waits
 
-    def _calculate_waits(self, hand_tiles: list[TileId]) -> frozenset[TileValue]:
-        if len(hand_tiles) % 3 != 1:
+    @property
+    def discard_waits(self) -> dict[TileValue, frozenset[TileValue]]:
+        """
+        Return a dictionary mapping the :py:class:`TileValue` of each tile
+        in the hand to the frozenset of waits the hand would have after
+        discarding that tile.
+
+        Like :py:attr:`waits`, this leaves out tile values whose four copies
+        would all be in the hand and its calls, and is cached until the hand
+        changes.
+        """
+        if self._discard_waits is None:
+            if self._has_flowers():
+                discard_waits = get_discard_waits(self._tiles)
+            else:
+                discard_waits = get_count_discard_waits(self._tile_counts)
+            tile_counts = self._tile_counts
+            call_counts = self._get_call_counts()
+            if any(
+                tile_count + call_count >= 4
+                for tile_count, call_count in zip(tile_counts, call_counts)
+            ):
+                discard_waits = {
+                    discard_value: frozenset(
+                        tile_value
+                        for tile_value in waits
+                        if tile_counts[tile_value]
+                        - (tile_value == discard_value)
+                        + call_counts[tile_value]
+                        < 4
+                    )
+                    for discard_value, waits in discard_waits.items()
+                }
+            self._discard_waits = discard_waits
+        return self._discard_waits
+
+    def _get_call_counts(self) -> list[int]:
+        call_counts = [0] * tile_value_top
+        for tile in self.call_tiles:
+            call_counts[get_tile_value(tile)] += 1
+        return call_counts
+
+    def _calculate_waits(self, tile_counts: list[int]) -> frozenset[TileValue]:
+        if self._has_flowers():
             return frozenset()
-        all_tiles_buckets = get_tile_value_buckets(hand_tiles + self.call_tiles)
-        unusable_tile_values = {
-            tileValue
-            for (tileValue, tiles) in all_tiles_buckets.items()
-            if len(tiles) >= 4
-        }
-        waits = get_waits(hand_tiles)
-        return waits - unusable_tile_values
+        waits = get_count_waits(tile_counts)
+        if len(waits) == 0:
+            return waits
+        call_counts = self._get_call_counts()
+        return frozenset(
+            tile_value
+            for tile_value in waits
+            if tile_counts[tile_value] + call_counts[tile_value] < 4
+        )
 
     @property
     def is_temporary_furiten(self) -> bool:
@@ -519,18 +679,9 @@ class Hand:
         Whether any old discard since the player's last discard is
         one of the hand's waits.
         """
-        for discard in reversed(self._discard_pool.discards):
-            if discard.player == self._player_index:
-                if get_tile_value(discard.tile) in self.waits:
-                    return True
-                break
-            if discard.is_new:
-                continue
-            if discard.is_closed_kan:
-                continue
-            if get_tile_value(discard.tile) in self.waits:
-                return True
-        return False
+        return not self.waits.isdisjoint(
+            self._discard_pool.temporary_furiten_values(self._player_index)
+        )
 
     @property
     def is_riichi_furiten(self) -> bool:
@@ -539,31 +690,15 @@ class Hand:
         one of the hand's waits.
         If the player has not called riichi, this will be ``False``.
         """
-        if self._riichi_discard_index is None:
-            return False
-        riichi_back_index = (
-            len(self._discard_pool.discards) - 1 - self._riichi_discard_index
+        return not self.waits.isdisjoint(
+            self._discard_pool.riichi_furiten_values(self._player_index)
         )
-        for back_index, discard in enumerate(reversed(self._discard_pool.discards)):
-            if back_index == riichi_back_index:
-                if get_tile_value(discard.tile) in self.waits:
-                    return True
-                break
-            if discard.is_new:
-                continue
-            if discard.is_closed_kan:
-                continue
-            if get_tile_value(discard.tile) in self.waits:
-                return True
-        return False
 
     @property
     def is_own_discard_furiten(self) -> bool:
         """
         Whether any of the player's own discards is one of the hand's waits.
         """
-        return any(
-            discard.player == self._player_index
-            and get_tile_value(discard.tile) in self.waits
-            for discard in reversed(self._discard_pool.discards)
+        return not self.waits.isdisjoint(
+            self._discard_pool.own_discard_values(self._player_index)
         )
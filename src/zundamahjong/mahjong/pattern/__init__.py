@@ -1,6 +1,11 @@
 # pyright: reportUnusedImport=false
 # ruff: noqa: I001
 
+from collections.abc import Iterable, Iterator
+
+from ..meld import Meld
+from ..win import Win
+
 # These are imported in order to register their functions.
 from . import (
     special_win,  # noqa: F401
@@ -20,10 +25,6 @@ from . import (
 
 from .pattern_calculator import PatternData as PatternData
 from .pattern_calculator import default_pattern_data as default_pattern_data
-
-
-from ..meld import Meld
-from ..win import Win
 from .pattern_calculator import pattern_mult_funcs, PatternCalculator
 
 
@@ -35,3 +36,24 @@ def get_pattern_mults(win: Win, formed_hand: list[Meld]) -> dict[str, int]:
         if pattern_mult != 0:
             pattern_mults[pattern] = pattern_mult
     return pattern_mults
+
+
+def iter_pattern_mults(
+    win: Win, formed_hand: list[Meld], patterns: Iterable[str]
+) -> Iterator[tuple[str, int]]:
+    """
+    Lazily calculate the multiplicities of the given patterns, yielding
+    each pattern that applies to the hand along with its multiplicity.
+
+    Patterns are only evaluated as the iterator is consumed, so a caller
+    can stop as soon as it has seen enough.
+    Pattern names that are not registered are skipped.
+    """
+    pattern_calculator = PatternCalculator(win, formed_hand)
+    for pattern in patterns:
+        get_pattern_multiplicity = pattern_mult_funcs.get(pattern)
+        if get_pattern_multiplicity is None:
+            continue
+        pattern_mult = get_pattern_multiplicity(pattern_calculator)
+        if pattern_mult != 0:
+            yield pattern, pattern_mult
@@ -1,9 +1,18 @@
-from collections import Counter
-
-from ..tile import TileValue, green_tiles, honour_suit, number_suits
+from ..tile import (
+    TileValue,
+    TileValueMask,
+    green_mask,
+    honour_mask,
+    number_suit_masks,
+    tile_value_suits,
+)
 from .pattern_calculator import PatternCalculator, register_pattern
 
 
+def _is_single_number_suit(mask: TileValueMask) -> bool:
+    return mask != 0 and any(mask & ~suit_mask == 0 for suit_mask in number_suit_masks)
+
+
 @register_pattern(
     "HALF_FLUSH",
     display_name="Half Flush",
@@ -14,7 +23,10 @@ def half_flush(self: PatternCalculator) -> int:
     """
     The hand contains honour tiles and tiles from only one suit.
     """
-    return int(len(self.used_suits) == 2 and honour_suit in self.used_suits)
+    return int(
+        self.tile_mask & honour_mask != 0
+        and _is_single_number_suit(self.tile_mask & ~honour_mask)
+    )
 
 
 @register_pattern(
@@ -27,7 +39,7 @@ def full_flush(self: PatternCalculator) -> int:
     """
     The hand contains tiles from only one suit, with no honour tiles.
     """
-    return int(any(self.used_suits == {suit} for suit in number_suits))
+    return int(_is_single_number_suit(self.tile_mask))
 
 
 def _get_nine_gates_last_tile(self: PatternCalculator) -> TileValue | None:
@@ -35,7 +47,7 @@ def _get_nine_gates_last_tile(self: PatternCalculator) -> TileValue | None:
         return None
     if not full_flush(self):
         return None
-    suit = (self.hand_tiles[0] // 10) * 10
+    suit = 10 * tile_value_suits[self.hand_tiles[0]]
     model_tiles = [
         suit + 1,
         suit + 1,
@@ -51,7 +63,7 @@ def _get_nine_gates_last_tile(self: PatternCalculator) -> TileValue | None:
         suit + 9,
         suit + 9,
     ]
-    tile_counter = Counter(self.hand_tiles)
+    tile_counter = self.tile_counts.copy()
     tile_counter.subtract(model_tiles)
     if len(-tile_counter) > 0:
         return None
@@ -100,4 +112,4 @@ def all_greens(self: PatternCalculator) -> int:
     """
     The hand only uses 2s, 3s, 4s, 6s, 8s and Hatsu.
     """
-    return int(all(tile in green_tiles for tile in self.hand_tiles))
+    return int(self.tile_mask & ~green_mask == 0)
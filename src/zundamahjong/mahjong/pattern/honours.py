@@ -1,4 +1,4 @@
-from ..tile import dragons, honour_suit, winds
+from ..tile import dragons, honour_mask, winds
 from .pattern_calculator import PatternCalculator, register_pattern
 
 
@@ -13,13 +13,7 @@ def little_three_dragons(self: PatternCalculator) -> int:
     The hand contains two triplets or quads of dragons,
     and a pair of the third dragon.
     """
-    total = 0
-    for tile in dragons:
-        tile_count = self.hand_tiles.count(tile)
-        if tile_count == 4:
-            tile_count = 3
-        total += tile_count
-    return int(total == 8)
+    return int(self.capped_dragon_count == 8)
 
 
 @register_pattern(
@@ -46,13 +40,7 @@ def four_little_winds(self: PatternCalculator) -> int:
     The hand contains three triplets or quads of winds,
     and a pair of the fourth wind.
     """
-    total = 0
-    for tile in winds:
-        tile_count = self.hand_tiles.count(tile)
-        if tile_count == 4:
-            tile_count = 3
-        total += tile_count
-    return int(total == 11)
+    return int(self.capped_wind_count == 11)
 
 
 @register_pattern(
@@ -78,4 +66,4 @@ def all_honours(self: PatternCalculator) -> int:
     """
     Every tile is an honour tile.
     """
-    return int(self.used_suits == {honour_suit})
+    return int(self.tile_mask & ~honour_mask == 0)
@@ -1,4 +1,4 @@
-from ..tile import is_number
+from ..tile import number_flag, tile_value_flags, tile_value_ranks
 from .pattern_calculator import PatternCalculator, register_pattern
 
 
@@ -28,6 +28,6 @@ def eyes(self: PatternCalculator) -> int:
     if self.pair_count != 1:
         return 0
     tile = self.pair_tile
-    if not is_number(tile):
+    if not tile_value_flags[tile] & number_flag:
         return 0
-    return int((tile % 10) % 3 == 2)
+    return int(tile_value_ranks[tile] % 3 == 2)
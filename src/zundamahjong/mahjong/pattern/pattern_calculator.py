@@ -9,9 +9,16 @@ from pydantic import BaseModel
 from ..call import CallType, get_call_tiles, get_meld_type
 from ..meld import Meld, MeldType, TileValueMeld
 from ..tile import (
+    TileValue,
+    dragon_flag,
     get_tile_value,
-    is_number,
-    orphans,
+    get_tile_value_mask,
+    honour_flag,
+    orphan_flag,
+    terminal_flag,
+    tile_value_flags,
+    tile_value_ranks,
+    wind_flag,
 )
 from ..win import Win
 from .wait_pattern import get_wait_pattern
@@ -121,7 +128,7 @@ class PatternCalculator:
         self.winning_tile = winning_meld.tiles[winning_meld.winning_tile_index]
         self.wait_pattern = get_wait_pattern(winning_meld)
         self.hand_tiles = [tile for call in self.melds for tile in call.tiles]
-        self.used_suits = set((tile // 10) * 10 for tile in self.hand_tiles)
+        self._count_tiles()
         self.call_outsidenesses = set(
             self._is_outside_call(meld) for meld in self.melds
         )
@@ -139,6 +146,25 @@ class PatternCalculator:
             for call in self.melds
             if call.meld_type == MeldType.PON or call.meld_type == MeldType.KAN
         }
+        self.meld_start_tiles = {
+            call.tiles[0] for call in self.melds if call.meld_type != MeldType.PAIR
+        }
+
+    def _count_tiles(self) -> None:
+        """
+        Count the tiles of the hand and build the mask of its tile values once,
+        so that patterns can look these up instead of scanning the tiles.
+        """
+        self.tile_counts: Counter[TileValue] = Counter(self.hand_tiles)
+        self.tile_mask = get_tile_value_mask(self.tile_counts)
+        self.capped_wind_count = 0
+        self.capped_dragon_count = 0
+        for tile, count in self.tile_counts.items():
+            flags = tile_value_flags[tile]
+            if flags & wind_flag:
+                self.capped_wind_count += min(count, 3)
+            elif flags & dragon_flag:
+                self.capped_dragon_count += min(count, 3)
 
     def _count_melds(self) -> None:
         self.pair_count = 0
@@ -160,12 +186,18 @@ class PatternCalculator:
                     meld.winning_tile_index is not None
                     and self.win.lose_player is not None
                 ):
-                    if get_tile_value(meld.tiles[0]) not in orphans:
+                    if (
+                        not tile_value_flags[get_tile_value(meld.tiles[0])]
+                        & orphan_flag
+                    ):
                         self.simple_open_triplet_count += 1
                     else:
                         self.orphan_open_triplet_count += 1
                 else:
-                    if get_tile_value(meld.tiles[0]) not in orphans:
+                    if (
+                        not tile_value_flags[get_tile_value(meld.tiles[0])]
+                        & orphan_flag
+                    ):
                         self.simple_closed_triplet_count += 1
                     else:
                         self.orphan_closed_triplet_count += 1
@@ -179,7 +211,7 @@ class PatternCalculator:
             if call.call_type == CallType.CHI:
                 self.chii_meld_count += 1
             elif call.call_type == CallType.PON:
-                if get_tile_value(call.called_tile) not in orphans:
+                if not tile_value_flags[get_tile_value(call.called_tile)] & orphan_flag:
                     self.simple_open_triplet_count += 1
                 else:
                     self.orphan_open_triplet_count += 1
@@ -187,12 +219,12 @@ class PatternCalculator:
                 call.call_type == CallType.OPEN_KAN
                 or call.call_type == CallType.ADD_KAN
             ):
-                if get_tile_value(call.called_tile) not in orphans:
+                if not tile_value_flags[get_tile_value(call.called_tile)] & orphan_flag:
                     self.simple_open_quad_count += 1
                 else:
                     self.orphan_open_quad_count += 1
             elif call.call_type == CallType.CLOSED_KAN:
-                if get_tile_value(call.tiles[0]) not in orphans:
+                if not tile_value_flags[get_tile_value(call.tiles[0])] & orphan_flag:
                     self.simple_closed_quad_count += 1
                 else:
                     self.orphan_closed_quad_count += 1
@@ -201,16 +233,17 @@ class PatternCalculator:
         "Returns 2 if it contains a terminal, 1 if it contains an honor, 0 otherwise"
         tile = meld.tiles[0]
         if meld.meld_type == MeldType.CHI:
-            if tile % 10 == 1 or tile % 10 == 7:
+            if tile_value_ranks[tile] == 1 or tile_value_ranks[tile] == 7:
                 return 2
             else:
                 return 0
         elif meld.meld_type == MeldType.THIRTEEN_ORPHANS:
             return 0
         else:
-            if not is_number(tile):
+            flags = tile_value_flags[tile]
+            if flags & honour_flag:
                 return 1
-            elif tile % 10 == 1 or tile % 10 == 9:
+            elif flags & terminal_flag:
                 return 2
             else:
                 return 0
@@ -1,4 +1,4 @@
-from ..tile import is_number, terminals
+from ..tile import simple_mask, terminal_mask
 from .pattern_calculator import PatternCalculator, register_pattern
 from .wait_pattern import WaitPattern
 
@@ -13,9 +13,7 @@ def all_simples(self: PatternCalculator) -> int:
     """
     The hand does not use any terminal or honour tiles.
     """
-    return int(
-        all((is_number(tile) and 2 <= tile % 10 <= 8) for tile in self.hand_tiles)
-    )
+    return int(self.tile_mask & ~simple_mask == 0)
 
 
 @register_pattern(
@@ -73,7 +71,7 @@ def all_terminals(self: PatternCalculator) -> int:
     """
     Every tile is a terminal tile.
     """
-    return int(all(tile in terminals for tile in self.hand_tiles))
+    return int(self.tile_mask & ~terminal_mask == 0)
 
 
 @register_pattern(
@@ -1,6 +1,7 @@
 from enum import IntEnum
 
 from ..meld import MeldType, TileValueMeld
+from ..tile import tile_value_ranks
 
 
 class WaitPattern(IntEnum):
@@ -46,14 +47,14 @@ def get_wait_pattern(meld: TileValueMeld) -> WaitPattern:
     meld_type = meld.meld_type
     if meld_type == MeldType.CHI:
         if meld.winning_tile_index == 0:
-            if meld.tiles[0] % 10 == 7:
+            if tile_value_ranks[meld.tiles[0]] == 7:
                 return WaitPattern.PENCHAN
             else:
                 return WaitPattern.RYANMEN
         elif meld.winning_tile_index == 1:
             return WaitPattern.KANCHAN
         elif meld.winning_tile_index == 2:
-            if meld.tiles[2] % 10 == 3:
+            if tile_value_ranks[meld.tiles[2]] == 3:
                 return WaitPattern.PENCHAN
             else:
                 return WaitPattern.RYANMEN
@@ -1,15 +1,9 @@
-from ..meld import MeldType
 from ..tile import TileValue
 from .pattern_calculator import PatternCalculator, register_pattern
 
 
 def _yakuhai(self: PatternCalculator, pattern_tile: TileValue) -> int:
-    return int(
-        any(
-            (call.tiles[0] == pattern_tile and call.meld_type != MeldType.PAIR)
-            for call in self.melds
-        )
-    )
+    return int(pattern_tile in self.meld_start_tiles)
 
 
 @register_pattern(
@@ -0,0 +1,229 @@
+"""
+Payment tables.
+
+The amount each player pays for a win only depends on the win's han and fu,
+whether the winner is the dealer, and whether the win was by ron or tsumo.
+A :py:class:`PaymentTable` works these amounts out the first time each han
+and fu value is used under some :py:class:`GameOptions`, so that scoring
+a hand usually only needs a table lookup.
+"""
+
+from collections.abc import Hashable, Iterable
+from math import ceil
+from typing import final
+
+from pydantic import BaseModel
+
+from .game_options import GameOptions
+
+
+@final
+class Payment(BaseModel, frozen=True):
+    "Represents the amounts paid for a win with some han and fu."
+
+    base_score: float
+    "The base score of the win."
+    dealer_ron: float
+    "The amount the player who dealt in pays when the dealer wins by ron."
+    nondealer_ron: float
+    "The amount the player who dealt in pays when a nondealer wins by ron."
+    dealer_tsumo: float
+    "The amount each other player pays when the dealer wins by tsumo."
+    nondealer_tsumo_nondealer: float
+    "The amount each other nondealer pays when a nondealer wins by tsumo."
+    nondealer_tsumo_dealer: float
+    "The amount the dealer pays when a nondealer wins by tsumo."
+
+
+@final
+class PaymentGrid(BaseModel, frozen=True):
+    "Represents the payments for a range of han and fu values."
+
+    hans: list[int]
+    "The han values of the rows of the grid."
+    fus: list[int]
+    "The fu values of the columns of the grid."
+    payments: list[list[Payment]]
+    "The :py:class:`Payment` for each han (row) and fu (column)."
+
+
+max_default_han = 26
+"The highest han value shown by default in a :py:class:`PaymentGrid`."
+
+_max_payments = 1024
+
+
+def _round_up_float(value: float, step: float) -> float:
+    return step * ceil(value / step)
+
+
+@final
+class PaymentTable:
+    """
+    Class holding the payments for each han and fu value under some
+    :py:class:`GameOptions`.
+
+    Objects in this class should not usually be instantiated directly;
+    instead, use :py:func:`get_payment_table` to share tables between
+    options with the same payment settings.
+
+    :param options: The :py:class:`GameOptions` object to use.
+    """
+
+    def __init__(self, options: GameOptions) -> None:
+        self._options = options.model_copy(deep=True)
+        self._low_han_max_score = min(
+            (score_limit.score for score_limit in options.base_score_limits),
+            default=None,
+        )
+        # A hand with at least this much han always uses the same limit.
+        self._top_limit_han = max(
+            (score_limit.han for score_limit in options.base_score_limits),
+            default=None,
+        )
+        self._payments: dict[tuple[int, int], Payment] = {}
+
+    @property
+    def default_hans(self) -> list[int]:
+        """
+        The han values shown by default, from 0 up to the highest limit
+        (but no more than :py:data:`max_default_han`).
+        """
+        top_han = 13 if self._top_limit_han is None else self._top_limit_han
+        return list(range(min(max(top_han, 0), max_default_han) + 1))
+
+    @property
+    def default_fus(self) -> list[int]:
+        "The fu values shown by default, which are the fu a hand can usually score."
+        options = self._options
+        fus = {options.base_fu}
+        if options.calculate_fu:
+            fus.update(range(30, 111, 10))
+            if options.seven_pairs_use_fixed_fu:
+                fus.add(options.seven_pairs_fixed_fu)
+        return sorted(fus)
+
+    def _get_base_score(self, han: int, fu: int) -> float:
+        best_score_limit = max(
+            (
+                (score_limit.han, score_limit.score)
+                for score_limit in self._options.base_score_limits
+                if score_limit.han <= han
+            ),
+            default=None,
+        )
+        if best_score_limit is not None:
+            return best_score_limit[1]
+        han_multiplier = 1 << han
+        base_score: float = fu * 4 * han_multiplier
+        if self._low_han_max_score is not None:
+            base_score = min(base_score, self._low_han_max_score)
+        return base_score
+
+    def _get_pay_in_amount(self, multiplier: float, base_score: float) -> float:
+        pay_in_amount = multiplier * base_score
+        if self._options.round_up_points:
+            pay_in_amount = _round_up_float(pay_in_amount, 100)
+        return pay_in_amount
+
+    def get_payment(self, han: int, fu: int) -> Payment:
+        """
+        Return the amounts paid for a win with the given han and fu.
+
+        :param han: The total han of the win.
+        :param fu: The total fu of the win.
+        """
+        if self._top_limit_han is not None and han > self._top_limit_han:
+            # The base score no longer depends on the han or fu.
+            han = self._top_limit_han
+            fu = 0
+        payment = self._payments.get((han, fu))
+        if payment is None:
+            options = self._options
+            base_score = self._get_base_score(han, fu)
+            payment = Payment(
+                base_score=base_score,
+                dealer_ron=self._get_pay_in_amount(
+                    options.score_dealer_ron_multiplier, base_score
+                ),
+                nondealer_ron=self._get_pay_in_amount(
+                    options.score_nondealer_ron_multiplier, base_score
+                ),
+                dealer_tsumo=self._get_pay_in_amount(
+                    options.score_dealer_tsumo_multiplier, base_score
+                ),
+                nondealer_tsumo_nondealer=self._get_pay_in_amount(
+                    options.score_nondealer_tsumo_nondealer_multiplier, base_score
+                ),
+                nondealer_tsumo_dealer=self._get_pay_in_amount(
+                    options.score_nondealer_tsumo_dealer_multiplier, base_score
+                ),
+            )
+            if len(self._payments) >= _max_payments:
+                self._payments.pop(next(iter(self._payments)), None)
+            self._payments[han, fu] = payment
+        return payment
+
+    def get_grid(
+        self, hans: Iterable[int] | None = None, fus: Iterable[int] | None = None
+    ) -> PaymentGrid:
+        """
+        Return the payments for a range of han and fu values,
+        e.g. to display as a points table.
+
+        :param hans: The han values to include.
+                     Defaults to :py:attr:`default_hans`.
+        :param fus: The fu values to include.
+                    Defaults to :py:attr:`default_fus`.
+        """
+        han_list = self.default_hans if hans is None else list(hans)
+        fu_list = self.default_fus if fus is None else list(fus)
+        return PaymentGrid(
+            hans=han_list,
+            fus=fu_list,
+            payments=[
+                [self.get_payment(han, fu) for fu in fu_list] for han in han_list
+            ],
+        )
+
+
+def _get_payment_options_key(options: GameOptions) -> Hashable:
+    return (
+        options.score_dealer_ron_multiplier,
+        options.score_dealer_tsumo_multiplier,
+        options.score_nondealer_ron_multiplier,
+        options.score_nondealer_tsumo_nondealer_multiplier,
+        options.score_nondealer_tsumo_dealer_multiplier,
+        options.calculate_fu,
+        options.base_fu,
+        options.seven_pairs_use_fixed_fu,
+        options.seven_pairs_fixed_fu,
+        options.round_up_points,
+        tuple(
+            (score_limit.han, score_limit.score)
+            for score_limit in options.base_score_limits
+        ),
+    )
+
+
+_max_payment_tables = 32
+_payment_tables: dict[Hashable, PaymentTable] = {}
+
+
+def get_payment_table(options: GameOptions) -> PaymentTable:
+    """
+    Return the :py:class:`PaymentTable` for some :py:class:`GameOptions`.
+
+    Tables are cached by the options that affect payments, so options with
+    the same payment settings share a table.
+
+    :param options: The :py:class:`GameOptions` object to use.
+    """
+    key = _get_payment_options_key(options)
+    payment_table = _payment_tables.pop(key, None)
+    if payment_table is None:
+        payment_table = PaymentTable(options)
+        if len(_payment_tables) >= _max_payment_tables:
+            del _payment_tables[next(iter(_payment_tables))]
+    _payment_tables[key] = payment_table
+    return payment_table
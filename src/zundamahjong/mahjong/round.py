@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from collections.abc import Callable, Sequence
 from enum import IntEnum
-from typing import final
+from heapq import merge
+from random import Random
+from typing import NamedTuple, final
 
 from zundamahjong.mahjong.scoring import Scorer
 
@@ -14,18 +16,19 @@ from .action import (
     call_action_types,
 )
 from .call import Call, get_call_tiles
-from .deck import (
-    Deck,
-    four_player_deck,
-    four_player_flowers,
-    three_player_deck,
-    three_player_flowers,
-)
-from .discard_pool import Discard, DiscardPool
-from .exceptions import InvalidMoveException
+from .deck import Deck, four_player_deck, get_deck_tiles, three_player_deck
+from .discard_pool import Discard, DiscardPool, DiscardPoolSnapshot
+from .exceptions import InvalidMoveException, InvalidOperationException
 from .game_options import GameOptions
-from .hand import Hand
-from .tile import TileId, get_tile_value
+from .hand import Hand, HandSnapshot
+from .shanten import ShantenInfo, get_shanten_info
+from .tile import (
+    TileId,
+    TileValue,
+    get_tile_value,
+    get_tile_values,
+    tile_id_is_flower,
+)
 from .win import Win
 
 
@@ -80,6 +83,55 @@ def _register_do_action(
     return _register_do_action_inner
 
 
+@final
+class RoundSnapshot(NamedTuple):
+    """
+    Represents the state of a :py:class:`Round` at some point of the round.
+    See :py:meth:`Round.snapshot`.
+    """
+
+    deck: tuple[TileId, ...]
+    "The tiles left in the deck, in order."
+    discard_pool: DiscardPoolSnapshot
+    "The state of the discard pool."
+    hands: tuple[HandSnapshot, ...]
+    "The state of each player's hand."
+    current_player: int
+    "The index of the current player."
+    status: RoundStatus
+    "The status of the round."
+    flower_pass_count: int
+    "The number of players who have passed in the flower-replacement phase."
+    history: tuple[tuple[int, Action], ...]
+    "The actions performed in the round so far."
+    win: Win | None
+    "The win that ended the round, if any."
+    allowed_actions: tuple[ActionList, ...]
+    "The actions each player can take."
+    allowed_actions_keys: tuple[tuple[int, ...] | None, ...]
+    "The keys the allowed actions were calculated for."
+    sorted_player_actions: tuple[list[tuple[int, Action]], ...]
+    "The allowed actions of each player, sorted by priority."
+    all_allowed_actions: list[tuple[int, Action]]
+    "The allowed actions of all players, sorted by priority."
+
+
+class _UndoEntry(NamedTuple):
+    "The state needed to undo an action, recorded just before it is performed."
+
+    deck_position: tuple[int, int]
+    discard_pool_change_count: int
+    hand: HandSnapshot
+    current_player: int
+    status: RoundStatus
+    flower_pass_count: int
+    win: Win | None
+    allowed_actions: tuple[ActionList, ...]
+    allowed_actions_keys: tuple[tuple[int, ...] | None, ...]
+    sorted_player_actions: tuple[list[tuple[int, Action]], ...]
+    all_allowed_actions: list[tuple[int, Action]]
+
+
 @final
 class Round:
     """
@@ -96,6 +148,9 @@ class Round:
                     will be used.
     :param round_end_callback: (Optional) A callback function to call when
                                the round ends.
+    :param rng: (Optional) The random number generator to shuffle the deck
+                with, if ``tiles`` is ``None``. If set to ``None``, the global
+                random number generator of the :py:mod:`random` module is used.
     """
 
     def __init__(
@@ -107,6 +162,7 @@ class Round:
         tiles: list[TileId] | None = None,
         options: GameOptions | None = None,
         round_end_callback: Callable[[], None] = lambda: None,
+        rng: Random | None = None,
     ):
         if options is not None:
             _options = options
@@ -121,15 +177,9 @@ class Round:
         if tiles is not None:
             self._deck = Deck(tiles)
         else:
-            if _options.player_count == 3:
-                deck = three_player_deck.copy()
-                if _options.use_flowers:
-                    deck.extend(three_player_flowers)
-            else:
-                deck = four_player_deck.copy()
-                if _options.use_flowers:
-                    deck.extend(four_player_flowers)
-            self._deck = Deck.shuffled_deck(deck)
+            self._deck = Deck.shuffled_deck(
+                get_deck_tiles(_options.player_count, _options.use_flowers), rng
+            )
         self._discard_pool = DiscardPool()
         self._hands = [
             Hand(player_index, self._deck, self._discard_pool)
@@ -148,8 +198,21 @@ class Round:
         self._current_player = sub_round
         self._status = RoundStatus.START
         self._history: list[tuple[int, Action]] = []
+        self._undo_log: list[_UndoEntry] = []
+        self._redo_actions: list[tuple[int, Action]] = []
         self._win: Win | None = None
 
+        self._allowed_actions: tuple[ActionList, ...] = tuple(
+            ActionList() for _ in range(self._player_count)
+        )
+        self._allowed_actions_keys: list[tuple[int, ...] | None] = [
+            None
+        ] * self._player_count
+        self._sorted_player_actions: list[list[tuple[int, Action]]] = [
+            [] for _ in range(self._player_count)
+        ]
+        self._priority_current_player: int | None = None
+        self._all_allowed_actions: list[tuple[int, Action]] = []
         self._calculate_allowed_actions()
 
         self._flower_pass_count = 0
@@ -161,6 +224,81 @@ class Round:
                     self.do_action(player, flower_action)
                 self.do_action(player, SimpleAction(action_type=ActionType.CONTINUE))
 
+    def snapshot(self) -> RoundSnapshot:
+        """
+        Return the current state of the round, which can be passed to
+        :py:meth:`restore` to return the round to this state.
+
+        Only the parts of the state that change during the round are stored,
+        and immutable objects (such as calls and actions) are shared with the
+        round, so this is much cheaper than copying the round.
+        """
+        return RoundSnapshot(
+            deck=self._deck.tiles,
+            discard_pool=self._discard_pool.snapshot(),
+            hands=tuple(hand.snapshot() for hand in self._hands),
+            current_player=self._current_player,
+            status=self._status,
+            flower_pass_count=self._flower_pass_count,
+            history=tuple(self._history),
+            win=self._win,
+            allowed_actions=self._allowed_actions,
+            allowed_actions_keys=tuple(self._allowed_actions_keys),
+            sorted_player_actions=tuple(self._sorted_player_actions),
+            all_allowed_actions=self._all_allowed_actions,
+        )
+
+    def restore(self, snapshot: RoundSnapshot) -> None:
+        """
+        Return the round to an earlier state.
+
+        The round end callback is not called, even if the restored round
+        has ended. Actions performed before the round was restored
+        cannot be undone.
+
+        :param snapshot: A :py:class:`RoundSnapshot` returned by
+                         :py:meth:`snapshot` on this round or a clone of it.
+        """
+        self._deck.restore(snapshot.deck)
+        self._discard_pool.restore(snapshot.discard_pool)
+        for hand, hand_snapshot in zip(self._hands, snapshot.hands):
+            hand.restore(hand_snapshot)
+        self._current_player = snapshot.current_player
+        self._status = snapshot.status
+        self._flower_pass_count = snapshot.flower_pass_count
+        self._history = list(snapshot.history)
+        self._win = snapshot.win
+        self._allowed_actions = snapshot.allowed_actions
+        self._allowed_actions_keys = list(snapshot.allowed_actions_keys)
+        self._sorted_player_actions = list(snapshot.sorted_player_actions)
+        self._priority_current_player = snapshot.current_player
+        self._all_allowed_actions = snapshot.all_allowed_actions
+        self._undo_log = []
+        self._redo_actions = []
+
+    def clone(self) -> Round:
+        """
+        Return a copy of the round, which can be played independently
+        of this round (e.g. to explore hypothetical continuations).
+
+        The copy has no round end callback.
+        """
+        round = Round.__new__(Round)
+        round._wind_round = self._wind_round
+        round._sub_round = self._sub_round
+        round._draw_count = self._draw_count
+        round._player_count = self._player_count
+        round._options = self._options
+        round._end_callback = lambda: None
+        round._deck = Deck(())
+        round._discard_pool = DiscardPool()
+        round._hands = [
+            Hand(player_index, round._deck, round._discard_pool)
+            for player_index in range(self._player_count)
+        ]
+        round.restore(self.snapshot())
+        return round
+
     def get_hand(self, player: int) -> Sequence[TileId]:
         """
         Get a given player's hand's tiles.
@@ -170,6 +308,39 @@ class Round:
         """
         return self._hands[player].tiles
 
+    def get_discard_waits(self, player: int) -> dict[TileValue, frozenset[TileValue]]:
+        """
+        Get the waits a given player's hand would have after discarding
+        each of its tiles, indexed by the :py:class:`TileValue` of the discard.
+
+        :param player: The index of the player to check.
+        """
+        return self._hands[player].discard_waits
+
+    def get_shanten_info(self, player: int) -> ShantenInfo:
+        """
+        Get the shanten, useful tiles and ukeire of a given player's hand.
+        The ukeire does not count tiles the player can see in the discard
+        pool, in calls or in their own hand. Flowers that have not been
+        replaced yet are left out of the hand.
+
+        :param player: The index of the player to check.
+        """
+        visible_tiles = [
+            discard.tile
+            for discard in self._discard_pool.discards
+            if not (discard.is_called or discard.is_added_kan or discard.is_closed_kan)
+        ]
+        for hand in self._hands:
+            visible_tiles.extend(hand.call_tiles)
+        deck = three_player_deck if self._player_count == 3 else four_player_deck
+        hand_tiles = [
+            tile for tile in self._hands[player].tiles if not tile_id_is_flower(tile)
+        ]
+        return get_shanten_info(
+            hand_tiles, visible_tiles, frozenset(get_tile_values(deck))
+        )
+
     def get_riichi_discard_index(self, player: int) -> int | None:
         """
         Get the number of discards made before a player's riichi,
@@ -267,12 +438,12 @@ class Round:
     @property
     def wall_count(self) -> int:
         "The number of tiles currently left in the deck."
-        return len(self._deck.tiles)
+        return len(self._deck)
 
     @property
     def tiles_left(self) -> int:
         "The number of tile draws currently left in the round."
-        return len(self._deck.tiles) - self._options.end_wall_count
+        return len(self._deck) - self._options.end_wall_count
 
     @property
     def history(self) -> list[tuple[int, Action]]:
@@ -302,23 +473,76 @@ class Round:
             )
         print("Discards:", self.discard_tiles)
 
-    def _calculate_allowed_actions(self) -> None:
-        self._allowed_actions = tuple(
-            _allowed_actions_funcs[self._status](self, player, self._hands[player])
-            for player in range(self._player_count)
-        )
-        self._all_allowed_actions = sorted(
-            (
-                (player, action)
-                for player, action_list in enumerate(self._allowed_actions)
-                for action in action_list.actions
-            ),
-            key=lambda playeraction: (
-                -playeraction[1].action_type,
-                (playeraction[0] - self._current_player) % self._player_count,
-            ),
+    def _get_allowed_actions_key(self, player: int) -> tuple[int, ...]:
+        """
+        Return a key that changes whenever the allowed actions of a player
+        may have changed.
+
+        Players who can only continue or pass get a key that depends only on
+        the round status. Every other player's allowed actions depend on their
+        hand, the discard pool and the turn, so their key includes all of those.
+        """
+        status = self._status
+        is_current = player == self._current_player
+        if (
+            status == RoundStatus.END
+            or (
+                status in (RoundStatus.START, RoundStatus.PLAY, RoundStatus.CALLED_PLAY)
+                and not is_current
+            )
+            or (
+                status
+                in (
+                    RoundStatus.ADD_KAN_AFTER,
+                    RoundStatus.CLOSED_KAN_AFTER,
+                    RoundStatus.DISCARDED,
+                    RoundStatus.LAST_DISCARDED,
+                )
+                and is_current
+            )
+        ):
+            return (status, is_current)
+        return (
+            status,
+            self._current_player,
+            self._hands[player].version,
+            self._discard_pool.version,
         )
 
+    def _calculate_allowed_actions(self) -> None:
+        allowed_actions = list(self._allowed_actions)
+        changed = False
+        for player in range(self._player_count):
+            key = self._get_allowed_actions_key(player)
+            if key == self._allowed_actions_keys[player]:
+                continue
+            self._allowed_actions_keys[player] = key
+            action_list = _allowed_actions_funcs[self._status](
+                self, player, self._hands[player]
+            )
+            allowed_actions[player] = action_list
+            self._sorted_player_actions[player] = sorted(
+                ((player, action) for action in action_list.actions),
+                key=lambda playeraction: -playeraction[1].action_type,
+            )
+            changed = True
+        if changed:
+            self._allowed_actions = tuple(allowed_actions)
+        if changed or self._current_player != self._priority_current_player:
+            self._priority_current_player = self._current_player
+            # Each player's actions are already sorted by priority, and no two
+            # players are the same distance from the current player, so the
+            # lists only need to be merged.
+            self._all_allowed_actions = list(
+                merge(
+                    *self._sorted_player_actions,
+                    key=lambda playeraction: (
+                        -playeraction[1].action_type,
+                        (playeraction[0] - self._current_player) % self._player_count,
+                    ),
+                )
+            )
+
     def do_action(self, player: int, action: Action) -> None:
         """
         Have a player perform an action in the round of mahjong.
@@ -328,12 +552,114 @@ class Round:
         """
         if action not in self.allowed_actions[player].actions:
             raise InvalidMoveException(action, self.allowed_actions[player].actions)
+        self._undo_log.append(
+            _UndoEntry(
+                deck_position=self._deck.position,
+                discard_pool_change_count=self._discard_pool.change_count,
+                hand=self._hands[player].snapshot(),
+                current_player=self._current_player,
+                status=self._status,
+                flower_pass_count=self._flower_pass_count,
+                win=self._win,
+                allowed_actions=self._allowed_actions,
+                allowed_actions_keys=tuple(self._allowed_actions_keys),
+                sorted_player_actions=tuple(self._sorted_player_actions),
+                all_allowed_actions=self._all_allowed_actions,
+            )
+        )
+        if self._redo_actions and self._redo_actions[-1] == (player, action):
+            self._redo_actions.pop()
+        else:
+            self._redo_actions.clear()
         _do_action_funcs[action.action_type](self, player, action)
         self._history.append((player, action))
         self._calculate_allowed_actions()
         if self._status == RoundStatus.END:
             self._end_callback()
 
+    @property
+    def can_undo(self) -> bool:
+        "Whether there is an action that :py:meth:`undo` can undo."
+        return len(self._undo_log) > 0
+
+    @property
+    def can_redo(self) -> bool:
+        "Whether there is an undone action that :py:meth:`redo` can redo."
+        return len(self._redo_actions) > 0
+
+    def undo(self) -> tuple[int, Action]:
+        """
+        Undo the last action performed in the round.
+
+        Every action records the changes needed to reverse it, so undoing
+        does not replay the round or recalculate the allowed actions.
+        The round end callback is not reversed if the undone action ended
+        the round.
+
+        This will throw an :py:class:`InvalidOperationException` if there
+        is no action to undo.
+
+        :return: The index of the player who performed the undone action,
+                 and the action.
+        """
+        if not self._undo_log:
+            raise InvalidOperationException()
+        entry = self._undo_log.pop()
+        player, action = self._history.pop()
+        self._deck.seek(entry.deck_position)
+        self._discard_pool.undo_changes(entry.discard_pool_change_count)
+        self._hands[player].restore(entry.hand)
+        self._current_player = entry.current_player
+        self._status = entry.status
+        self._flower_pass_count = entry.flower_pass_count
+        self._win = entry.win
+        self._allowed_actions = entry.allowed_actions
+        self._allowed_actions_keys = list(entry.allowed_actions_keys)
+        self._sorted_player_actions = list(entry.sorted_player_actions)
+        self._priority_current_player = entry.current_player
+        self._all_allowed_actions = entry.all_allowed_actions
+        self._redo_actions.append((player, action))
+        return player, action
+
+    def redo(self) -> tuple[int, Action]:
+        """
+        Perform the last undone action again.
+
+        Undone actions can be redone until a different action is performed.
+
+        This will throw an :py:class:`InvalidOperationException` if there
+        is no action to redo.
+
+        :return: The index of the player who performed the redone action,
+                 and the action.
+        """
+        if not self._redo_actions:
+            raise InvalidOperationException()
+        player, action = self._redo_actions[-1]
+        self.do_action(player, action)
+        return player, action
+
+    def seek(self, history_index: int) -> None:
+        """
+        Undo or redo actions until the given number of actions have been
+        performed in the round.
+
+        This will throw an :py:class:`InvalidOperationException` if there
+        are not enough actions to undo or redo.
+
+        :param history_index: The number of actions to leave performed.
+        """
+        if not (
+            len(self._history) - len(self._undo_log)
+            <= history_index
+            <= len(self._history) + len(self._redo_actions)
+        ):
+            raise InvalidOperationException()
+        while len(self._history) > history_index:
+            self.undo()
+        while len(self._history) < history_index:
+            self.redo()
+
     def get_priority_action(
         self, actions: Sequence[Action | None]
     ) -> tuple[int, Action] | None:
@@ -706,15 +1032,13 @@ class Round:
     def _is_valid_win(self, win: Win | None) -> bool:
         if win is None:
             return False
-        scoring = Scorer.score(win, self._options)
-        return scoring.han >= self._options.min_han
+        return Scorer.reaches_han(win, self._options, self._options.min_han)
 
     def _is_thirteen_orphans_win(self, win: Win | None) -> bool:
         # only checks if it's a thirteen orphans with a one-sided wait
         if win is None:
             return False
-        scoring = Scorer.score(win, self._options)
-        return "THIRTEEN_ORPHANS" in scoring.patterns
+        return Scorer.has_pattern(win, self._options, "THIRTEEN_ORPHANS")
 
     def _can_ron(self, player: int) -> bool:
         if self.is_furiten(player):
@@ -1,14 +1,22 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from itertools import islice, pairwise
 from math import ceil
-from typing import final
+from threading import Lock
+from typing import TypeVar, cast, final
 
 from pydantic import BaseModel
 
-from .form_hand import formed_hand_possibilities
+from .call import get_call_tiles
+from .form_hand import iter_formed_hands
 from .game_options import GameOptions
-from .meld import Meld
-from .pattern import PatternData, default_pattern_data, get_pattern_mults
+from .pattern import PatternData, iter_pattern_mults
+from .payment import get_payment_table
+from .tile import get_tile_value, get_tile_values
 from .win import Win
 
+_T = TypeVar("_T")
+
 
 class Scoring(BaseModel):
     """
@@ -35,11 +43,147 @@ class Scoring(BaseModel):
     "The amount of points each player wins or loses from this hand."
 
 
-def _round_up_int(value: int, step: int) -> int:
-    return step * ceil(value / step)
+_win_field_names = tuple(
+    name for name in Win.model_fields if name not in ("hand", "calls", "flowers")
+)
+
+
+def _get_win_key(win: Win) -> Hashable:
+    """
+    Return a hashable key for a win, which is the same for two wins
+    that score the same way.
+
+    Tile ids are replaced by tile values, and the order of the tiles in the
+    hand (apart from the winning tile, which is last), the calls and the
+    flowers is ignored.
+    """
+    hand_values = get_tile_values(win.hand)
+    return (
+        tuple(sorted(hand_values[:-1])),
+        hand_values[-1],
+        tuple(
+            sorted(
+                (call.call_type, tuple(get_tile_values(get_call_tiles(call))))
+                for call in win.calls
+            )
+        ),
+        tuple(sorted(get_tile_value(flower) for flower in win.flowers)),
+        tuple(getattr(win, name) for name in _win_field_names),
+    )
+
+
+def _points_increase_with_han(options: GameOptions) -> bool:
+    """
+    Return whether the points for a win never decrease as its han goes up
+    while its fu stays the same.
+
+    This holds unless a score limit pays less than a limit with lower han,
+    or a negative fu or multiplier turns the payments around.
+    """
+    if options.base_fu < 0 or any(
+        multiplier < 0
+        for multiplier in (
+            options.score_dealer_ron_multiplier,
+            options.score_dealer_tsumo_multiplier,
+            options.score_nondealer_ron_multiplier,
+            options.score_nondealer_tsumo_nondealer_multiplier,
+            options.score_nondealer_tsumo_dealer_multiplier,
+        )
+    ):
+        return False
+    limit_scores = [
+        score_limit.score
+        for score_limit in sorted(
+            options.base_score_limits,
+            key=lambda score_limit: (score_limit.han, score_limit.score),
+        )
+    ]
+    return all(score <= next_score for score, next_score in pairwise(limit_scores))
+
+
+@final
+class ScoringCache:
+    """
+    A least-recently-used cache of the results of :py:class:`Scorer` methods.
+
+    Results are keyed by the win (using tile values rather than tile ids),
+    the options that affect scoring, and the query that was made.
+
+    :param maxsize: The largest number of results to keep.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._maxsize = maxsize
+        self._results: OrderedDict[Hashable, object] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
 
+    @property
+    def maxsize(self) -> int:
+        "The largest number of results the cache keeps."
+        return self._maxsize
 
-def _round_up_float(value: float, step: float) -> float:
+    @property
+    def hits(self) -> int:
+        "The number of lookups that found a cached result."
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        "The number of lookups that had to calculate the result."
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def clear(self) -> None:
+        "Remove every cached result and reset the hit and miss counters."
+        with self._lock:
+            self._results.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def get(
+        self,
+        win: Win,
+        options: GameOptions,
+        query: Hashable,
+        calculate: Callable[[], _T],
+    ) -> _T:
+        """
+        Return the cached result of a query about a win,
+        calculating and caching it if it is not cached.
+
+        :param win: The :py:class:`Win` object the query is about.
+        :param options: The :py:class:`GameOptions` object used when scoring.
+        :param query: A hashable description of the query.
+        :param calculate: A function that calculates the result.
+        """
+        key = (query, _get_win_key(win), options.get_scoring_key())
+        with self._lock:
+            if key in self._results:
+                self._hits += 1
+                self._results.move_to_end(key)
+                return cast(_T, self._results[key])
+            self._misses += 1
+        # The result is calculated outside the lock, so two threads may both
+        # calculate a result that was missing, but they store the same value.
+        result = calculate()
+        if self._maxsize > 0:
+            with self._lock:
+                self._results[key] = result
+                self._results.move_to_end(key)
+                if len(self._results) > self._maxsize:
+                    self._results.popitem(last=False)
+        return result
+
+
+scoring_cache = ScoringCache()
+"The :py:class:`ScoringCache` used by the :py:class:`Scorer` class methods."
+
+
+def _round_up_int(value: int, step: int) -> int:
     return step * ceil(value / step)
 
 
@@ -55,56 +199,22 @@ class Scorer:
     def __init__(self, win: Win, options: GameOptions) -> None:
         self._win = win
         self._options = options
-        self._low_han_max_score = min(
-            (score_limit.score for score_limit in self._options.base_score_limits),
-            default=None,
-        )
-        self._pattern_data = default_pattern_data | options.pattern_data
-
-    def _get_limit_base_score(self, han: int) -> float | None:
-        best_score_limit = max(
-            (
-                (score_limit.han, score_limit.score)
-                for score_limit in self._options.base_score_limits
-                if score_limit.han <= han
-            ),
-            default=None,
-        )
-        return best_score_limit[1] if best_score_limit is not None else None
+        self._payment_table = get_payment_table(options)
+        self._pattern_data = options.get_scored_patterns()
 
     def _get_player_scores(self, han: int, fu: int) -> list[float]:
         player_count = self._options.player_count
         win_player = self._win.win_player
         lose_player = self._win.lose_player
-        limit_base_score = self._get_limit_base_score(han)
-        if limit_base_score is None:
-            han_multiplier = 1 << han
-            base_score: float = fu * 4 * han_multiplier
-            if self._low_han_max_score is not None:
-                base_score = min(base_score, self._low_han_max_score)
-        else:
-            base_score = limit_base_score
+        payment = self._payment_table.get_payment(han, fu)
         if lose_player is None:
             if win_player == self._win.sub_round:
-                player_pay_in_amount = (
-                    self._options.score_dealer_tsumo_multiplier * base_score
-                )
-                if self._options.round_up_points:
-                    player_pay_in_amount = _round_up_float(player_pay_in_amount, 100)
+                player_pay_in_amount = payment.dealer_tsumo
                 player_scores = [-player_pay_in_amount] * player_count
                 player_scores[win_player] = player_pay_in_amount * (player_count - 1)
             else:
-                player_pay_in_amount = (
-                    self._options.score_nondealer_tsumo_nondealer_multiplier
-                    * base_score
-                )
-                if self._options.round_up_points:
-                    player_pay_in_amount = _round_up_float(player_pay_in_amount, 100)
-                dealer_pay_in_amount = (
-                    self._options.score_nondealer_tsumo_dealer_multiplier * base_score
-                )
-                if self._options.round_up_points:
-                    dealer_pay_in_amount = _round_up_float(dealer_pay_in_amount, 100)
+                player_pay_in_amount = payment.nondealer_tsumo_nondealer
+                dealer_pay_in_amount = payment.nondealer_tsumo_dealer
                 player_scores = [-player_pay_in_amount] * player_count
                 player_scores[self._win.sub_round] = -dealer_pay_in_amount
                 player_scores[win_player] = (
@@ -112,38 +222,23 @@ class Scorer:
                 ) * player_pay_in_amount + dealer_pay_in_amount
         else:
             if win_player == self._win.sub_round:
-                player_pay_in_amount = (
-                    self._options.score_dealer_ron_multiplier * base_score
-                )
+                player_pay_in_amount = payment.dealer_ron
             else:
-                player_pay_in_amount = (
-                    self._options.score_nondealer_ron_multiplier * base_score
-                )
-            if self._options.round_up_points:
-                player_pay_in_amount = _round_up_float(player_pay_in_amount, 100)
+                player_pay_in_amount = payment.nondealer_ron
             player_scores = [0.0] * player_count
             player_scores[win_player] = player_pay_in_amount
             player_scores[lose_player] = -player_pay_in_amount
         return player_scores
 
-    def _get_formed_hand_scoring(self, formed_hand: list[Meld]) -> Scoring:
-        pattern_mults = get_pattern_mults(self._win, formed_hand)
-        patterns = [
-            (
-                pattern,
-                PatternData(
-                    display_name=pattern_data.display_name,
-                    han=pattern_data.han * pattern_mults[pattern],
-                    fu=pattern_data.fu * pattern_mults[pattern],
-                ),
-            )
-            for pattern, pattern_data in self._pattern_data.items()
-            if pattern in pattern_mults
-        ]
-        han = sum(pattern_data.han for (_, pattern_data) in patterns)
+    def _get_han_fu(self, pattern_mults: dict[str, int]) -> tuple[int, int]:
+        han = sum(
+            self._pattern_data[pattern].han * pattern_mult
+            for pattern, pattern_mult in pattern_mults.items()
+        )
         if self._options.calculate_fu:
             fu = self._options.base_fu + sum(
-                pattern_data.fu for (_, pattern_data) in patterns
+                self._pattern_data[pattern].fu * pattern_mult
+                for pattern, pattern_mult in pattern_mults.items()
             )
             if self._options.round_up_fu:
                 fu = _round_up_int(fu, 10)
@@ -154,7 +249,23 @@ class Scorer:
                 fu = self._options.seven_pairs_fixed_fu
         else:
             fu = self._options.base_fu
-        player_scores = self._get_player_scores(han, fu)
+        return han, fu
+
+    def _get_formed_hand_scoring(
+        self, pattern_mults: dict[str, int], han: int, fu: int
+    ) -> Scoring:
+        patterns = [
+            (
+                pattern,
+                PatternData(
+                    display_name=pattern_data.display_name,
+                    han=pattern_data.han * pattern_mults[pattern],
+                    fu=pattern_data.fu * pattern_mults[pattern],
+                ),
+            )
+            for pattern, pattern_data in self._pattern_data.items()
+            if pattern in pattern_mults
+        ]
         if self._options.calculate_fu:
             patterns_dict = dict(
                 (pattern, pattern_data)
@@ -173,23 +284,137 @@ class Scorer:
             patterns=patterns_dict,
             han=han,
             fu=fu,
-            player_scores=player_scores,
+            player_scores=self._get_player_scores(han, fu),
         )
 
     def _get_scoring(self) -> Scoring:
-        scorings = [
-            self._get_formed_hand_scoring(formed_hand)
-            for formed_hand in formed_hand_possibilities(self._win.hand)
-        ]
-
-        def key(scoring: Scoring) -> tuple[float, int, int]:
-            return (
-                scoring.player_scores[self._win.win_player],
-                scoring.han,
-                scoring.fu,
+        # Only the (points, han, fu) of each formed hand are needed to pick
+        # the best one, so the full Scoring is only built for the best hand.
+        # Formed hands that differ only in the tile ids (e.g. the winning
+        # tile placed in either of two identical sequences) score the same,
+        # so only the first of them is scored.
+        best: tuple[tuple[float, int, int], dict[str, int]] | None = None
+        seen_shapes: set[Hashable] = set()
+        win_scores: dict[tuple[int, int], float] = {}
+        for formed_hand in iter_formed_hands(self._win.hand):
+            shape = tuple(
+                sorted(
+                    (
+                        meld.meld_type,
+                        tuple(get_tile_values(meld.tiles)),
+                        -1
+                        if meld.winning_tile_index is None
+                        else meld.winning_tile_index,
+                    )
+                    for meld in formed_hand
+                )
             )
+            if shape in seen_shapes:
+                continue
+            seen_shapes.add(shape)
+            pattern_mults = dict(
+                iter_pattern_mults(self._win, formed_hand, self._pattern_data)
+            )
+            han, fu = self._get_han_fu(pattern_mults)
+            win_score = win_scores.get((han, fu))
+            if win_score is None:
+                win_score = self._get_player_scores(han, fu)[self._win.win_player]
+                win_scores[han, fu] = win_score
+            key = (win_score, han, fu)
+            if best is None or key > best[0]:
+                best = (key, pattern_mults)
+        if best is None:
+            raise ValueError("The hand does not form a winning hand")
+        (_, han, fu), pattern_mults = best
+        return self._get_formed_hand_scoring(pattern_mults, han, fu)
+
+    def _reaches_han(self, han: int) -> bool:
+        if self._options.calculate_fu or not _points_increase_with_han(self._options):
+            # The highest scoring formed hand may not have the most han
+            # when fu is counted, or when a higher limit pays less than a
+            # lower one, so the full scoring is needed.
+            return self._get_scoring().han >= han
+        han_patterns = {
+            pattern: pattern_data.han
+            for pattern, pattern_data in self._pattern_data.items()
+            if pattern_data.han != 0
+        }
+        # Without fu, and with points that never decrease as han goes up
+        # (checked above), the highest scoring formed hand is the one with
+        # the most han. If no pattern has negative han, the total only grows
+        # as patterns are added, so the check can stop early.
+        can_stop_early = all(pattern_han > 0 for pattern_han in han_patterns.values())
+        for formed_hand in iter_formed_hands(self._win.hand):
+            total_han = 0
+            for pattern, pattern_mult in iter_pattern_mults(
+                self._win, formed_hand, han_patterns
+            ):
+                total_han += han_patterns[pattern] * pattern_mult
+                if can_stop_early and total_han >= han:
+                    return True
+            if total_han >= han:
+                return True
+        return False
+
+    def _has_pattern(self, pattern: str) -> bool:
+        formed_hands = list(islice(iter_formed_hands(self._win.hand), 2))
+        if len(formed_hands) != 1:
+            return pattern in self._get_scoring().patterns
+        pattern_data = self._pattern_data.get(pattern)
+        if pattern_data is None or (
+            pattern_data.han == 0
+            and (pattern_data.fu == 0 or not self._options.calculate_fu)
+        ):
+            return False
+        return any(iter_pattern_mults(self._win, formed_hands[0], [pattern]))
+
+    @classmethod
+    def reaches_han(cls, win: Win, options: GameOptions, han: int) -> bool:
+        """
+        Determine whether a winning hand scores at least a given amount of han.
+
+        This gives the same answer as comparing the han of
+        :py:meth:`score` against ``han``, but skips the fu and payment
+        calculations, and stops evaluating patterns once the threshold
+        is reached.
 
-        return max(scorings, key=key)
+        :param win: The :py:class:`Win` object to check.
+        :param options: The :py:class:`GameOptions` object to use when scoring.
+        :param han: The amount of han the hand needs.
+        """
+        if han <= 0 and all(
+            pattern_data.han >= 0
+            for pattern_data in options.get_scored_patterns().values()
+        ):
+            # Without negative han patterns every hand scores at least 0 han,
+            # whether or not fu is counted.
+            return True
+        return scoring_cache.get(
+            win,
+            options,
+            ("reaches_han", han),
+            lambda: cls(win, options)._reaches_han(han),
+        )
+
+    @classmethod
+    def has_pattern(cls, win: Win, options: GameOptions, pattern: str) -> bool:
+        """
+        Determine whether a pattern is in the scoring of a winning hand.
+
+        This gives the same answer as checking for the pattern in the
+        :py:attr:`Scoring.patterns` of :py:meth:`score`, but only evaluates
+        that one pattern when the hand can only be formed in one way.
+
+        :param win: The :py:class:`Win` object to check.
+        :param options: The :py:class:`GameOptions` object to use when scoring.
+        :param pattern: The internal name of the pattern.
+        """
+        return scoring_cache.get(
+            win,
+            options,
+            ("has_pattern", pattern),
+            lambda: cls(win, options)._has_pattern(pattern),
+        )
 
     @classmethod
     def score(cls, win: Win, options: GameOptions) -> Scoring:
@@ -200,4 +425,7 @@ class Scorer:
         :param options: The :py:class:`GameOptions` object to use when scoring.
         :return: A :py:class:`Scoring` object containing the scoring data.
         """
-        return cls(win, options)._get_scoring()
+        scoring = scoring_cache.get(
+            win, options, ("score",), lambda: cls(win, options)._get_scoring()
+        )
+        return scoring.model_copy(deep=True)
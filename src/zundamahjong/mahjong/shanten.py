@@ -0,0 +1,302 @@
+"""
+Shanten and ukeire calculations.
+
+The shanten of a hand is the number of tiles it needs to exchange before it is
+tenpai (so a tenpai hand has shanten 0 and a complete hand has shanten -1).
+The useful tiles of a hand are the tiles that lower its shanten when drawn,
+and its ukeire is the number of copies of those tiles that can still be drawn.
+
+Like :py:mod:`.shape_table`, the hand is split into its four suits.
+For each suit shape, the number of its tiles that can be kept in some number of
+melds (and possibly a pair) is computed once and cached, so evaluating a hand
+is a handful of dictionary lookups and a small combination step.
+"""
+
+from collections import Counter
+from collections.abc import Collection, Iterable, Sequence
+from functools import cache
+from typing import final
+
+from pydantic import BaseModel
+
+from .form_hand import get_waits
+from .shape_table import (
+    KEY_BITS,
+    SuitKey,
+    get_key_count,
+    get_suit_shapes,
+    get_suit_tile_value,
+    honour_suit_size,
+    max_suit_melds,
+    number_suit_size,
+)
+from .tile import (
+    N,
+    TileId,
+    TileValue,
+    all_tiles,
+    get_tile_counts,
+    get_tile_id_counts,
+    get_tile_values,
+    orphans,
+)
+
+SuitUsage = tuple[int, ...]
+"""
+Represents how many tiles of a suit shape can be used towards a hand.
+
+The entry at index :math:`2m + p` is the largest number of the shape's tiles
+that fit into :math:`m` melds and :math:`p` pairs (:math:`p` is 0 or 1).
+"""
+
+_slot_count = 2 * (max_suit_melds + 1)
+
+
+@final
+class ShantenInfo(BaseModel, frozen=True):
+    "Represents the progress of a hand towards a winning hand."
+
+    shanten: int
+    """
+    The number of tiles the hand needs to exchange to be tenpai.
+    This is 0 for a tenpai hand and -1 for a complete hand.
+    """
+    useful_tiles: frozenset[TileValue]
+    "The :py:class:`TileValue` s of the tiles that lower the shanten when drawn."
+    ukeire: int
+    "The number of useful tiles that have not been seen yet."
+
+
+@cache
+def _get_suit_usage(key: SuitKey, allow_chii: bool) -> SuitUsage:
+    if key == 0:
+        return (0,) * _slot_count
+    index = 0
+    while get_key_count(key, index) == 0:
+        index += 1
+    one = 1 << (KEY_BITS * index)
+    count = get_key_count(key, index)
+
+    # Groups of tiles that have the tile at the index as their lowest tile,
+    # and fill a meld slot or the pair slot.
+    meld_groups = [(key - one, 1)]
+    pair_groups = [(key - one, 1)]
+    if count >= 2:
+        meld_groups.append((key - 2 * one, 2))
+        pair_groups.append((key - 2 * one, 2))
+    if count >= 3:
+        meld_groups.append((key - 3 * one, 3))
+    if allow_chii:
+        has_next = index + 1 < number_suit_size and get_key_count(key, index + 1) > 0
+        has_gap = index + 2 < number_suit_size and get_key_count(key, index + 2) > 0
+        if has_next:
+            meld_groups.append((key - one - (one << KEY_BITS), 2))
+        if has_gap:
+            meld_groups.append((key - one - (one << (2 * KEY_BITS)), 2))
+        if has_next and has_gap:
+            meld_groups.append(
+                (key - one - (one << KEY_BITS) - (one << (2 * KEY_BITS)), 3)
+            )
+
+    usage = list(_get_suit_usage(key - one, allow_chii))
+    for group_key, group_size in meld_groups:
+        group_usage = _get_suit_usage(group_key, allow_chii)
+        for slot in range(2, _slot_count):
+            usage[slot] = max(usage[slot], group_usage[slot - 2] + group_size)
+    for group_key, group_size in pair_groups:
+        group_usage = _get_suit_usage(group_key, allow_chii)
+        for slot in range(1, _slot_count, 2):
+            usage[slot] = max(usage[slot], group_usage[slot - 1] + group_size)
+    return tuple(usage)
+
+
+@cache
+def _get_suit_useful_masks(key: SuitKey, suit_index: int) -> tuple[int, ...]:
+    """
+    Return, for each slot of the :py:data:`SuitUsage` of a suit shape,
+    a bitmask of the tile indices that increase that entry when added.
+    """
+    allow_chii = suit_index < 3
+    suit_size = number_suit_size if allow_chii else honour_suit_size
+    usage = _get_suit_usage(key, allow_chii)
+    masks = [0] * _slot_count
+    for index in range(suit_size):
+        if get_key_count(key, index) >= 4:
+            continue
+        new_usage = _get_suit_usage(key + (1 << (KEY_BITS * index)), allow_chii)
+        for slot in range(_slot_count):
+            if new_usage[slot] > usage[slot]:
+                masks[slot] |= 1 << index
+    return tuple(masks)
+
+
+_combine_slots = tuple(
+    tuple(
+        (slot1, slot - slot1)
+        for slot1 in range(slot + 1)
+        if slot1 % 2 == 0 or (slot - slot1) % 2 == 0
+    )
+    for slot in range(_slot_count)
+)
+
+
+@cache
+def _combine_usages(usage1: SuitUsage, usage2: SuitUsage) -> SuitUsage:
+    "Return the :py:data:`SuitUsage` of two suits taken together."
+    return tuple(
+        max([usage1[slot1] + usage2[slot2] for slot1, slot2 in slots])
+        for slots in _combine_slots
+    )
+
+
+def _get_standard_progress(
+    suit_keys: list[SuitKey], meld_count: int
+) -> tuple[int, set[TileValue]]:
+    target_slot = 2 * meld_count + 1
+    usages = [
+        _get_suit_usage(key, suit_index < 3) for suit_index, key in enumerate(suit_keys)
+    ]
+    usage01 = _combine_usages(usages[0], usages[1])
+    usage23 = _combine_usages(usages[2], usages[3])
+    used_count = _combine_usages(usage01, usage23)[target_slot]
+    # The usage of every suit but one, for each suit.
+    others_usages = (
+        _combine_usages(usages[1], usage23),
+        _combine_usages(usages[0], usage23),
+        _combine_usages(usage01, usages[3]),
+        _combine_usages(usage01, usages[2]),
+    )
+    useful_tiles: set[TileValue] = set()
+    for suit_index, key in enumerate(suit_keys):
+        usage = usages[suit_index]
+        others_usage = others_usages[suit_index]
+        masks = _get_suit_useful_masks(key, suit_index)
+        useful_mask = 0
+        for slot in range(target_slot + 1):
+            if usage[slot] + others_usage[target_slot - slot] == used_count:
+                useful_mask |= masks[slot]
+        index = 0
+        while useful_mask:
+            if useful_mask & 1:
+                useful_tiles.add(get_suit_tile_value(suit_index, index))
+            useful_mask >>= 1
+            index += 1
+    return used_count, useful_tiles
+
+
+def _get_seven_pairs_progress(
+    tile_counts: Counter[TileValue],
+) -> tuple[int, set[TileValue]]:
+    pairs = [tile for tile, count in tile_counts.items() if count >= 2]
+    singles = [tile for tile, count in tile_counts.items() if count == 1]
+    pair_count = min(len(pairs), 7)
+    used_count = 2 * pair_count + min(len(singles), 7 - pair_count)
+    if pair_count == 7:
+        return used_count, set()
+    if len(pairs) + len(singles) >= 7:
+        return used_count, set(singles)
+    return used_count, set(all_tiles.difference(pairs))
+
+
+def _get_thirteen_orphans_progress(
+    tile_counts: Counter[TileValue],
+) -> tuple[int, set[TileValue]]:
+    held_orphans = orphans.intersection(tile_counts)
+    if any(tile_counts[tile] >= 2 for tile in held_orphans):
+        return len(held_orphans) + 1, set(orphans - held_orphans)
+    return len(held_orphans), set(orphans)
+
+
+def _get_progress(hand_values: list[TileValue]) -> tuple[int, set[TileValue]]:
+    meld_count = max(len(hand_values) - 1, 0) // 3
+    suit_shapes = get_suit_shapes(hand_values)
+    if suit_shapes is None:
+        raise ValueError("Cannot calculate the shanten of a hand with flowers")
+    used_count, useful_tiles = _get_standard_progress(suit_shapes[0], meld_count)
+    if len(hand_values) >= 13:
+        tile_counts = Counter(hand_values)
+        for special_used_count, special_useful_tiles in (
+            _get_seven_pairs_progress(tile_counts),
+            _get_thirteen_orphans_progress(tile_counts),
+        ):
+            if special_used_count > used_count:
+                used_count, useful_tiles = special_used_count, special_useful_tiles
+            elif special_used_count == used_count:
+                useful_tiles |= special_useful_tiles
+    shanten = 3 * meld_count + 1 - used_count
+    if shanten == 0 and not _can_be_tenpai(hand_values):
+        # The hand only looks tenpai because it waits on tiles it already
+        # holds all four copies of.
+        if len(hand_values) % 3 == 2:
+            return 1, useful_tiles
+        tile_counts = Counter(hand_values)
+        return 1, {
+            tile
+            for tile in all_tiles
+            if tile_counts[tile] < 4 and _can_be_tenpai(hand_values + [tile])
+        }
+    return shanten, useful_tiles
+
+
+def _get_live_waits(hand_values: list[TileValue]) -> frozenset[TileValue]:
+    tile_counts = Counter(hand_values)
+    return get_waits([tile * N for tile in hand_values]) - {
+        tile for tile, count in tile_counts.items() if count >= 4
+    }
+
+
+def _can_be_tenpai(hand_values: list[TileValue]) -> bool:
+    "Return whether a hand is tenpai, or can discard a tile to become tenpai."
+    if len(hand_values) % 3 == 1:
+        return len(_get_live_waits(hand_values)) > 0
+    for tile in set(hand_values):
+        remaining_values = hand_values.copy()
+        remaining_values.remove(tile)
+        if len(_get_live_waits(remaining_values)) > 0:
+            return True
+    return False
+
+
+def get_shanten(tile_values: Sequence[TileValue]) -> int:
+    """
+    Calculate the shanten of a hand.
+
+    :param tile_values: A list of the :py:class:`TileValue` s of the tiles
+                        in the hand, not including flowers or tiles in calls.
+    """
+    return _get_progress(list(tile_values))[0]
+
+
+def get_shanten_info(
+    tiles: Sequence[TileId],
+    visible_tiles: Iterable[TileId] = (),
+    tile_values: Collection[TileValue] = all_tiles,
+) -> ShantenInfo:
+    """
+    Calculate the shanten, useful tiles and ukeire of a hand.
+
+    Calls are accounted for by the number of tiles in the hand: a hand with
+    :math:`3n + 1` or :math:`3n + 2` tiles needs :math:`n` more melds and a pair.
+    Seven pairs and thirteen orphans are only considered for hands without calls.
+
+    :param tiles: A list of the :py:class:`TileId` s of the tiles in the hand,
+                  not including flowers or tiles in calls.
+    :param visible_tiles: The :py:class:`TileId` s of the other tiles the
+                          player can see (discards, calls and flowers).
+                          Copies of useful tiles in this list are not counted
+                          towards the ukeire.
+    :param tile_values: The :py:class:`TileValue` s of the tiles in the deck.
+                        Defaults to all non-flower tile values.
+    """
+    hand_values = get_tile_values(list(tiles))
+    shanten, useful_tiles = _get_progress(hand_values)
+    hand_counts = get_tile_counts(hand_values)
+    visible_counts = get_tile_id_counts(visible_tiles)
+    live_useful_tiles = frozenset(
+        tile for tile in useful_tiles if tile in tile_values and hand_counts[tile] < 4
+    )
+    ukeire = sum(
+        max(4 - hand_counts[tile] - visible_counts[tile], 0)
+        for tile in live_useful_tiles
+    )
+    return ShantenInfo(shanten=shanten, useful_tiles=live_useful_tiles, ukeire=ukeire)
@@ -0,0 +1,610 @@
+"""
+Precomputed decompositions of single-suit tile shapes.
+
+A hand is split into its four suits (characters, dots, bamboos and honours),
+and each suit is summarised by its *shape*: the number of copies of each tile
+value in that suit. Whether a hand is winning, and how it can be split into
+melds, only depends on the shapes of its suits, so the decompositions of every
+complete shape are computed once.
+
+The tables can be written to a compact binary file with
+:py:func:`write_shape_table_file` (this is done when the package is built, or
+with the ``zundamahjong build-shape-table`` command). When this module is
+imported, the file shipped with the package is loaded with :py:mod:`mmap`,
+so that several processes share the same copy of the tables; if the file is
+missing or out of date, the tables are computed instead.
+"""
+
+import mmap
+import struct
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import Generic, TypeVar, final, overload
+
+from .meld import MeldType
+from .tile import (
+    TileValue,
+    honour_flag,
+    number_flag,
+    tile_value_flags,
+    tile_value_ranks,
+    tile_value_suits,
+    tile_value_top,
+)
+
+SuitKey = int
+"""
+Represents the shape of a single suit of tiles.
+
+The number of copies of the tile with index :math:`i` in the suit
+(where :math:`i = 0` for the tile 1 or East) is stored in bits
+:math:`3i` to :math:`3i + 2`.
+"""
+
+ShapeMeld = tuple[MeldType, int]
+"""
+Represents a meld inside a suit shape, as its :py:class:`MeldType` and the
+index of its first tile within the suit.
+"""
+
+ShapeDecomposition = tuple[ShapeMeld, ...]
+"Represents a way of splitting a suit shape into melds (and possibly a pair)."
+
+KEY_BITS = 3
+"The number of bits used to store the count of each tile in a :py:data:`SuitKey`."
+
+KEY_MASK = (1 << KEY_BITS) - 1
+"Mask used to extract the count of one tile from a :py:data:`SuitKey`."
+
+number_suit_size = 9
+"The number of different tile values in a number suit."
+
+honour_suit_size = 7
+"The number of different tile values in the honour suit."
+
+max_suit_melds = 4
+"The largest number of melds (not counting the pair) a suit shape can contain."
+
+
+def get_suit_tile_value(suit_index: int, index: int) -> TileValue:
+    "Return the tile value of the tile at an index within a suit."
+    return 10 * suit_index + index + 1
+
+
+def get_suit_shapes(
+    tile_values: Iterable[TileValue],
+) -> tuple[list[SuitKey], list[int]] | None:
+    """
+    Return the :py:data:`SuitKey` s of the four suits of a list of tile values,
+    along with the number of tiles in each suit.
+
+    Returns ``None`` if any of the tile values is not a valid non-flower value.
+    """
+    suit_keys = [0, 0, 0, 0]
+    suit_sizes = [0, 0, 0, 0]
+    for tile_value in tile_values:
+        if tile_value >= tile_value_top or not tile_value_flags[tile_value] & (
+            number_flag | honour_flag
+        ):
+            return None
+        suit_index = tile_value_suits[tile_value]
+        suit_keys[suit_index] += 1 << (KEY_BITS * (tile_value_ranks[tile_value] - 1))
+        suit_sizes[suit_index] += 1
+    return suit_keys, suit_sizes
+
+
+def get_count_suit_shapes(
+    tile_counts: Sequence[int],
+) -> tuple[list[SuitKey], list[int]]:
+    """
+    Return the :py:data:`SuitKey` s of the four suits of a hand, along with
+    the number of tiles in each suit, given the number of copies of each
+    non-flower tile value in the hand.
+
+    :param tile_counts: The number of copies of each tile value in the hand,
+                        indexed by :py:class:`TileValue` .
+    """
+    suit_keys = [0, 0, 0, 0]
+    suit_sizes = [0, 0, 0, 0]
+    for suit_index in range(4):
+        suit_start = 10 * suit_index + 1
+        key = 0
+        for index, count in enumerate(tile_counts[suit_start : suit_start + 9]):
+            key += count << (KEY_BITS * index)
+            suit_sizes[suit_index] += count
+        suit_keys[suit_index] = key
+    return suit_keys, suit_sizes
+
+
+def get_key_count(key: SuitKey, index: int) -> int:
+    "Return the number of copies of the tile at an index in a suit shape."
+    return (key >> (KEY_BITS * index)) & KEY_MASK
+
+
+def _meld_key(meld: ShapeMeld) -> SuitKey:
+    meld_type, index = meld
+    one = 1 << (KEY_BITS * index)
+    if meld_type == MeldType.CHI:
+        return one + (one << KEY_BITS) + (one << (2 * KEY_BITS))
+    elif meld_type == MeldType.PON:
+        return 3 * one
+    else:
+        return 2 * one
+
+
+_high_bits = sum(4 << (KEY_BITS * index) for index in range(number_suit_size))
+_low_bits = sum(3 << (KEY_BITS * index) for index in range(number_suit_size))
+
+
+def _is_valid_key(key: SuitKey) -> bool:
+    "Return whether every tile count in a suit shape is at most 4."
+    low = key & _low_bits
+    return ((key & _high_bits) >> 2) & (low | (low >> 1)) == 0
+
+
+def _melds_keys(suit_size: int, allow_chii: bool) -> set[SuitKey]:
+    meld_keys = [_meld_key((MeldType.PON, index)) for index in range(suit_size)]
+    if allow_chii:
+        meld_keys.extend(
+            _meld_key((MeldType.CHI, index)) for index in range(suit_size - 2)
+        )
+    melds_keys = {0}
+    frontier = {0}
+    for _ in range(max_suit_melds):
+        frontier = {
+            key + meld_key
+            for key in frontier
+            for meld_key in meld_keys
+            if _is_valid_key(key + meld_key)
+        }
+        melds_keys |= frontier
+    return melds_keys
+
+
+def _split_into_3melds(
+    key: SuitKey,
+    suit_size: int,
+    allow_chii: bool,
+    cache: dict[SuitKey, tuple[ShapeDecomposition, ...]],
+) -> tuple[ShapeDecomposition, ...]:
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    if key == 0:
+        return ((),)
+    index = 0
+    while get_key_count(key, index) == 0:
+        index += 1
+    decompositions: list[ShapeDecomposition] = []
+    if get_key_count(key, index) >= 3:
+        pon: ShapeMeld = (MeldType.PON, index)
+        decompositions.extend(
+            (pon,) + decomposition
+            for decomposition in _split_into_3melds(
+                key - _meld_key(pon), suit_size, allow_chii, cache
+            )
+        )
+    if (
+        allow_chii
+        and index + 2 < suit_size
+        and get_key_count(key, index + 1) > 0
+        and get_key_count(key, index + 2) > 0
+    ):
+        chii: ShapeMeld = (MeldType.CHI, index)
+        decompositions.extend(
+            (chii,) + decomposition
+            for decomposition in _split_into_3melds(
+                key - _meld_key(chii), suit_size, allow_chii, cache
+            )
+        )
+    result = tuple(decompositions)
+    cache[key] = result
+    return result
+
+
+def _build_table(
+    suit_size: int, allow_chii: bool
+) -> dict[SuitKey, tuple[ShapeDecomposition, ...]]:
+    cache: dict[SuitKey, tuple[ShapeDecomposition, ...]] = {}
+    melds_keys = _melds_keys(suit_size, allow_chii)
+    table = {
+        key: _split_into_3melds(key, suit_size, allow_chii, cache)
+        for key in sorted(melds_keys)
+    }
+    pair_decompositions: dict[SuitKey, list[ShapeDecomposition]] = {}
+    for index in range(suit_size):
+        pair: ShapeMeld = (MeldType.PAIR, index)
+        pair_key = _meld_key(pair)
+        for key, melds_decompositions in table.items():
+            if not _is_valid_key(key + pair_key):
+                continue
+            pair_decompositions.setdefault(key + pair_key, []).extend(
+                (pair,) + decomposition for decomposition in melds_decompositions
+            )
+    table.update(
+        (key, tuple(decompositions))
+        for key, decompositions in pair_decompositions.items()
+    )
+    return table
+
+
+def _build_waits_table(
+    table: Mapping[SuitKey, tuple[ShapeDecomposition, ...]], suit_size: int
+) -> dict[SuitKey, int]:
+    waits_table: dict[SuitKey, int] = {}
+    for key in table:
+        for index in range(suit_size):
+            if get_key_count(key, index) > 0:
+                waiting_key = key - (1 << (KEY_BITS * index))
+                waits_table[waiting_key] = waits_table.get(waiting_key, 0) | (
+                    1 << index
+                )
+    return waits_table
+
+
+_ShapeTables = tuple[
+    Mapping[SuitKey, tuple[ShapeDecomposition, ...]],
+    Mapping[SuitKey, tuple[ShapeDecomposition, ...]],
+    Mapping[SuitKey, int],
+    Mapping[SuitKey, int],
+]
+
+
+def _build_tables() -> _ShapeTables:
+    number_table = _build_table(number_suit_size, allow_chii=True)
+    honour_table = _build_table(honour_suit_size, allow_chii=False)
+    return (
+        number_table,
+        honour_table,
+        _build_waits_table(number_table, number_suit_size),
+        _build_waits_table(honour_table, honour_suit_size),
+    )
+
+
+shape_table_file_version = 1
+"""
+The version of the format of the shape table file.
+
+This must be increased whenever the format or the contents of the tables
+change, so that out of date files are ignored. The tests record a digest of
+the file written for each version, and fail if the file changes without the
+version being increased.
+"""
+
+default_shape_table_path = Path(__file__).with_name("shape_table.bin")
+"The path of the shape table file shipped with the package."
+
+_file_magic = b"ZMSHAPE\0"
+_header_format = "<8sII"
+_array_entry_format = "<II"
+_arrays_per_suit = 6
+
+_T = TypeVar("_T")
+_V = TypeVar("_V")
+
+
+class _MappedTable(ABC, Mapping[SuitKey, _V], Generic[_V]):
+    """
+    A read-only mapping whose sorted keys are stored in a memory-mapped file.
+
+    Values are decoded on first use and then cached.
+    """
+
+    def __init__(self, keys: memoryview) -> None:
+        self._keys = keys
+        self._cache: dict[SuitKey, _V | None] = {}
+
+    @abstractmethod
+    def _decode(self, position: int) -> _V:
+        "Decode the value of the key at a position in the sorted keys."
+
+    def _lookup(self, key: SuitKey) -> _V | None:
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        position = bisect_left(self._keys, key)
+        value = (
+            self._decode(position)
+            if position < len(self._keys) and self._keys[position] == key
+            else None
+        )
+        self._cache[key] = value
+        return value
+
+    def __getitem__(self, key: SuitKey) -> _V:
+        value = self._lookup(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    @overload
+    def get(self, key: SuitKey, /) -> _V | None: ...
+    @overload
+    def get(self, key: SuitKey, default: _V, /) -> _V: ...
+    @overload
+    def get(self, key: SuitKey, default: _T, /) -> _V | _T: ...
+    def get(self, key: SuitKey, default: object = None, /) -> object:
+        value = self._lookup(key)
+        return default if value is None else value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, int) and self._lookup(key) is not None
+
+    def __iter__(self) -> Iterator[SuitKey]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+@final
+class _MappedShapeTable(_MappedTable[tuple[ShapeDecomposition, ...]]):
+    def __init__(
+        self,
+        keys: memoryview,
+        decomposition_starts: memoryview,
+        meld_starts: memoryview,
+        melds: memoryview,
+    ) -> None:
+        super().__init__(keys)
+        self._decomposition_starts = decomposition_starts
+        self._meld_starts = meld_starts
+        self._melds = melds
+
+    def _decode(self, position: int) -> tuple[ShapeDecomposition, ...]:
+        meld_starts = self._meld_starts
+        melds = self._melds
+        return tuple(
+            tuple(
+                (MeldType(meld >> 4), meld & 15)
+                for meld in melds[
+                    meld_starts[decomposition] : meld_starts[decomposition + 1]
+                ]
+            )
+            for decomposition in range(
+                self._decomposition_starts[position],
+                self._decomposition_starts[position + 1],
+            )
+        )
+
+
+@final
+class _MappedWaitsTable(_MappedTable[int]):
+    def __init__(self, keys: memoryview, masks: memoryview) -> None:
+        super().__init__(keys)
+        self._masks = masks
+
+    def _decode(self, position: int) -> int:
+        mask: int = self._masks[position]
+        return mask
+
+
+def _encode_suit_tables(
+    table: Mapping[SuitKey, tuple[ShapeDecomposition, ...]],
+    waits_table: Mapping[SuitKey, int],
+) -> list[tuple[str, list[int]]]:
+    keys = sorted(table)
+    decomposition_starts = [0]
+    meld_starts = [0]
+    melds: list[int] = []
+    for key in keys:
+        for decomposition in table[key]:
+            melds.extend(meld_type << 4 | index for meld_type, index in decomposition)
+            meld_starts.append(len(melds))
+        decomposition_starts.append(len(meld_starts) - 1)
+    wait_keys = sorted(waits_table)
+    return [
+        ("I", keys),
+        ("I", decomposition_starts),
+        ("I", meld_starts),
+        ("B", melds),
+        ("I", wait_keys),
+        ("H", [waits_table[key] for key in wait_keys]),
+    ]
+
+
+def write_shape_table_file(path: str | Path = default_shape_table_path) -> None:
+    """
+    Compute the shape tables and write them to a file, to be loaded with
+    :py:func:`load_shape_table_file`.
+
+    :param path: The path of the file to write.
+                 Defaults to :py:data:`default_shape_table_path`.
+    """
+    number_table, honour_table, number_waits_table, honour_waits_table = _build_tables()
+    arrays = _encode_suit_tables(number_table, number_waits_table)
+    arrays += _encode_suit_tables(honour_table, honour_waits_table)
+    offset = struct.calcsize(_header_format) + len(arrays) * struct.calcsize(
+        _array_entry_format
+    )
+    entries: list[bytes] = []
+    data: list[bytes] = []
+    for array_format, values in arrays:
+        # Align every array so that it can be cast to its item type.
+        padding = -offset % 4
+        data.append(bytes(padding))
+        offset += padding
+        array_data = struct.pack(f"<{len(values)}{array_format}", *values)
+        entries.append(struct.pack(_array_entry_format, offset, len(values)))
+        data.append(array_data)
+        offset += len(array_data)
+    with open(path, "wb") as file:
+        file.write(
+            struct.pack(
+                _header_format, _file_magic, shape_table_file_version, len(arrays)
+            )
+        )
+        file.writelines(entries)
+        file.writelines(data)
+
+
+def load_shape_table_file(
+    path: str | Path = default_shape_table_path,
+) -> _ShapeTables | None:
+    """
+    Load the shape tables from a file written by :py:func:`write_shape_table_file`.
+
+    The file is memory-mapped, and table entries are only decoded when they
+    are looked up. Returns ``None`` if the file is missing, or was written
+    by a different version of the package.
+
+    :param path: The path of the file to read.
+                 Defaults to :py:data:`default_shape_table_path`.
+    """
+    try:
+        with open(path, "rb") as file:
+            mapped_file = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, version, array_count = struct.unpack_from(_header_format, mapped_file)
+        if (
+            magic != _file_magic
+            or version != shape_table_file_version
+            or array_count != 2 * _arrays_per_suit
+        ):
+            return None
+        view = memoryview(mapped_file)
+        arrays: list[memoryview] = []
+        entry_offset = struct.calcsize(_header_format)
+        for array_format in ("I", "I", "I", "B", "I", "H") * 2:
+            offset, length = struct.unpack_from(
+                _array_entry_format, mapped_file, entry_offset
+            )
+            entry_offset += struct.calcsize(_array_entry_format)
+            item_size = struct.calcsize(array_format)
+            if offset + length * item_size > len(mapped_file):
+                return None
+            arrays.append(view[offset : offset + length * item_size].cast(array_format))
+    except (struct.error, TypeError, ValueError):
+        return None
+    return (
+        _MappedShapeTable(*arrays[0:4]),
+        _MappedShapeTable(*arrays[6:10]),
+        _MappedWaitsTable(*arrays[4:6]),
+        _MappedWaitsTable(*arrays[10:12]),
+    )
+
+
+_tables = load_shape_table_file() or _build_tables()
+
+number_suit_table = _tables[0]
+"""
+A mapping containing the decompositions of every complete number suit shape.
+
+A shape is complete if it can be split into melds, or into melds and one pair.
+Shapes that are not complete are not in the mapping.
+The decompositions are listed in the order that a depth-first search
+(trying pairs in ascending order, then triplets before sequences) finds them.
+"""
+
+honour_suit_table = _tables[1]
+"""
+A mapping containing the decompositions of every complete honour suit shape.
+
+See :py:data:`number_suit_table`.
+"""
+
+suit_tables = (
+    number_suit_table,
+    number_suit_table,
+    number_suit_table,
+    honour_suit_table,
+)
+"A tuple containing the shape table to use for each suit."
+
+number_suit_waits_table = _tables[2]
+"""
+A mapping containing the waits of every number suit shape that is one tile
+away from being complete.
+
+The waits are stored as a bitmask, where bit :math:`i` is set if adding the
+tile with index :math:`i` completes the shape.
+"""
+
+honour_suit_waits_table = _tables[3]
+"""
+A mapping containing the waits of every honour suit shape that is one tile
+away from being complete.
+
+See :py:data:`number_suit_waits_table`.
+"""
+
+suit_waits_tables = (
+    number_suit_waits_table,
+    number_suit_waits_table,
+    number_suit_waits_table,
+    honour_suit_waits_table,
+)
+"A tuple containing the waits table to use for each suit."
+
+
+def get_suit_decompositions(
+    suit_index: int, key: SuitKey
+) -> tuple[ShapeDecomposition, ...]:
+    """
+    Return the decompositions of a suit shape, or an empty tuple if the
+    shape is not complete.
+
+    :param suit_index: The index of the suit (0-2 for number suits, 3 for honours).
+    :param key: The :py:data:`SuitKey` of the suit shape.
+    """
+    return suit_tables[suit_index].get(key, ())
+
+
+def is_complete_hand(suit_keys: list[SuitKey], suit_sizes: list[int]) -> bool:
+    """
+    Return whether the given suit shapes together form a standard winning hand,
+    i.e. every suit is complete and exactly one suit contains the pair.
+
+    :param suit_keys: The :py:data:`SuitKey` s of the four suits.
+    :param suit_sizes: The number of tiles in each of the four suits.
+    """
+    if sum(suit_size % 3 != 0 for suit_size in suit_sizes) != 1:
+        return False
+    return all(
+        key == 0 or key in suit_table for key, suit_table in zip(suit_keys, suit_tables)
+    )
+
+
+def get_standard_waits(
+    suit_keys: list[SuitKey], suit_sizes: list[int]
+) -> list[TileValue]:
+    """
+    Return the tile values that complete the given suit shapes into a standard
+    winning hand (melds and one pair).
+
+    Only the suits that could receive the winning tile are looked up in
+    the waits tables; every other suit must already be complete.
+
+    :param suit_keys: The :py:data:`SuitKey` s of the four suits.
+    :param suit_sizes: The number of tiles in each of the four suits.
+    """
+    remainders = [suit_size % 3 for suit_size in suit_sizes]
+    if remainders.count(1) == 1 and remainders.count(2) == 0:
+        waiting_suits = [remainders.index(1)]
+    elif remainders.count(2) == 2 and remainders.count(1) == 0:
+        waiting_suits = [
+            suit_index for suit_index in range(4) if remainders[suit_index] == 2
+        ]
+    else:
+        return []
+    waits: list[TileValue] = []
+    for suit_index in waiting_suits:
+        if not all(
+            key in suit_tables[other_index]
+            for other_index, key in enumerate(suit_keys)
+            if other_index != suit_index
+        ):
+            continue
+        waits_mask = suit_waits_tables[suit_index].get(suit_keys[suit_index], 0)
+        index = 0
+        while waits_mask:
+            if waits_mask & 1:
+                waits.append(get_suit_tile_value(suit_index, index))
+            waits_mask >>= 1
+            index += 1
+    return waits
@@ -0,0 +1,267 @@
+"""
+Headless self-play simulation of games of mahjong.
+
+Each player's actions are chosen by a :py:data:`Policy`, and games are played
+through :py:class:`.game.Game` exactly as they would be by the server.
+Every game is seeded from the simulation seed and its index, so a game plays
+out the same way however the games are split between worker processes.
+"""
+
+import os
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from random import Random
+from typing import final
+
+from pydantic import BaseModel
+
+from .action import Action, ActionType, HandTileAction
+from .game import Game
+from .game_options import GameOptions
+from .round import Round, RoundStatus
+from .shanten import get_shanten_info
+
+Policy = Callable[[Round, int, list[Action], Random], Action]
+"""
+Represents a player policy, which chooses an action for a player.
+
+A policy is called with the :py:class:`Round` being played, the index of the
+player, the list of actions the player can take (with the default action
+first) and the game's random number generator, and returns one of the actions.
+"""
+
+policies: dict[str, Policy] = {}
+"A dictionary containing the registered policies, indexed by name."
+
+
+def register_policy(name: str) -> Callable[[Policy], Policy]:
+    """
+    Decorator to register a function as a :py:data:`Policy`.
+
+    :param name: The name of the policy.
+    """
+
+    def _register_policy_inner(func: Policy) -> Policy:
+        policies[name] = func
+        return func
+
+    return _register_policy_inner
+
+
+_win_action_types = (ActionType.TSUMO, ActionType.RON)
+
+
+def _find_action(actions: list[Action], action_type: ActionType) -> Action | None:
+    return next(
+        (action for action in actions if action.action_type == action_type), None
+    )
+
+
+@register_policy("tsumogiri")
+def tsumogiri_policy(
+    round: Round, player: int, actions: list[Action], rng: Random
+) -> Action:
+    """
+    Win whenever possible, and otherwise take the default action,
+    i.e. discard the drawn tile and pass on every call.
+    """
+    for action_type in _win_action_types:
+        action = _find_action(actions, action_type)
+        if action is not None:
+            return action
+    return actions[0]
+
+
+@register_policy("random")
+def random_policy(
+    round: Round, player: int, actions: list[Action], rng: Random
+) -> Action:
+    "Choose an action uniformly at random."
+    return rng.choice(actions)
+
+
+@register_policy("greedy")
+def greedy_policy(
+    round: Round, player: int, actions: list[Action], rng: Random
+) -> Action:
+    """
+    Win whenever possible and replace flowers, and otherwise discard the tile
+    that leaves the lowest shanten and the highest ukeire, declaring riichi
+    when it can. Calls are always passed on.
+    """
+    for action_type in (*_win_action_types, ActionType.FLOWER):
+        action = _find_action(actions, action_type)
+        if action is not None:
+            return action
+    discards = [
+        action
+        for action in actions
+        if isinstance(action, HandTileAction)
+        and action.action_type in (ActionType.DISCARD, ActionType.RIICHI)
+    ]
+    if not discards:
+        return actions[0]
+    hand = round.get_hand(player)
+    visible_tiles = round.discard_tiles
+    tile_progress: dict[int, tuple[int, int]] = {}
+
+    def get_progress(tile: int) -> tuple[int, int]:
+        if tile not in tile_progress:
+            remaining_tiles = list(hand)
+            remaining_tiles.remove(tile)
+            info = get_shanten_info(remaining_tiles, visible_tiles)
+            tile_progress[tile] = (info.shanten, -info.ukeire)
+        return tile_progress[tile]
+
+    return min(
+        discards,
+        key=lambda action: (
+            get_progress(action.tile),
+            action.action_type != ActionType.RIICHI,
+        ),
+    )
+
+
+@final
+class RoundResult(BaseModel, frozen=True):
+    "Represents the outcome of a simulated round."
+
+    game_index: int
+    "The index of the game in the simulation."
+    game_seed: int
+    "The seed of the game (see :py:attr:`.game.Game.seed`)."
+    round_index: int
+    "The index of the round in the game."
+    wind_round: int
+    "The wind round of the round."
+    sub_round: int
+    "The sub-round number of the round."
+    win_player: int | None
+    "The index of the winning player, or ``None`` if the round was a draw."
+    lose_player: int | None
+    "The index of the player who dealt in, or ``None`` for a tsumo or a draw."
+    patterns: list[str]
+    "The internal names of the patterns of the winning hand."
+    han: int | None
+    "The han value of the winning hand, or ``None`` if the round was a draw."
+    fu: int | None
+    "The fu value of the winning hand, or ``None`` if the round was a draw."
+    wall_count: int
+    "The number of tiles left in the wall at the end of the round."
+    player_scores: list[float]
+    "The change in each player's score from the round."
+
+
+def _play_round(game: Game, player_policies: Sequence[Policy], rng: Random) -> None:
+    round = game.round
+    while round.status != RoundStatus.END:
+        history_index = len(round.history)
+        for player, policy in enumerate(player_policies):
+            allowed_actions = round.allowed_actions[player]
+            action = allowed_actions.auto
+            if action is None:
+                action = policy(round, player, allowed_actions.actions, rng)
+            if game.submit_action(player, action, history_index) is None:
+                # The action of an earlier player has already been performed.
+                break
+
+
+def _get_round_result(game: Game, game_index: int) -> RoundResult:
+    scoring = game.scoring
+    return RoundResult(
+        game_index=game_index,
+        game_seed=game.seed,
+        round_index=game.round_index,
+        wind_round=game.wind_round,
+        sub_round=game.sub_round,
+        win_player=None if scoring is None else scoring.win_player,
+        lose_player=None if scoring is None else scoring.lose_player,
+        patterns=[] if scoring is None else list(scoring.patterns),
+        han=None if scoring is None else scoring.han,
+        fu=None if scoring is None else scoring.fu,
+        wall_count=game.round.wall_count,
+        player_scores=(
+            [0.0] * game.player_count if scoring is None else scoring.player_scores
+        ),
+    )
+
+
+def simulate_game(
+    game_index: int,
+    *,
+    seed: int,
+    options: GameOptions,
+    policy_names: Sequence[str],
+    max_rounds: int = 100,
+) -> list[RoundResult]:
+    """
+    Play one game of mahjong and return the results of its rounds.
+
+    :param game_index: The index of the game in the simulation.
+    :param seed: The seed of the simulation.
+    :param options: The :py:class:`GameOptions` to play the game with.
+    :param policy_names: The names of the policies of the players.
+                         If there are fewer names than players,
+                         the names are repeated.
+    :param max_rounds: The largest number of rounds to play.
+                       Draws repeat the dealer, so a game is not otherwise
+                       guaranteed to end.
+    """
+    rng = Random(f"{seed}:{game_index}")
+    player_policies = [
+        policies[policy_names[player % len(policy_names)]]
+        for player in range(options.player_count)
+    ]
+    game = Game(options=options, seed=rng.getrandbits(64))
+    results: list[RoundResult] = []
+    while True:
+        _play_round(game, player_policies, rng)
+        results.append(_get_round_result(game, game_index))
+        if game.is_game_end or len(results) >= max_rounds:
+            return results
+        game.start_next_round()
+
+
+def run_simulation(
+    game_count: int,
+    *,
+    seed: int,
+    options: GameOptions,
+    policy_names: Sequence[str],
+    max_rounds: int = 100,
+    workers: int | None = None,
+) -> Iterator[list[RoundResult]]:
+    """
+    Play some games of mahjong across a pool of processes, and yield the
+    results of each game's rounds in order of game index.
+
+    :param game_count: The number of games to play.
+    :param seed: The seed of the simulation.
+    :param options: The :py:class:`GameOptions` to play the games with.
+    :param policy_names: The names of the policies of the players.
+                         See :py:func:`simulate_game`.
+    :param max_rounds: The largest number of rounds to play in each game.
+    :param workers: The number of worker processes. If this is 1 the games are
+                    played in the current process, and if this is ``None``
+                    one worker is used per CPU.
+    """
+    if not policy_names:
+        raise ValueError("At least one policy name is needed")
+    unknown_policies = set(policy_names).difference(policies)
+    if unknown_policies:
+        raise ValueError(f"Unknown policies: {sorted(unknown_policies)}")
+    play = partial(
+        simulate_game,
+        seed=seed,
+        options=options,
+        policy_names=list(policy_names),
+        max_rounds=max_rounds,
+    )
+    if workers == 1:
+        yield from map(play, range(game_count))
+        return
+    worker_count = workers if workers is not None else os.cpu_count() or 1
+    chunk_size = max(1, min(64, game_count // (4 * worker_count)))
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        yield from executor.map(play, range(game_count), chunksize=chunk_size)
@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+
 TileId = int
 "Represents a Mahjong tile. Every tile in the deck has a unique TileId."
 
@@ -44,6 +46,20 @@ def get_tile_value_buckets(tiles: list[TileId]) -> dict[TileValue, list[TileId]]
     return tile_value_buckets
 
 
+def get_tile_counts(tile_values: Iterable[TileValue]) -> list[int]:
+    """
+    Return a list containing the number of copies of each non-flower
+    tile value in the given tile values, indexed by :py:class:`TileValue` .
+
+    The list has :py:data:`tile_value_top` entries. Flowers are not counted.
+    """
+    tile_counts = [0] * tile_value_top
+    for tile_value in tile_values:
+        if tile_value < tile_value_top:
+            tile_counts[tile_value] += 1
+    return tile_counts
+
+
 def remove_tile_value(tiles: list[TileId], tile_value: TileValue) -> TileId:
     """
     Remove the first tile in the list with the specified value.
@@ -88,6 +104,9 @@ all_tiles = frozenset(
 tile_value_top = 38
 "One more than the largest possible non-flower tile value."
 
+flower_value_top = 49
+"One more than the largest possible flower tile value."
+
 orphans = frozenset({1, 9, 11, 19, 21, 29, 31, 32, 33, 34, 35, 36, 37})
 "A frozenset containing the values of all orphan tiles."
 
@@ -109,3 +128,124 @@ number_suits = [0, 10, 20]
 
 honour_suit = 30
 "The value of the honours suit."
+
+
+number_flag = 1
+"Flag set in :py:data:`tile_value_flags` for number tiles."
+
+terminal_flag = 2
+"Flag set in :py:data:`tile_value_flags` for terminal tiles."
+
+honour_flag = 4
+"Flag set in :py:data:`tile_value_flags` for honour tiles."
+
+orphan_flag = terminal_flag | honour_flag
+"Mask of :py:data:`tile_value_flags` matching orphan (terminal or honour) tiles."
+
+green_flag = 8
+"Flag set in :py:data:`tile_value_flags` for green tiles."
+
+wind_flag = 16
+"Flag set in :py:data:`tile_value_flags` for wind tiles."
+
+dragon_flag = 32
+"Flag set in :py:data:`tile_value_flags` for dragon tiles."
+
+flower_flag = 64
+"Flag set in :py:data:`tile_value_flags` for flower tiles."
+
+
+def _get_tile_value_flags(tile_value: TileValue) -> int:
+    flags = 0
+    if tile_value in all_tiles and is_number(tile_value):
+        flags |= number_flag
+    if tile_value in terminals:
+        flags |= terminal_flag
+    if tile_value in all_tiles and not is_number(tile_value):
+        flags |= honour_flag
+    if tile_value in green_tiles:
+        flags |= green_flag
+    if tile_value in winds:
+        flags |= wind_flag
+    if tile_value in dragons:
+        flags |= dragon_flag
+    if 41 <= tile_value < flower_value_top:
+        flags |= flower_flag
+    return flags
+
+
+tile_value_flags = bytes(
+    _get_tile_value_flags(tile_value) for tile_value in range(flower_value_top)
+)
+"""
+A byte array containing the flags of each :py:class:`TileValue`
+(e.g. :py:data:`orphan_flag`), indexed by tile value.
+
+Checking a tile's flags is a single lookup, so this is used instead of
+checking membership of several sets when classifying many tiles.
+"""
+
+tile_value_ranks = bytes(tile_value % 10 for tile_value in range(flower_value_top))
+"""
+A byte array containing the rank of each :py:class:`TileValue`
+(its number for number tiles, or its position in its suit otherwise),
+indexed by tile value.
+"""
+
+tile_value_suits = bytes(tile_value // 10 for tile_value in range(flower_value_top))
+"""
+A byte array containing the index of the suit of each :py:class:`TileValue`
+(0-2 for number suits, 3 for honours and 4 for flowers), indexed by tile value.
+"""
+
+
+def get_tile_id_counts(tiles: Iterable[TileId]) -> list[int]:
+    """
+    Return a list containing the number of copies of each non-flower
+    tile value in the given tiles, indexed by :py:class:`TileValue` .
+
+    This is equivalent to ``get_tile_counts(get_tile_values(tiles))``,
+    without building the intermediate list.
+    """
+    tile_counts = [0] * tile_value_top
+    for tile in tiles:
+        tile_value = tile // N
+        if tile_value < tile_value_top:
+            tile_counts[tile_value] += 1
+    return tile_counts
+
+
+TileValueMask = int
+"""
+Represents a set of tile values as a bitmask, where bit :math:`v` is set
+if the tile value :math:`v` is in the set.
+"""
+
+
+def get_tile_value_mask(tile_values: Iterable[TileValue]) -> TileValueMask:
+    "Return the :py:data:`TileValueMask` of some tile values."
+    mask = 0
+    for tile_value in tile_values:
+        mask |= 1 << tile_value
+    return mask
+
+
+terminal_mask = get_tile_value_mask(terminals)
+"The :py:data:`TileValueMask` of all terminal tiles."
+
+honour_mask = get_tile_value_mask(all_tiles - set(range(30)))
+"The :py:data:`TileValueMask` of all honour tiles."
+
+simple_mask = get_tile_value_mask(all_tiles - orphans)
+"The :py:data:`TileValueMask` of all simple (non-terminal, non-honour) tiles."
+
+green_mask = get_tile_value_mask(green_tiles)
+"The :py:data:`TileValueMask` of all green tiles."
+
+number_suit_masks = [
+    get_tile_value_mask(range(suit + 1, suit + 10)) for suit in number_suits
+]
+"""
+A list containing the :py:data:`TileValueMask` of each number suit,
+in the same order as :py:data:`number_suits`.
+"""
@@ -1,5 +1,5 @@
 from collections.abc import Sequence
-from random import sample
+from random import Random
 from threading import Lock
 from typing import final
 
@@ -91,11 +91,18 @@ class GameController:
 
     :param players: A list of the players who will play the game.
     :param options: The game options to use for the game.
+    :param seed: (Optional) The seed of the game, which determines the seating
+                 of the players and the deck of every round. If this is ``None``
+                 a random seed is used.
     """
 
-    def __init__(self, players: list[Player], options: GameOptions) -> None:
-        self._players = sample(players, len(players))
-        self._game = Game(options=options)
+    def __init__(
+        self, players: list[Player], options: GameOptions, seed: int | None = None
+    ) -> None:
+        self._game = Game(options=options, seed=seed)
+        self._players = Random(f"{self._game.seed}:players").sample(
+            players, len(players)
+        )
         self._lock = Lock()
         with self._lock:
             self._emit_info_all_inner(self._game.round.history)
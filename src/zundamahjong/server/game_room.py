@@ -361,6 +361,10 @@ class GameRoom:
             self.game_controller = GameController(
                 self.joined_players, self.game_options
             )
+        logger.info(
+            f"Room {self.room_name} has started a game"
+            + f" with seed {self.game_controller.game.seed}"
+        )
 
     def end_game(self) -> None:
         """
@@ -6,6 +6,7 @@ from flask import session
 from ..database.security import change_password
 from ..mahjong.action import action_adapter
 from ..mahjong.game_options import GameOptions
+from ..mahjong.payment import get_payment_table
 from ..types.avatar import Avatar
 from ..types.player import Player
 from .game_room import GameRoom
@@ -156,6 +157,23 @@ def on_game_options(sid: str, game_options_data: object) -> None:
     GameRoom.set_game_options(get_player(sid), game_options)
 
 
+@sio_on("get_payment_table")
+def on_get_payment_table(sid: str, game_options_data: object) -> None:
+    """
+    Send the client the payments for each han and fu under some game options,
+    e.g. to show as a points table.
+
+    :param sid: The Socket.IO session id of the connection.
+    :param game_options_data: The game options JSON object.
+    """
+    game_options = GameOptions.model_validate(game_options_data)
+    sio.emit(
+        "payment_table",
+        get_payment_table(game_options).get_grid().model_dump(),
+        to=sid,
+    )
+
+
 @sio_on("start_game")
 def on_start_game(sid: str) -> None:
     """
@@ -0,0 +1,237 @@
+import unittest
+from io import BytesIO
+from random import Random
+
+from zundamahjong.mahjong.action import (
+    Action,
+    ActionType,
+    AddKanAction,
+    ClosedKanAction,
+    HandTileAction,
+    OpenCallAction,
+    OpenKanAction,
+    SimpleAction,
+)
+from zundamahjong.mahjong.action_log import (
+    ActionLogWriter,
+    LoggedGame,
+    read_action_log,
+    replay_action_log,
+    replay_game,
+)
+from zundamahjong.mahjong.call import CallType, OpenCall
+from zundamahjong.mahjong.deck import get_deck_tiles
+from zundamahjong.mahjong.exceptions import (
+    InvalidMoveException,
+    ReplayMismatchException,
+)
+from zundamahjong.mahjong.game import Game
+from zundamahjong.mahjong.game_options import GameOptions, ScoreLimit
+from zundamahjong.mahjong.pattern import PatternData
+from zundamahjong.mahjong.round import RoundStatus
+from zundamahjong.mahjong.scoring import Scorer
+from zundamahjong.mahjong.win import Win
+
+
+def _play_logged_game(
+    writer: ActionLogWriter,
+    options: GameOptions,
+    rng: Random,
+    seed: int | None,
+    max_rounds: int = 4,
+) -> Game:
+    def get_deck_tiles_or_none() -> list[int] | None:
+        if seed is not None:
+            return None
+        deck_tiles = get_deck_tiles(options.player_count, options.use_flowers)
+        rng.shuffle(deck_tiles)
+        return deck_tiles
+
+    writer.start_game(options, seed)
+    deck_tiles = get_deck_tiles_or_none()
+    game = Game(first_deck_tiles=deck_tiles, options=options, seed=seed)
+    for round_index in range(max_rounds):
+        if round_index > 0:
+            deck_tiles = get_deck_tiles_or_none()
+            game.start_next_round(deck_tiles)
+        writer.start_round(deck_tiles)
+        round = game.round
+        while round.status != RoundStatus.END:
+            history_index = len(round.history)
+            for player in range(game.player_count):
+                action = rng.choice(round.allowed_actions[player].actions)
+                if game.submit_action(player, action, history_index) is None:
+                    break
+        for player, action in round.history:
+            writer.write_action(player, action)
+        writer.end_round(game.scoring)
+        if game.is_game_end:
+            break
+    return game
+
+
+def _read_games(data: bytes) -> list[LoggedGame]:
+    return list(read_action_log(BytesIO(data)))
+
+
+class ActionLogTest(unittest.TestCase):
+    def test_action_round_trip(self) -> None:
+        actions: list[Action] = [
+            SimpleAction(action_type=ActionType.PASS),
+            SimpleAction(action_type=ActionType.TSUMO),
+            HandTileAction(action_type=ActionType.DISCARD, tile=135),
+            HandTileAction(action_type=ActionType.FLOWER, tile=1000),
+            OpenCallAction(action_type=ActionType.CHII, other_tiles=(4, 8)),
+            OpenCallAction(action_type=ActionType.PON, other_tiles=(5, 6)),
+            OpenKanAction(other_tiles=(9, 10, 11)),
+            AddKanAction(
+                tile=3,
+                pon_call=OpenCall(
+                    call_type=CallType.PON,
+                    called_player_index=2,
+                    called_tile=0,
+                    other_tiles=(1, 2),
+                ),
+            ),
+            ClosedKanAction(tiles=(12, 13, 14, 15)),
+        ]
+        file = BytesIO()
+        writer = ActionLogWriter(file)
+        writer.start_game(GameOptions(), 12345)
+        writer.start_round()
+        for index, action in enumerate(actions):
+            writer.write_action(index % 4, action)
+        writer.end_round(None)
+        (game,) = _read_games(file.getvalue())
+        self.assertEqual(game.seed, 12345)
+        self.assertEqual(game.options, GameOptions())
+        (logged_round,) = game.rounds
+        self.assertIsNone(logged_round.deck_tiles)
+        self.assertListEqual(
+            logged_round.actions,
+            [(index % 4, action) for index, action in enumerate(actions)],
+        )
+        self.assertIsNone(logged_round.win_player)
+
+    def test_replay_seeded_games(self) -> None:
+        file = BytesIO()
+        writer = ActionLogWriter(file)
+        rng = Random(0)
+        options_list = [
+            GameOptions(),
+            GameOptions(player_count=3, use_flowers=True),
+        ]
+        games = [
+            _play_logged_game(writer, options, rng, seed)
+            for seed, options in enumerate(options_list)
+        ]
+        logged_games = _read_games(file.getvalue())
+        self.assertEqual(len(logged_games), len(games))
+        for game, logged_game in zip(games, logged_games):
+            replayed_game = replay_game(logged_game)
+            self.assertEqual(replayed_game.round_index, game.round_index)
+            self.assertEqual(replayed_game.player_scores, game.player_scores)
+            self.assertEqual(replayed_game.round.history, game.round.history)
+
+    def test_replay_games_with_decks(self) -> None:
+        file = BytesIO()
+        writer = ActionLogWriter(file)
+        game = _play_logged_game(
+            writer, GameOptions(use_flowers=True), Random(1), seed=None
+        )
+        (logged_game,) = _read_games(file.getvalue())
+        self.assertIsNone(logged_game.seed)
+        replayed_game = replay_game(logged_game)
+        self.assertEqual(replayed_game.player_scores, game.player_scores)
+
+    def test_replay_action_log(self) -> None:
+        file = BytesIO()
+        writer = ActionLogWriter(file)
+        rng = Random(6)
+        for seed in range(3):
+            _play_logged_game(writer, GameOptions(), rng, seed, max_rounds=2)
+        data = file.getvalue()
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                logged_games = list(replay_action_log(BytesIO(data), workers=workers))
+                self.assertListEqual(logged_games, _read_games(data))
+
+    def test_negative_han_round_trip(self) -> None:
+        win = Win(
+            win_player=0,
+            lose_player=1,
+            hand=[30, 31, 40, 41, 90, 91, 150, 151, 210, 211, 220, 221, 310, 311],
+            calls=[],
+            flowers=[420],
+            player_count=4,
+            wind_round=0,
+            sub_round=0,
+        )
+        options = GameOptions(
+            pattern_data={
+                "SEVEN_PAIRS": PatternData(display_name="Seven Pairs", han=-10, fu=0)
+            },
+            base_score_limits=[ScoreLimit(han=-20, score=100.0)],
+        )
+        scoring = Scorer.score(win, options)
+        self.assertLess(scoring.han, 0)
+        file = BytesIO()
+        writer = ActionLogWriter(file)
+        writer.start_game(options, 0)
+        writer.start_round()
+        writer.end_round(scoring)
+        (game,) = _read_games(file.getvalue())
+        (logged_round,) = game.rounds
+        self.assertEqual(logged_round.win_player, scoring.win_player)
+        self.assertEqual(logged_round.han, scoring.han)
+        self.assertEqual(logged_round.fu, scoring.fu)
+        with self.assertRaises(ValueError):
+            writer.end_round(scoring.model_copy(update={"han": 1 << 16}))
+
+    def test_writer_needs_deck_without_seed(self) -> None:
+        writer = ActionLogWriter(BytesIO())
+        writer.start_game(GameOptions())
+        with self.assertRaises(ValueError):
+            writer.start_round()
+
+    def test_invalid_logs(self) -> None:
+        file = BytesIO()
+        _play_logged_game(ActionLogWriter(file), GameOptions(), Random(2), seed=3)
+        data = file.getvalue()
+        with self.assertRaises(ValueError):
+            _read_games(b"not a log")
+        with self.assertRaises(ValueError):
+            _read_games(data[:-1])
+        with self.assertRaises(ValueError):
+            _read_games(data + b"\x00")
+
+    def test_replay_detects_changes(self) -> None:
+        file = BytesIO()
+        _play_logged_game(ActionLogWriter(file), GameOptions(), Random(4), seed=5)
+        (logged_game,) = _read_games(file.getvalue())
+        with self.assertRaises(ReplayMismatchException):
+            replay_game(logged_game._replace(seed=6))
+        logged_round = logged_game.rounds[0]
+        with self.assertRaises(ReplayMismatchException):
+            replay_game(
+                logged_game._replace(
+                    rounds=[logged_round._replace(actions=logged_round.actions[:-1])]
+                )
+            )
+        with self.assertRaises(ReplayMismatchException):
+            replay_game(
+                logged_game._replace(
+                    rounds=[logged_round._replace(han=logged_round.han + 1)]
+                )
+            )
+        player, action = logged_round.actions[-1]
+        with self.assertRaises(InvalidMoveException):
+            replay_game(
+                logged_game._replace(
+                    rounds=[
+                        logged_round._replace(
+                            actions=[*logged_round.actions, (player, action)]
+                        )
+                    ]
+                )
+            )
@@ -13,7 +13,10 @@ from zundamahjong.mahjong.action import (
     SimpleAction,
 )
 from zundamahjong.mahjong.call import CallType, OpenCall
+from zundamahjong.mahjong.deck import Deck
+from zundamahjong.mahjong.discard_pool import DiscardPool
 from zundamahjong.mahjong.game_options import GameOptions
+from zundamahjong.mahjong.hand import Hand
 from zundamahjong.mahjong.round import Round
 
 
@@ -47,6 +50,15 @@ class AllowedActionTest(unittest.TestCase):
             round.allowed_actions[3].auto, SimpleAction(action_type=ActionType.PASS)
         )
 
+    def test_unaffected_actions_are_reused(self) -> None:
+        round = Round(tiles=test_deck1, options=GameOptions(auto_replace_flowers=False))
+        old_actions = round.allowed_actions
+        round.do_action(0, SimpleAction(action_type=ActionType.CONTINUE))
+        self.assertIsNot(round.allowed_actions[0], old_actions[0])
+        self.assertIsNot(round.allowed_actions[1], old_actions[1])
+        self.assertIs(round.allowed_actions[2], old_actions[2])
+        self.assertIs(round.allowed_actions[3], old_actions[3])
+
     def test_discarded_default_actions(self) -> None:
         round = Round(tiles=test_deck1)
         round.do_action(0, HandTileAction(action_type=ActionType.DISCARD, tile=90))
@@ -218,6 +230,25 @@ class AllowedActionTest(unittest.TestCase):
             ],
         )
 
+    def test_closed_kans_in_hand_order(self) -> None:
+        hand = Hand(0, Deck(tiles=[]), DiscardPool())
+        hand._set_tiles([130, 131, 132, 133, 21, 22, 23, 111, 112, 113, 150, 151, 110])
+        self.assertSequenceEqual(
+            hand.get_closed_kans(),
+            [
+                ClosedKanAction(tiles=(130, 131, 132, 133)),
+                ClosedKanAction(tiles=(110, 111, 112, 113)),
+            ],
+        )
+
+    def test_riichi_closed_kan_in_hand_order(self) -> None:
+        hand = Hand(0, Deck(tiles=[]), DiscardPool())
+        hand._set_tiles([10, 20, 30, 110, 111, 112, 70, 80, 81, 90, 51, 52, 53, 50])
+        hand._riichi_discard_index = 0
+        self.assertSequenceEqual(
+            hand.get_closed_kans(), [ClosedKanAction(tiles=(51, 52, 53, 50))]
+        )
+
     def test_discard_actions_after_chi(self) -> None:
         round = Round(tiles=test_deck1)
         round.do_action(0, HandTileAction(action_type=ActionType.DISCARD, tile=90))
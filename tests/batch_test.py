@@ -0,0 +1,65 @@
+import unittest
+from importlib.util import find_spec
+
+from zundamahjong.mahjong.batch import (
+    batch_get_waits,
+    batch_is_winning,
+    batch_tile_values,
+    get_batch_tile_counts,
+)
+from zundamahjong.mahjong.form_hand import get_waits, is_winning
+from zundamahjong.mahjong.tile import N, TileId, TileValue
+
+
+def value_hand(values: list[TileValue]) -> list[TileId]:
+    return [
+        value * N + values[:index].count(value) for index, value in enumerate(values)
+    ]
+
+
+hands = [
+    value_hand([1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 12, 13, 31, 31]),
+    value_hand([1, 1, 3, 3, 5, 5, 8, 8, 11, 11, 14, 14, 37, 37]),
+    value_hand([1, 9, 11, 19, 21, 29, 31, 32, 33, 34, 35, 36, 37, 37]),
+    value_hand([1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 12, 31, 31]),
+    value_hand([1, 1, 3, 3, 5, 5, 8, 8, 11, 11, 14, 14, 37]),
+    value_hand([1, 9, 11, 19, 21, 29, 31, 32, 33, 34, 35, 36, 37]),
+    value_hand([1, 9, 11, 19, 21, 29, 31, 32, 33, 34, 35, 36, 36]),
+    value_hand([1, 1, 1, 2, 3, 4, 5, 6, 7, 8, 9, 9, 9]),
+    value_hand([2, 2, 3, 4, 12, 13, 14, 35]),
+    value_hand([4, 5, 31, 31]),
+    value_hand([2, 2, 2, 2]),
+    value_hand([1, 4, 7, 12, 15, 18, 23, 26, 29, 31, 32, 33, 34]),
+    value_hand([]),
+]
+
+
+@unittest.skipIf(find_spec("numpy") is None, "numpy is not installed")
+class BatchTest(unittest.TestCase):
+    def test_is_winning(self) -> None:
+        self.assertListEqual(
+            batch_is_winning(get_batch_tile_counts(hands)).tolist(),
+            [is_winning(hand) for hand in hands],
+        )
+
+    def test_waits(self) -> None:
+        waits = batch_get_waits(get_batch_tile_counts(hands))
+        for hand, hand_waits in zip(hands, waits):
+            self.assertSetEqual(
+                {
+                    tile_value
+                    for tile_value, is_wait in zip(batch_tile_values, hand_waits)
+                    if is_wait
+                },
+                set(get_waits(hand)),
+            )
+
+    def test_flowers_are_not_counted(self) -> None:
+        self.assertListEqual(
+            get_batch_tile_counts([[10, 11, 410]]).tolist(),
+            [[2] + [0] * 33],
+        )
+
+    def test_bad_shape(self) -> None:
+        with self.assertRaises(ValueError):
+            batch_is_winning([[0] * 38])
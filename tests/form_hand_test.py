@@ -1,6 +1,12 @@
 import unittest
 
-from zundamahjong.mahjong.form_hand import formed_hand_possibilities, is_winning
+from zundamahjong.mahjong.form_hand import (
+    formed_hand_possibilities,
+    is_count_winning,
+    is_winning,
+    iter_formed_hands,
+)
+from zundamahjong.mahjong.tile import N, get_tile_counts, get_tile_values
 
 
 class FormHandTest(unittest.TestCase):
@@ -66,8 +72,8 @@ class FormHandTest(unittest.TestCase):
 
     def test_nine_gates(self) -> None:
         tiles = [10, 11, 12, 20, 30, 40, 50, 60, 70, 80, 90, 91, 92]
-        for tile in range(1, 10):
-            self.assertTrue(is_winning(tiles + [tile]))
+        for tile_value in range(1, 10):
+            self.assertTrue(is_winning(tiles + [tile_value * N + 3]))
 
     def test_seven_pairs(self) -> None:
         tiles = [10, 11, 50, 51, 90, 91, 130, 131, 150, 151, 270, 271, 350, 351]
@@ -96,3 +102,37 @@ class FormHandTest(unittest.TestCase):
     def test_thirteen_orphans_and_other(self) -> None:
         tiles = [10, 90, 110, 130, 190, 210, 290, 310, 320, 330, 340, 350, 360, 370]
         self.assertFalse(is_winning(tiles))
+
+    def test_winning_tile_placements(self) -> None:
+        tiles = [10, 20, 30, 40, 50, 160, 161, 31]
+        formed_hands = formed_hand_possibilities(tiles)
+        self.assertListEqual(
+            [
+                [(meld.tiles, meld.winning_tile_index) for meld in formed_hand]
+                for formed_hand in formed_hands
+            ],
+            [
+                [([10, 20, 30], 2), ([31, 40, 50], None), ([160, 161], None)],
+                [([10, 20, 30], None), ([31, 40, 50], 0), ([160, 161], None)],
+            ],
+        )
+        self.assertIsNot(formed_hands[0][0].tiles, formed_hands[1][0].tiles)
+
+    def test_iter_formed_hands(self) -> None:
+        tiles = [20, 21, 30, 31, 40, 41, 150, 151, 160, 161, 170, 171, 360, 361]
+        formed_hands = iter_formed_hands(tiles)
+        self.assertEqual(next(formed_hands), formed_hand_possibilities(tiles)[0])
+        self.assertEqual(len(list(formed_hands)), 1)
+
+    def test_count_winning(self) -> None:
+        for tiles, expected in [
+            ([10, 20, 30, 40, 50, 160, 161, 31], True),
+            (
+                [10, 90, 110, 190, 191, 210, 290, 310, 320, 330, 340, 350, 360, 370],
+                True,
+            ),
+            ([10, 11, 150, 151, 290, 291, 330, 331], False),
+            ([10, 20, 21, 30, 40], False),
+        ]:
+            tile_counts = get_tile_counts(get_tile_values(tiles))
+            self.assertEqual(is_count_winning(tile_counts), expected)
@@ -15,6 +15,7 @@ from zundamahjong.mahjong.call import (
     CallType,
     OpenCall,
 )
+from zundamahjong.mahjong.discard_pool import DiscardPool
 from zundamahjong.mahjong.game_options import GameOptions
 from zundamahjong.mahjong.round import Round
 
@@ -314,3 +315,29 @@ class OwnDiscardFuritenTest(unittest.TestCase):
         round.display_info()
         self.assertSetEqual(round._hands[0].waits, {1})
         self.assertFalse(round._hands[0].is_own_discard_furiten)
+
+
+class DiscardPoolFuritenValuesTest(unittest.TestCase):
+    def test_values_update_when_discards_become_old(self) -> None:
+        discard_pool = DiscardPool()
+        discard_pool.append(0, 10)
+        self.assertSetEqual(set(discard_pool.temporary_furiten_values(0)), {1})
+        self.assertSetEqual(set(discard_pool.temporary_furiten_values(1)), set())
+        discard_pool.unnew_last_discard()
+        self.assertSetEqual(set(discard_pool.temporary_furiten_values(1)), {1})
+        discard_pool.append(1, 20, is_riichi=True)
+        discard_pool.unnew_last_discard()
+        discard_pool.append(2, 30)
+        discard_pool.pop()
+        self.assertSetEqual(set(discard_pool.temporary_furiten_values(0)), {1, 2, 3})
+        self.assertSetEqual(set(discard_pool.temporary_furiten_values(1)), {2, 3})
+        self.assertSetEqual(set(discard_pool.riichi_furiten_values(1)), {2, 3})
+        self.assertSetEqual(set(discard_pool.riichi_furiten_values(0)), set())
+        self.assertSetEqual(set(discard_pool.own_discard_values(2)), {3})
+
+    def test_closed_kan_is_not_passed(self) -> None:
+        discard_pool = DiscardPool()
+        discard_pool.append(0, 10, is_closed_kan=True)
+        discard_pool.unnew_last_discard()
+        self.assertSetEqual(set(discard_pool.temporary_furiten_values(0)), {1})
+        self.assertSetEqual(set(discard_pool.temporary_furiten_values(1)), set())
@@ -0,0 +1,537 @@
+# pyright: reportPrivateUsage=false
+
+"""
+Differential fuzz tests comparing the hand evaluation code against the
+reference implementations in :py:mod:`tests.reference_form_hand` and
+:py:mod:`tests.reference_scoring`.
+
+Random wins are generated from a seed, so every case can be reproduced from
+the seed and its index. Each check runs the current and the reference
+implementation on a case, and any mismatch is shrunk to a smaller case that
+still fails the same check.
+
+Run the fuzzer across all cores with::
+
+    python -m tests.fuzz --count 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+from collections.abc import Callable, Hashable
+from functools import partial
+from multiprocessing import Pool
+from typing import final
+
+from pydantic import BaseModel
+
+from tests import reference_form_hand, reference_scoring
+from zundamahjong.mahjong.call import (
+    AddKanCall,
+    Call,
+    CallType,
+    ClosedKanCall,
+    OpenCall,
+    OpenKanCall,
+    get_call_tiles,
+)
+from zundamahjong.mahjong.deck import (
+    Deck,
+    four_player_deck,
+    four_player_flowers,
+    three_player_deck,
+    three_player_flowers,
+)
+from zundamahjong.mahjong.discard_pool import DiscardPool
+from zundamahjong.mahjong.form_hand import (
+    formed_hand_possibilities,
+    get_waits,
+    is_winning,
+)
+from zundamahjong.mahjong.game_options import GameOptions, ScoreLimit
+from zundamahjong.mahjong.hand import Hand
+from zundamahjong.mahjong.meld import Meld, MeldType
+from zundamahjong.mahjong.scoring import Scorer
+from zundamahjong.mahjong.tile import N, TileId, TileValue, get_tile_value, orphans
+from zundamahjong.mahjong.win import Win
+
+FuzzCheck = Callable[[Win], bool]
+"A function that returns whether the current and reference code agree on a win."
+
+fuzz_options = [
+    GameOptions(),
+    GameOptions(calculate_fu=True, round_up_fu=True, seven_pairs_use_fixed_fu=True),
+    GameOptions(
+        round_up_points=True,
+        calculate_fu=True,
+        base_score_limits=[
+            ScoreLimit(han=5, score=2000.0),
+            ScoreLimit(han=8, score=3000.0),
+        ],
+    ),
+    GameOptions(base_score_limits=[]),
+]
+"The :py:class:`GameOptions` each winning case is scored with."
+
+
+class _TileSupply:
+    "Hands out unused tile ids of each tile value."
+
+    def __init__(self, tile_values: list[TileValue]) -> None:
+        self.tile_values = tile_values
+        self._used: dict[TileValue, int] = {}
+
+    def take(self, tile_value: TileValue, count: int) -> list[TileId] | None:
+        used = self._used.get(tile_value, 0)
+        if tile_value not in self.tile_values or used + count > 4:
+            return None
+        self._used[tile_value] = used + count
+        return [tile_value * N + copy for copy in range(used, used + count)]
+
+
+def _generate_call(
+    rng: random.Random, supply: _TileSupply, called_player_index: int
+) -> Call | None:
+    tile_value = rng.choice(supply.tile_values)
+    kind = rng.random()
+    if kind < 0.35:
+        tiles: list[TileId] = []
+        for offset in range(3):
+            taken = supply.take(tile_value + offset, 1)
+            if taken is None:
+                return None
+            tiles += taken
+        return OpenCall(
+            call_type=CallType.CHI,
+            called_player_index=called_player_index,
+            called_tile=tiles[0],
+            other_tiles=(tiles[1], tiles[2]),
+        )
+    if kind < 0.7:
+        taken = supply.take(tile_value, 3)
+        if taken is None:
+            return None
+        return OpenCall(
+            call_type=CallType.PON,
+            called_player_index=called_player_index,
+            called_tile=taken[0],
+            other_tiles=(taken[1], taken[2]),
+        )
+    taken = supply.take(tile_value, 4)
+    if taken is None:
+        return None
+    if kind < 0.8:
+        return OpenKanCall(
+            called_player_index=called_player_index,
+            called_tile=taken[0],
+            other_tiles=(taken[1], taken[2], taken[3]),
+        )
+    if kind < 0.9:
+        return AddKanCall(
+            called_player_index=called_player_index,
+            called_tile=taken[0],
+            added_tile=taken[1],
+            other_tiles=(taken[2], taken[3]),
+        )
+    return ClosedKanCall(tiles=(taken[0], taken[1], taken[2], taken[3]))
+
+
+def _generate_melds(
+    rng: random.Random, supply: _TileSupply, meld_count: int
+) -> list[TileId] | None:
+    "Generate tiles that form some melds and a pair (often sharing tile values)."
+    tiles: list[TileId] = []
+    # Drawing from a few tile values makes 4-of-a-kinds and ambiguous shapes common.
+    tile_values = rng.sample(supply.tile_values, rng.randint(2, 8))
+    for _ in range(meld_count):
+        tile_value = rng.choice(tile_values)
+        if rng.random() < 0.5:
+            for offset in range(3):
+                taken = supply.take(tile_value + offset, 1)
+                if taken is None:
+                    return None
+                tiles += taken
+        else:
+            taken = supply.take(tile_value, 3)
+            if taken is None:
+                return None
+            tiles += taken
+    taken = supply.take(rng.choice(tile_values), 2)
+    if taken is None:
+        return None
+    return tiles + taken
+
+
+def _generate_hand(
+    rng: random.Random, supply: _TileSupply, meld_count: int
+) -> list[TileId] | None:
+    kind = rng.random()
+    if kind < 0.1 and meld_count == 4:
+        # Seven pairs, possibly using a 4-of-a-kind as two pairs.
+        tiles: list[TileId] = []
+        for tile_value in rng.sample(supply.tile_values, 7):
+            taken = supply.take(tile_value, 2)
+            if taken is None:
+                return None
+            tiles += taken
+        if rng.random() < 0.2:
+            duplicate = supply.take(get_tile_value(tiles[0]), 2)
+            if duplicate is None:
+                return None
+            tiles[2:4] = duplicate
+        return tiles
+    if kind < 0.2 and meld_count == 4:
+        # Thirteen orphans, possibly missing an orphan.
+        hand_orphans = [tile for tile in orphans if tile in supply.tile_values]
+        hand_values = hand_orphans + rng.choices(hand_orphans, k=14 - len(hand_orphans))
+        if rng.random() < 0.2:
+            hand_values[0] = hand_values[-1]
+        tiles = []
+        for tile_value in hand_values:
+            taken = supply.take(tile_value, 1)
+            if taken is None:
+                return None
+            tiles += taken
+        return tiles
+    if kind < 0.4:
+        # Random tiles, which are usually not a winning hand.
+        tiles = []
+        while len(tiles) < 3 * meld_count + 2:
+            taken = supply.take(rng.choice(supply.tile_values), 1)
+            if taken is not None:
+                tiles += taken
+        return tiles
+    return _generate_melds(rng, supply, meld_count)
+
+
+def generate_win(rng: random.Random) -> Win:
+    """
+    Generate a random :py:class:`Win`.
+
+    Most wins have a winning hand (a standard hand, seven pairs or thirteen
+    orphans), but the hand is not checked and some hands are not winning.
+    The winning tile is the last tile of the hand.
+
+    :param rng: The random number generator to use.
+    """
+    while True:
+        player_count = rng.choice([3, 4])
+        deck, flowers = (
+            (three_player_deck, three_player_flowers)
+            if player_count == 3
+            else (four_player_deck, four_player_flowers)
+        )
+        supply = _TileSupply(sorted({get_tile_value(tile) for tile in deck}))
+        calls: list[Call] = []
+        for _ in range(rng.choice([0, 0, 0, 1, 2, 3, 4])):
+            call = _generate_call(rng, supply, rng.randrange(player_count))
+            if call is not None:
+                calls.append(call)
+        hand = _generate_hand(rng, supply, 4 - len(calls))
+        if hand is None:
+            continue
+        rng.shuffle(hand)
+        win_flowers = rng.sample(flowers, rng.randint(0, len(flowers)))
+        if win_flowers and rng.random() < 0.02:
+            # A flower that was not replaced.
+            hand.insert(rng.randrange(len(hand)), win_flowers.pop())
+        win_player = rng.randrange(player_count)
+        return Win(
+            win_player=win_player,
+            lose_player=rng.choice(
+                [None, (win_player + rng.randint(1, player_count - 1)) % player_count]
+            ),
+            hand=hand,
+            calls=calls,
+            flowers=win_flowers,
+            player_count=player_count,
+            wind_round=rng.randrange(4),
+            sub_round=rng.randrange(player_count),
+            draw_count=rng.randrange(3),
+            after_flower_count=int(rng.random() < 0.1),
+            after_kan_count=int(rng.random() < 0.1),
+            is_riichi=rng.random() < 0.2,
+            is_double_riichi=rng.random() < 0.05,
+            is_ippatsu=rng.random() < 0.05,
+            is_chankan=rng.random() < 0.05,
+            is_haitei=rng.random() < 0.05,
+            is_houtei=rng.random() < 0.05,
+            is_tenhou=rng.random() < 0.02,
+            is_chiihou=rng.random() < 0.02,
+        )
+
+
+_expected_exceptions = (ValueError, LookupError)
+"""
+The exceptions that the implementations are expected to raise on hands they
+do not accept. Other exceptions are not compared, and stop the fuzz run.
+"""
+
+
+def _outcome(func: Callable[[], Hashable]) -> Hashable:
+    """
+    Return the result of a function, or the type of the exception it raised
+    if it is one of :py:data:`_expected_exceptions`.
+    """
+    try:
+        return ("result", func())
+    except _expected_exceptions as exception:
+        return ("error", type(exception).__name__)
+
+
+_MeldShape = tuple[MeldType, tuple[TileValue, ...], int]
+
+
+def _formed_hand_shape(formed_hand: list[Meld]) -> tuple[_MeldShape, ...]:
+    return tuple(
+        sorted(
+            (
+                meld.meld_type,
+                tuple(get_tile_value(tile) for tile in meld.tiles),
+                -1 if meld.winning_tile_index is None else meld.winning_tile_index,
+            )
+            for meld in formed_hand
+        )
+    )
+
+
+def _get_formed_hand_shapes(
+    formed_hands: list[list[Meld]], tiles: list[TileId]
+) -> Hashable:
+    for formed_hand in formed_hands:
+        if sorted(tile for meld in formed_hand for tile in meld.tiles) != sorted(tiles):
+            raise ValueError("Formed hand does not use the hand's tiles")
+        winning_tile_count = sum(
+            meld.winning_tile_index is not None
+            and meld.tiles[meld.winning_tile_index] == tiles[-1]
+            for meld in formed_hand
+        )
+        if winning_tile_count != 1:
+            raise ValueError("Formed hand does not mark the winning tile once")
+    return tuple(
+        sorted(_formed_hand_shape(formed_hand) for formed_hand in formed_hands)
+    )
+
+
+def check_is_winning(win: Win) -> bool:
+    "Check :py:func:`.form_hand.is_winning` against the reference."
+    return _outcome(lambda: is_winning(win.hand)) == _outcome(
+        lambda: reference_form_hand.is_winning(win.hand)
+    )
+
+
+def check_formed_hands(win: Win) -> bool:
+    """
+    Check :py:func:`.form_hand.formed_hand_possibilities` against the reference,
+    comparing the melds' tile values and winning tile indices.
+    """
+    return _outcome(
+        lambda: _get_formed_hand_shapes(formed_hand_possibilities(win.hand), win.hand)
+    ) == _outcome(
+        lambda: _get_formed_hand_shapes(
+            reference_form_hand.formed_hand_possibilities(win.hand), win.hand
+        )
+    )
+
+
+def check_waits(win: Win) -> bool:
+    "Check :py:func:`.form_hand.get_waits` on the hand without its last tile."
+    tiles = win.hand[:-1]
+    return _outcome(lambda: get_waits(tiles)) == _outcome(
+        lambda: reference_form_hand.get_waits(tiles)
+    )
+
+
+def _get_hand_waits(win: Win) -> frozenset[TileValue]:
+    hand = Hand(0, Deck(tiles=[]), DiscardPool())
+    hand._calls.extend(win.calls)
+    hand._set_tiles(win.hand[:-1])
+    return hand.waits
+
+
+def _get_reference_hand_waits(win: Win) -> frozenset[TileValue]:
+    tiles = win.hand[:-1]
+    tile_values = [
+        get_tile_value(tile)
+        for tile in tiles
+        + [tile for call in win.calls for tile in get_call_tiles(call)]
+    ]
+    return reference_form_hand.get_waits(tiles) - {
+        tile_value for tile_value in tile_values if tile_values.count(tile_value) >= 4
+    }
+
+
+def check_hand_waits(win: Win) -> bool:
+    """
+    Check :py:attr:`.Hand.waits` (which leaves out tiles the player holds
+    all copies of, including in calls) on the hand without its last tile.
+    """
+    return _outcome(lambda: _get_hand_waits(win)) == _outcome(
+        lambda: _get_reference_hand_waits(win)
+    )
+
+
+def check_score(win: Win) -> bool:
+    """
+    Check :py:meth:`.Scorer.score` against the reference for every
+    options in :py:data:`fuzz_options`, both before and after the
+    result is cached. Hands that are not winning are not checked.
+    """
+    if not reference_form_hand.is_winning(win.hand):
+        return True
+    for options in fuzz_options:
+        options = options.model_copy(update={"player_count": win.player_count})
+        expected = _outcome(partial(reference_scoring.score, win, options))
+        for _ in range(2):
+            if _outcome(partial(Scorer.score, win, options)) != expected:
+                return False
+    return True
+
+
+fuzz_checks: dict[str, FuzzCheck] = {
+    "is_winning": check_is_winning,
+    "formed_hands": check_formed_hands,
+    "waits": check_waits,
+    "hand_waits": check_hand_waits,
+    "score": check_score,
+}
+"A dictionary containing each check the fuzzer runs, indexed by name."
+
+
+def _get_smaller_wins(win: Win) -> list[Win]:
+    "Return the wins obtained by removing or resetting one part of a win."
+    smaller_wins: list[Win] = []
+    for index in range(len(win.calls)):
+        smaller_wins.append(
+            win.model_copy(update={"calls": win.calls[:index] + win.calls[index + 1 :]})
+        )
+    for index in range(len(win.flowers)):
+        smaller_wins.append(
+            win.model_copy(
+                update={"flowers": win.flowers[:index] + win.flowers[index + 1 :]}
+            )
+        )
+    for index in range(len(win.hand)):
+        smaller_wins.append(
+            win.model_copy(update={"hand": win.hand[:index] + win.hand[index + 1 :]})
+        )
+    for name, field in Win.model_fields.items():
+        if not field.is_required() and getattr(win, name) != field.default:
+            smaller_wins.append(win.model_copy(update={name: field.default}))
+    if win.lose_player is not None:
+        smaller_wins.append(win.model_copy(update={"lose_player": None}))
+    return smaller_wins
+
+
+def shrink_win(win: Win, check: FuzzCheck) -> Win:
+    """
+    Shrink a win that fails a check, by repeatedly removing calls, flowers
+    and tiles and resetting fields to their defaults while the check
+    still fails.
+
+    :param win: The failing :py:class:`Win`.
+    :param check: The check that the win fails.
+    :return: A win that fails the check, and fails it with any one part
+             removed or reset.
+    """
+    while True:
+        for smaller_win in _get_smaller_wins(win):
+            if not check(smaller_win):
+                win = smaller_win
+                break
+        else:
+            return win
+
+
+@final
+class FuzzFailure(BaseModel, frozen=True):
+    "Represents a case that failed one of the fuzz checks."
+
+    seed: int
+    "The seed of the fuzz run."
+    case_index: int
+    "The index of the failing case in the fuzz run."
+    check: str
+    "The name of the failed check."
+    win: Win
+    "The failing :py:class:`Win`, after shrinking."
+
+
+def get_case_rng(seed: int, case_index: int) -> random.Random:
+    "Return the random number generator used to generate a case."
+    return random.Random(f"{seed}:{case_index}")
+
+
+def run_cases(
+    seed: int,
+    start: int,
+    count: int,
+    checks: dict[str, FuzzCheck] = fuzz_checks,
+) -> list[FuzzFailure]:
+    """
+    Generate and check some cases of a fuzz run.
+
+    :param seed: The seed of the fuzz run.
+    :param start: The index of the first case to check.
+    :param count: The number of cases to check.
+    :param checks: The checks to run on each case.
+    :return: A list of the failures, shrunk to small cases.
+    """
+    failures: list[FuzzFailure] = []
+    for case_index in range(start, start + count):
+        win = generate_win(get_case_rng(seed, case_index))
+        for name, check in checks.items():
+            if not check(win):
+                failures.append(
+                    FuzzFailure(
+                        seed=seed,
+                        case_index=case_index,
+                        check=name,
+                        win=shrink_win(win, check),
+                    )
+                )
+    return failures
+
+
+def _run_chunk(seed: int, start: int, count: int) -> list[FuzzFailure]:
+    return run_cases(seed, start, count)
+
+
+parser = argparse.ArgumentParser(
+    prog="python -m tests.fuzz",
+    description="Compare the hand evaluation code against reference implementations"
+    + " on random hands",
+)
+parser.add_argument("--seed", type=int, default=0, help="seed of the fuzz run")
+parser.add_argument("--count", type=int, default=10000, help="number of cases to check")
+parser.add_argument(
+    "--jobs",
+    type=int,
+    default=os.cpu_count() or 1,
+    help="number of processes to run the cases in",
+)
+parser.add_argument(
+    "--chunk-size", type=int, default=200, help="number of cases per task"
+)
+
+
+def main() -> None:
+    args = parser.parse_args()
+    chunks = [
+        (args.seed, start, min(args.chunk_size, args.count - start))
+        for start in range(0, args.count, args.chunk_size)
+    ]
+    failures: list[FuzzFailure] = []
+    with Pool(args.jobs) as pool:
+        for chunk_failures in pool.starmap(_run_chunk, chunks):
+            failures += chunk_failures
+    for failure in failures:
+        print(failure.model_dump_json())
+    print(f"Checked {args.count} cases with seed {args.seed}: {len(failures)} failures")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
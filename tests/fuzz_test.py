@@ -0,0 +1,56 @@
+import unittest
+
+from tests.fuzz import (
+    fuzz_checks,
+    generate_win,
+    get_case_rng,
+    run_cases,
+    shrink_win,
+)
+from zundamahjong.mahjong.tile import get_tile_value
+from zundamahjong.mahjong.win import Win
+
+
+class FuzzTest(unittest.TestCase):
+    def test_cases_are_reproducible(self) -> None:
+        self.assertEqual(
+            generate_win(get_case_rng(3, 14)), generate_win(get_case_rng(3, 14))
+        )
+
+    def test_checks_pass(self) -> None:
+        self.assertListEqual(run_cases(seed=0, start=0, count=200), [])
+
+    def test_all_checks_run(self) -> None:
+        self.assertSetEqual(
+            set(fuzz_checks),
+            {"is_winning", "formed_hands", "waits", "hand_waits", "score"},
+        )
+
+    def test_shrink(self) -> None:
+        def check(win: Win) -> bool:
+            return 5 not in [get_tile_value(tile) for tile in win.hand]
+
+        win = Win(
+            win_player=0,
+            lose_player=1,
+            hand=[10, 20, 30, 40, 50, 60, 70, 80, 90, 310, 311, 312, 320, 321],
+            calls=[],
+            flowers=[410],
+            player_count=4,
+            wind_round=0,
+            sub_round=0,
+            is_riichi=True,
+        )
+        self.assertEqual(
+            shrink_win(win, check),
+            Win(
+                win_player=0,
+                lose_player=None,
+                hand=[50],
+                calls=[],
+                flowers=[],
+                player_count=4,
+                wind_round=0,
+                sub_round=0,
+            ),
+        )
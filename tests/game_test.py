@@ -3,9 +3,9 @@ import unittest
 from tests.decks import test_deck2, test_deck4, test_deck6
 from zundamahjong.mahjong.action import ActionType, HandTileAction, SimpleAction
 from zundamahjong.mahjong.exceptions import InvalidOperationException
-from zundamahjong.mahjong.game import Game
+from zundamahjong.mahjong.game import Game, get_round_rng
 from zundamahjong.mahjong.game_options import GameOptions
-from zundamahjong.mahjong.round import RoundStatus
+from zundamahjong.mahjong.round import Round, RoundStatus
 
 
 class GameTest(unittest.TestCase):
@@ -186,3 +186,47 @@ class GameTest(unittest.TestCase):
         game.round.do_action(0, SimpleAction(action_type=ActionType.TSUMO))
         assert game.win is not None
         self.assertEqual(game.win.draw_count, 2)
+
+    def _play_default_actions(self, game: Game) -> None:
+        round = game.round
+        while round.status != RoundStatus.END:
+            actions = [action_set.default for action_set in round.allowed_actions]
+            playeraction = round.get_priority_action(actions)
+            assert playeraction is not None
+            round.do_action(*playeraction)
+
+    def test_seeded_decks(self) -> None:
+        game1 = Game(seed=12)
+        game2 = Game(seed=12)
+        self.assertEqual(game1.seed, 12)
+        self.assertSequenceEqual(game1.round.get_hand(0), game2.round.get_hand(0))
+        self.assertEqual(game1.round.history, game2.round.history)
+        self._play_default_actions(game1)
+        self._play_default_actions(game2)
+        game1.start_next_round()
+        game2.start_next_round()
+        self.assertEqual(game1.round_index, 1)
+        self.assertSequenceEqual(game1.round.get_hand(0), game2.round.get_hand(0))
+
+    def test_round_decks_differ(self) -> None:
+        game = Game(seed=12)
+        first_hand = list(game.round.get_hand(0))
+        self._play_default_actions(game)
+        game.start_next_round()
+        self.assertNotEqual(list(game.round.get_hand(0)), first_hand)
+        self.assertNotEqual(
+            list(Game(seed=13).round.get_hand(0)), list(Game(seed=12).round.get_hand(0))
+        )
+
+    def test_regenerate_round(self) -> None:
+        game = Game(seed=5)
+        self._play_default_actions(game)
+        game.start_next_round()
+        round = Round(
+            wind_round=game.wind_round,
+            sub_round=game.sub_round,
+            draw_count=game.draw_count,
+            rng=get_round_rng(game.seed, game.round_index),
+        )
+        self.assertSequenceEqual(round.get_hand(0), game.round.get_hand(0))
+        self.assertEqual(round.wall_count, game.round.wall_count)
@@ -0,0 +1,35 @@
+from unittest import TestCase
+
+from zundamahjong.mahjong.call import ClosedKanCall
+from zundamahjong.mahjong.meld import Meld, MeldType
+from zundamahjong.mahjong.pattern.pattern_calculator import PatternCalculator
+from zundamahjong.mahjong.tile import get_tile_value_mask
+from zundamahjong.mahjong.win import Win
+
+
+class PatternCalculatorTest(TestCase):
+    def test_tile_counts(self) -> None:
+        formed_hand = [
+            Meld(meld_type=MeldType.CHI, tiles=[10, 20, 30], winning_tile_index=0),
+            Meld(meld_type=MeldType.PON, tiles=[220, 221, 222]),
+            Meld(meld_type=MeldType.PON, tiles=[350, 351, 352]),
+            Meld(meld_type=MeldType.PAIR, tiles=[310, 311]),
+        ]
+        win = Win(
+            win_player=0,
+            lose_player=None,
+            hand=[tile for meld in formed_hand for tile in meld.tiles],
+            calls=[ClosedKanCall(tiles=(360, 361, 362, 363))],
+            flowers=[],
+            player_count=4,
+            wind_round=0,
+            sub_round=0,
+        )
+        calculator = PatternCalculator(win, formed_hand)
+        self.assertEqual(calculator.tile_counts[36], 4)
+        self.assertEqual(
+            calculator.tile_mask, get_tile_value_mask([1, 2, 3, 22, 31, 35, 36])
+        )
+        self.assertEqual(calculator.capped_wind_count, 2)
+        self.assertEqual(calculator.capped_dragon_count, 6)
+        self.assertSetEqual(calculator.meld_start_tiles, {1, 22, 35, 36})
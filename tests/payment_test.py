@@ -0,0 +1,64 @@
+import unittest
+
+from zundamahjong.mahjong.game_options import GameOptions, ScoreLimit
+from zundamahjong.mahjong.payment import (
+    PaymentTable,
+    get_payment_table,
+    max_default_han,
+)
+
+
+class PaymentTableTest(unittest.TestCase):
+    def test_payment(self) -> None:
+        payment = PaymentTable(GameOptions()).get_payment(2, 25)
+        self.assertEqual(payment.base_score, 400.0)
+        self.assertEqual(payment.dealer_ron, 2400.0)
+        self.assertEqual(payment.nondealer_ron, 1600.0)
+        self.assertEqual(payment.dealer_tsumo, 800.0)
+        self.assertEqual(payment.nondealer_tsumo_nondealer, 400.0)
+        self.assertEqual(payment.nondealer_tsumo_dealer, 800.0)
+
+    def test_limits(self) -> None:
+        payment_table = PaymentTable(
+            GameOptions(
+                base_score_limits=[
+                    ScoreLimit(han=5, score=2000.0),
+                    ScoreLimit(han=8, score=3000.0),
+                ]
+            )
+        )
+        self.assertEqual(payment_table.get_payment(4, 25).base_score, 1600.0)
+        self.assertEqual(payment_table.get_payment(4, 40).base_score, 2000.0)
+        self.assertEqual(payment_table.get_payment(7, 25).base_score, 2000.0)
+        self.assertEqual(payment_table.get_payment(20, 25).base_score, 3000.0)
+
+    def test_round_up_points(self) -> None:
+        payment = PaymentTable(
+            GameOptions(round_up_points=True, calculate_fu=True)
+        ).get_payment(1, 30)
+        self.assertEqual(payment.nondealer_ron, 1000.0)
+        self.assertEqual(payment.nondealer_tsumo_nondealer, 300.0)
+
+    def test_grid(self) -> None:
+        grid = PaymentTable(GameOptions()).get_grid()
+        self.assertListEqual(grid.hans, [0, 1, 2, 3, 4, 5, 6])
+        self.assertListEqual(grid.fus, [25])
+        self.assertEqual(grid.payments[6][0].base_score, 6400.0)
+
+    def test_grid_han_capped(self) -> None:
+        payment_table = PaymentTable(
+            GameOptions(base_score_limits=[ScoreLimit(han=200000, score=8000.0)])
+        )
+        grid = payment_table.get_grid()
+        self.assertEqual(grid.hans[-1], max_default_han)
+        self.assertEqual(payment_table.get_payment(200001, 25).base_score, 8000.0)
+
+    def test_tables_shared(self) -> None:
+        self.assertIs(
+            get_payment_table(GameOptions(player_count=3)),
+            get_payment_table(GameOptions(player_count=4)),
+        )
+        self.assertIsNot(
+            get_payment_table(GameOptions()),
+            get_payment_table(GameOptions(round_up_points=True)),
+        )
@@ -0,0 +1,145 @@
+"""
+The original implementation of :py:meth:`zundamahjong.mahjong.scoring.Scorer.score`,
+which scores every formed hand in full, kept as a reference for the
+differential fuzz tests in :py:mod:`tests.fuzz`.
+"""
+
+from math import ceil
+
+from tests.reference_form_hand import formed_hand_possibilities
+from zundamahjong.mahjong.game_options import GameOptions
+from zundamahjong.mahjong.meld import Meld
+from zundamahjong.mahjong.pattern import (
+    PatternData,
+    default_pattern_data,
+    get_pattern_mults,
+)
+from zundamahjong.mahjong.scoring import Scoring
+from zundamahjong.mahjong.win import Win
+
+
+def _round_up_int(value: int, step: int) -> int:
+    return step * ceil(value / step)
+
+
+def _round_up_float(value: float, step: float) -> float:
+    return step * ceil(value / step)
+
+
+def _get_player_scores(
+    win: Win, options: GameOptions, han: int, fu: int
+) -> list[float]:
+    player_count = options.player_count
+    best_score_limit = max(
+        (
+            (score_limit.han, score_limit.score)
+            for score_limit in options.base_score_limits
+            if score_limit.han <= han
+        ),
+        default=None,
+    )
+    if best_score_limit is None:
+        base_score: float = fu * 4 * (1 << han)
+        low_han_max_score = min(
+            (score_limit.score for score_limit in options.base_score_limits),
+            default=None,
+        )
+        if low_han_max_score is not None:
+            base_score = min(base_score, low_han_max_score)
+    else:
+        base_score = best_score_limit[1]
+
+    def pay_in(multiplier: float) -> float:
+        amount = multiplier * base_score
+        if options.round_up_points:
+            amount = _round_up_float(amount, 100)
+        return amount
+
+    if win.lose_player is None:
+        if win.win_player == win.sub_round:
+            player_pay_in_amount = pay_in(options.score_dealer_tsumo_multiplier)
+            player_scores = [-player_pay_in_amount] * player_count
+            player_scores[win.win_player] = player_pay_in_amount * (player_count - 1)
+        else:
+            player_pay_in_amount = pay_in(
+                options.score_nondealer_tsumo_nondealer_multiplier
+            )
+            dealer_pay_in_amount = pay_in(
+                options.score_nondealer_tsumo_dealer_multiplier
+            )
+            player_scores = [-player_pay_in_amount] * player_count
+            player_scores[win.sub_round] = -dealer_pay_in_amount
+            player_scores[win.win_player] = (
+                player_count - 2
+            ) * player_pay_in_amount + dealer_pay_in_amount
+    else:
+        if win.win_player == win.sub_round:
+            player_pay_in_amount = pay_in(options.score_dealer_ron_multiplier)
+        else:
+            player_pay_in_amount = pay_in(options.score_nondealer_ron_multiplier)
+        player_scores = [0.0] * player_count
+        player_scores[win.win_player] = player_pay_in_amount
+        player_scores[win.lose_player] = -player_pay_in_amount
+    return player_scores
+
+
+def _get_formed_hand_scoring(
+    win: Win, options: GameOptions, formed_hand: list[Meld]
+) -> Scoring:
+    pattern_mults = get_pattern_mults(win, formed_hand)
+    patterns = [
+        (
+            pattern,
+            PatternData(
+                display_name=pattern_data.display_name,
+                han=pattern_data.han * pattern_mults[pattern],
+                fu=pattern_data.fu * pattern_mults[pattern],
+            ),
+        )
+        for pattern, pattern_data in (
+            default_pattern_data | options.pattern_data
+        ).items()
+        if pattern in pattern_mults
+    ]
+    han = sum(pattern_data.han for (_, pattern_data) in patterns)
+    if options.calculate_fu:
+        fu = options.base_fu + sum(pattern_data.fu for (_, pattern_data) in patterns)
+        if options.round_up_fu:
+            fu = _round_up_int(fu, 10)
+        if "SEVEN_PAIRS" in pattern_mults and options.seven_pairs_use_fixed_fu:
+            fu = options.seven_pairs_fixed_fu
+    else:
+        fu = options.base_fu
+    return Scoring(
+        win_player=win.win_player,
+        lose_player=win.lose_player,
+        patterns={
+            pattern: pattern_data
+            for (pattern, pattern_data) in patterns
+            if pattern_data.han != 0 or (options.calculate_fu and pattern_data.fu != 0)
+        },
+        han=han,
+        fu=fu,
+        player_scores=_get_player_scores(win, options, han, fu),
+    )
+
+
+def score(win: Win, options: GameOptions) -> Scoring:
+    """
+    Score every formed hand of a win, and return the best scoring.
+
+    :param win: The :py:class:`Win` object to calculate the score for.
+    :param options: The :py:class:`GameOptions` object to use when scoring.
+    """
+    scorings = [
+        _get_formed_hand_scoring(win, options, formed_hand)
+        for formed_hand in formed_hand_possibilities(win.hand)
+    ]
+    return max(
+        scorings,
+        key=lambda scoring: (
+            scoring.player_scores[win.win_player],
+            scoring.han,
+            scoring.fu,
+        ),
+    )
@@ -0,0 +1,148 @@
+import random
+import unittest
+
+from tests.decks import test_deck1, test_deck2
+from zundamahjong.mahjong.action import (
+    Action,
+    ActionType,
+    HandTileAction,
+    OpenCallAction,
+    SimpleAction,
+)
+from zundamahjong.mahjong.game_options import GameOptions
+from zundamahjong.mahjong.round import Round, RoundStatus
+
+
+def get_round_state(round: Round) -> object:
+    return (
+        round.status,
+        round.current_player,
+        round.wall_count,
+        list(round.history),
+        round.win,
+        [discard.model_dump() for discard in round.discards],
+        [
+            (
+                list(round.get_hand(player)),
+                list(round.get_calls(player)),
+                list(round.get_flowers(player)),
+                round.get_riichi_discard_index(player),
+                round.is_furiten(player),
+                round.allowed_actions[player].actions,
+            )
+            for player in range(round.player_count)
+        ],
+    )
+
+
+def play_random_actions(
+    round: Round, rng: random.Random, count: int
+) -> list[tuple[int, Action]]:
+    history_length = len(round.history)
+    while round.status != RoundStatus.END and len(round.history) < (
+        history_length + count
+    ):
+        player_action = round.get_priority_action(
+            [
+                rng.choice(round.allowed_actions[player].actions)
+                for player in range(round.player_count)
+            ]
+        )
+        assert player_action is not None
+        round.do_action(*player_action)
+    return round.history[history_length:]
+
+
+class RoundSnapshotTest(unittest.TestCase):
+    def test_restore(self) -> None:
+        round = Round(tiles=test_deck1)
+        snapshot = round.snapshot()
+        state = get_round_state(round)
+        round.do_action(0, HandTileAction(action_type=ActionType.DISCARD, tile=50))
+        round.do_action(
+            1, OpenCallAction(action_type=ActionType.CHII, other_tiles=(61, 71))
+        )
+        round.restore(snapshot)
+        self.assertEqual(get_round_state(round), state)
+        round.do_action(0, HandTileAction(action_type=ActionType.DISCARD, tile=170))
+        round.do_action(1, SimpleAction(action_type=ActionType.DRAW))
+        self.assertCountEqual(
+            round.get_hand(1),
+            [11, 21, 31, 41, 51, 61, 71, 81, 91, 92, 93, 213, 171, 13],
+        )
+
+    def test_restore_called_discard(self) -> None:
+        round = Round(tiles=test_deck1)
+        round.do_action(0, HandTileAction(action_type=ActionType.DISCARD, tile=50))
+        snapshot = round.snapshot()
+        round.do_action(
+            1, OpenCallAction(action_type=ActionType.CHII, other_tiles=(61, 71))
+        )
+        self.assertTrue(round.discards[0].is_called)
+        round.restore(snapshot)
+        self.assertFalse(round.discards[0].is_called)
+        self.assertTrue(round.discards[0].is_new)
+
+    def test_restore_end(self) -> None:
+        round = Round(tiles=test_deck2)
+        round.do_action(0, HandTileAction(action_type=ActionType.DISCARD, tile=130))
+        snapshot = round.snapshot()
+        round.do_action(2, SimpleAction(action_type=ActionType.RON))
+        win = round.win
+        end_snapshot = round.snapshot()
+        round.restore(snapshot)
+        self.assertEqual(round.status, RoundStatus.DISCARDED)
+        self.assertIsNone(round.win)
+        round.restore(end_snapshot)
+        self.assertEqual(round.status, RoundStatus.END)
+        self.assertEqual(round.win, win)
+
+    def test_clone_is_independent(self) -> None:
+        round = Round(tiles=test_deck1)
+        state = get_round_state(round)
+        clone = round.clone()
+        clone.do_action(0, HandTileAction(action_type=ActionType.DISCARD, tile=50))
+        clone.do_action(
+            1, OpenCallAction(action_type=ActionType.CHII, other_tiles=(61, 71))
+        )
+        self.assertEqual(get_round_state(round), state)
+        self.assertEqual(len(clone.history), len(round.history) + 2)
+
+    def test_clone_does_not_call_callback(self) -> None:
+        ended: list[bool] = []
+        round = Round(tiles=test_deck2, round_end_callback=lambda: ended.append(True))
+        round.do_action(0, HandTileAction(action_type=ActionType.DISCARD, tile=130))
+        clone = round.clone()
+        clone.do_action(2, SimpleAction(action_type=ActionType.RON))
+        self.assertEqual(clone.status, RoundStatus.END)
+        self.assertListEqual(ended, [])
+
+    def test_random_rounds(self) -> None:
+        for seed in range(20):
+            with self.subTest(seed=seed):
+                rng = random.Random(seed)
+                round = Round(
+                    tiles=None,
+                    sub_round=seed % 3,
+                    options=GameOptions(
+                        player_count=3 + seed % 2,
+                        use_flowers=seed % 3 == 0,
+                        auto_replace_flowers=seed % 4 == 0,
+                    ),
+                )
+                play_random_actions(round, rng, rng.randrange(100))
+                snapshot = round.snapshot()
+                state = get_round_state(round)
+                clone = round.clone()
+                actions = play_random_actions(round, rng, 400)
+                end_state = get_round_state(round)
+                self.assertEqual(get_round_state(clone), state)
+                for player, action in actions:
+                    clone.do_action(player, action)
+                self.assertEqual(get_round_state(clone), end_state)
+                play_random_actions(clone, rng, 400)
+                round.restore(snapshot)
+                self.assertEqual(get_round_state(round), state)
+                for player, action in actions:
+                    round.do_action(player, action)
+                self.assertEqual(get_round_state(round), end_state)
@@ -0,0 +1,122 @@
+import random
+import unittest
+
+from tests.decks import test_deck1, test_deck2
+from tests.round_snapshot_test import get_round_state, play_random_actions
+from zundamahjong.mahjong.action import (
+    ActionType,
+    HandTileAction,
+    OpenCallAction,
+    SimpleAction,
+)
+from zundamahjong.mahjong.exceptions import InvalidOperationException
+from zundamahjong.mahjong.game_options import GameOptions
+from zundamahjong.mahjong.round import Round, RoundStatus
+
+
+class RoundUndoTest(unittest.TestCase):
+    def test_undo_discard(self) -> None:
+        round = Round(tiles=test_deck1)
+        state = get_round_state(round)
+        discard = HandTileAction(action_type=ActionType.DISCARD, tile=170)
+        round.do_action(0, discard)
+        self.assertTupleEqual(round.undo(), (0, discard))
+        self.assertEqual(get_round_state(round), state)
+
+    def test_undo_call(self) -> None:
+        round = Round(tiles=test_deck1)
+        round.do_action(0, HandTileAction(action_type=ActionType.DISCARD, tile=50))
+        state = get_round_state(round)
+        round.do_action(
+            1, OpenCallAction(action_type=ActionType.CHII, other_tiles=(61, 71))
+        )
+        round.undo()
+        self.assertEqual(get_round_state(round), state)
+        self.assertFalse(round.discards[0].is_called)
+        round.do_action(1, SimpleAction(action_type=ActionType.DRAW))
+        self.assertCountEqual(
+            round.get_hand(1),
+            [11, 21, 31, 41, 51, 61, 71, 81, 91, 92, 93, 213, 171, 13],
+        )
+
+    def test_undo_win(self) -> None:
+        round = Round(tiles=test_deck2)
+        round.do_action(0, HandTileAction(action_type=ActionType.DISCARD, tile=130))
+        round.do_action(2, SimpleAction(action_type=ActionType.RON))
+        round.undo()
+        self.assertEqual(round.status, RoundStatus.DISCARDED)
+        self.assertIsNone(round.win)
+        round.redo()
+        self.assertEqual(round.status, RoundStatus.END)
+        win = round.win
+        assert win is not None
+        self.assertEqual(win.win_player, 2)
+
+    def test_redo(self) -> None:
+        round = Round(tiles=test_deck1)
+        round.do_action(0, HandTileAction(action_type=ActionType.DISCARD, tile=170))
+        round.do_action(1, SimpleAction(action_type=ActionType.DRAW))
+        state = get_round_state(round)
+        round.undo()
+        round.undo()
+        self.assertTrue(round.can_redo)
+        round.redo()
+        round.redo()
+        self.assertFalse(round.can_redo)
+        self.assertEqual(get_round_state(round), state)
+
+    def test_new_action_clears_redo(self) -> None:
+        round = Round(tiles=test_deck1)
+        round.do_action(0, HandTileAction(action_type=ActionType.DISCARD, tile=170))
+        round.undo()
+        round.do_action(0, HandTileAction(action_type=ActionType.DISCARD, tile=50))
+        self.assertFalse(round.can_redo)
+        with self.assertRaises(InvalidOperationException):
+            round.redo()
+
+    def test_undo_start(self) -> None:
+        round = Round(tiles=test_deck1)
+        round.seek(0)
+        self.assertEqual(round.status, RoundStatus.START)
+        self.assertFalse(round.can_undo)
+        with self.assertRaises(InvalidOperationException):
+            round.undo()
+
+    def test_seek_out_of_range(self) -> None:
+        round = Round(tiles=test_deck1)
+        with self.assertRaises(InvalidOperationException):
+            round.seek(len(round.history) + 1)
+
+    def test_restore_clears_undo(self) -> None:
+        round = Round(tiles=test_deck1)
+        snapshot = round.snapshot()
+        round.do_action(0, HandTileAction(action_type=ActionType.DISCARD, tile=170))
+        round.restore(snapshot)
+        self.assertFalse(round.can_undo)
+
+    def test_random_rounds(self) -> None:
+        for seed in range(15):
+            with self.subTest(seed=seed):
+                rng = random.Random(seed)
+                round = Round(
+                    tiles=None,
+                    sub_round=seed % 3,
+                    options=GameOptions(
+                        player_count=3 + seed % 2,
+                        use_flowers=seed % 3 == 0,
+                        auto_replace_flowers=seed % 4 == 0,
+                    ),
+                )
+                states = [get_round_state(round)]
+                start = len(round.history)
+                while round.status != RoundStatus.END:
+                    play_random_actions(round, rng, 1)
+                    states.append(get_round_state(round))
+                for index in reversed(range(len(states) - 1)):
+                    round.undo()
+                    self.assertEqual(get_round_state(round), states[index])
+                middle = start + (len(states) - 1) // 2
+                round.seek(len(round.history) + len(states) - 1)
+                self.assertEqual(get_round_state(round), states[-1])
+                round.seek(middle)
+                self.assertEqual(get_round_state(round), states[middle - start])
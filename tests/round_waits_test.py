@@ -14,6 +14,7 @@ from zundamahjong.mahjong.action import (
 )
 from zundamahjong.mahjong.call import (
     CallType,
+    ClosedKanCall,
     OpenCall,
 )
 from zundamahjong.mahjong.deck import Deck
@@ -22,7 +23,7 @@ from zundamahjong.mahjong.form_hand import is_winning
 from zundamahjong.mahjong.game_options import GameOptions
 from zundamahjong.mahjong.hand import Hand
 from zundamahjong.mahjong.round import Round
-from zundamahjong.mahjong.tile import N, all_tiles
+from zundamahjong.mahjong.tile import N, all_tiles, get_tile_counts
 
 
 class RoundWaitsTest(unittest.TestCase):
@@ -36,13 +37,26 @@ class RoundWaitsTest(unittest.TestCase):
 
     def test_8_tile_wait(self) -> None:
         hand = Hand(0, Deck(tiles=test_deck1), DiscardPool())
-        hand._tiles = [20, 21, 22, 30, 40, 50, 60, 61, 70, 71, 72, 73, 80]
+        hand._set_tiles([20, 21, 22, 30, 40, 50, 60, 61, 70, 71, 72, 73, 80])
         self.assertSetEqual(hand.waits, frozenset({1, 2, 3, 4, 5, 6, 8, 9}))
 
+    def test_discard_waits_leave_out_called_tiles(self) -> None:
+        hand = Hand(0, Deck(tiles=[]), DiscardPool())
+        hand._calls.append(ClosedKanCall(tiles=(10, 11, 12, 13)))
+        hand._set_tiles([20, 30, 40, 50, 60, 70, 80, 90, 51, 52, 310])
+        self.assertNotIn(1, hand.discard_waits[31])
+        other_hand = Hand(0, Deck(tiles=[]), DiscardPool())
+        other_hand._calls.append(ClosedKanCall(tiles=(10, 11, 12, 13)))
+        other_hand._set_tiles([20, 30, 40, 50, 60, 70, 80, 90, 51, 52])
+        self.assertSetEqual(hand.discard_waits[31], other_hand.waits)
+
 
 class RoundActionsWaitsCheckTest(unittest.TestCase):
     def check_waits(self, round: Round) -> None:
         for hand in round._hands:
+            self.assertListEqual(
+                list(hand.tile_counts), get_tile_counts(hand.tile_values)
+            )
             self.assertSetEqual(
                 hand.waits,
                 {
@@ -3,7 +3,7 @@ import unittest
 from zundamahjong.mahjong.call import CallType, OpenCall
 from zundamahjong.mahjong.game_options import GameOptions, ScoreLimit
 from zundamahjong.mahjong.pattern import PatternData
-from zundamahjong.mahjong.scoring import Scorer
+from zundamahjong.mahjong.scoring import Scorer, ScoringCache, scoring_cache
 from zundamahjong.mahjong.win import Win
 
 
@@ -415,3 +415,219 @@ class ScoringTest(unittest.TestCase):
         )
         self.assertEqual(scoring.han, 2)
         self.assertSequenceEqual(scoring.player_scores, [30000.0, -30000.0, 0.0, 0.0])
+
+
+class BestFormedHandTest(unittest.TestCase):
+    def test_best_formed_hand_chosen(self) -> None:
+        win = Win(
+            win_player=0,
+            lose_player=1,
+            hand=[10, 11, 12, 20, 21, 22, 30, 31, 32, 40, 41, 42, 50, 51],
+            calls=[],
+            flowers=[],
+            player_count=4,
+            wind_round=0,
+            sub_round=0,
+        )
+        scoring = Scorer.score(win, GameOptions())
+        self.assertIn("FOUR_CONCEALED_TRIPLETS_1_SIDED_WAIT", scoring.patterns)
+        self.assertNotIn("PURE_TRIPLE_SEQUENCE", scoring.patterns)
+        self.assertEqual(scoring.han, 25)
+
+    def test_identical_placements_tie(self) -> None:
+        # The winning tile can be placed in either identical sequence,
+        # and the first formed hand is kept.
+        win = Win(
+            win_player=0,
+            lose_player=1,
+            hand=[10, 11, 20, 21, 31, 150, 151, 152, 290, 291, 292, 330, 331, 30],
+            calls=[],
+            flowers=[],
+            player_count=4,
+            wind_round=0,
+            sub_round=0,
+        )
+        scoring = Scorer.score(win, GameOptions(calculate_fu=True))
+        self.assertIn("PURE_DOUBLE_SEQUENCE", scoring.patterns)
+
+
+class ScoringThresholdTest(unittest.TestCase):
+    seven_pairs_win = Win(
+        win_player=0,
+        lose_player=1,
+        hand=[30, 31, 40, 41, 90, 91, 150, 151, 210, 211, 220, 221, 310, 311],
+        calls=[],
+        flowers=[420],
+        player_count=4,
+        wind_round=0,
+        sub_round=0,
+    )
+
+    def test_reaches_han_matches_score(self) -> None:
+        options = GameOptions()
+        han = Scorer.score(self.seven_pairs_win, options).han
+        self.assertTrue(Scorer.reaches_han(self.seven_pairs_win, options, han))
+        self.assertFalse(Scorer.reaches_han(self.seven_pairs_win, options, han + 1))
+
+    def test_reaches_zero_han(self) -> None:
+        self.assertTrue(Scorer.reaches_han(self.seven_pairs_win, GameOptions(), 0))
+
+    def test_reaches_zero_han_with_fu_skips_scoring(self) -> None:
+        scoring_cache.clear()
+        options = GameOptions(calculate_fu=True)
+        self.assertTrue(Scorer.reaches_han(self.seven_pairs_win, options, 0))
+        self.assertEqual(scoring_cache.misses, 0)
+
+    def test_negative_han_does_not_reach_zero_han(self) -> None:
+        options = GameOptions(
+            pattern_data={
+                "SEVEN_PAIRS": PatternData(display_name="Seven Pairs", han=-10, fu=0)
+            }
+        )
+        self.assertFalse(Scorer.reaches_han(self.seven_pairs_win, options, 0))
+
+    def test_reaches_han_with_negative_pattern(self) -> None:
+        win = self.seven_pairs_win.model_copy(update={"lose_player": None})
+        options = GameOptions(
+            pattern_data={
+                "NO_CALLS_TSUMO": PatternData(
+                    display_name="No Calls Tsumo", han=-1, fu=0
+                )
+            }
+        )
+        self.assertEqual(Scorer.score(win, options).han, 2)
+        self.assertTrue(Scorer.reaches_han(win, options, 2))
+        self.assertFalse(Scorer.reaches_han(win, options, 3))
+
+    def test_reaches_han_with_fu(self) -> None:
+        options = GameOptions(calculate_fu=True)
+        han = Scorer.score(self.seven_pairs_win, options).han
+        self.assertTrue(Scorer.reaches_han(self.seven_pairs_win, options, han))
+        self.assertFalse(Scorer.reaches_han(self.seven_pairs_win, options, han + 1))
+
+    def test_reaches_han_with_decreasing_limits(self) -> None:
+        options = GameOptions(
+            base_score_limits=[
+                ScoreLimit(han=1, score=8000.0),
+                ScoreLimit(han=3, score=2000.0),
+            ]
+        )
+        han = Scorer.score(self.seven_pairs_win, options).han
+        self.assertTrue(Scorer.reaches_han(self.seven_pairs_win, options, han))
+        self.assertFalse(Scorer.reaches_han(self.seven_pairs_win, options, han + 1))
+
+    def test_has_pattern(self) -> None:
+        options = GameOptions()
+        self.assertTrue(
+            Scorer.has_pattern(self.seven_pairs_win, options, "SEVEN_PAIRS")
+        )
+        self.assertFalse(
+            Scorer.has_pattern(self.seven_pairs_win, options, "THIRTEEN_ORPHANS")
+        )
+        self.assertFalse(Scorer.has_pattern(self.seven_pairs_win, options, "UNKNOWN"))
+
+
+class ScoredPatternsTest(unittest.TestCase):
+    def test_zero_patterns_skipped(self) -> None:
+        scored_patterns = GameOptions().get_scored_patterns()
+        self.assertIn("SEVEN_PAIRS", scored_patterns)
+        self.assertNotIn("OPEN_WAIT", scored_patterns)
+        self.assertNotIn("ORPHAN_CLOSED_TRIPLET", scored_patterns)
+
+    def test_fu_patterns_scored(self) -> None:
+        scored_patterns = GameOptions(calculate_fu=True).get_scored_patterns()
+        self.assertIn("ORPHAN_CLOSED_TRIPLET", scored_patterns)
+
+    def test_scored_patterns_follow_options(self) -> None:
+        options = GameOptions()
+        self.assertIn("SEVEN_PAIRS", options.get_scored_patterns())
+        options.pattern_data = {
+            "SEVEN_PAIRS": PatternData(display_name="Seven Pairs", han=0, fu=0)
+        }
+        self.assertNotIn("SEVEN_PAIRS", options.get_scored_patterns())
+        options.calculate_fu = True
+        self.assertIn("SEVEN_PAIRS", options.get_scored_patterns())
+
+    def test_scoring_key_follows_options(self) -> None:
+        options = GameOptions()
+        scoring_key = options.get_scoring_key()
+        self.assertEqual(options.get_scoring_key(), scoring_key)
+        options.pattern_data["SEVEN_PAIRS"].han += 1
+        self.assertNotEqual(options.get_scoring_key(), scoring_key)
+        options.pattern_data["SEVEN_PAIRS"].han -= 1
+        self.assertEqual(options.get_scoring_key(), scoring_key)
+        options.round_up_points = True
+        self.assertNotEqual(options.get_scoring_key(), scoring_key)
+        self.assertEqual(
+            options.get_scoring_key(),
+            GameOptions(round_up_points=True).get_scoring_key(),
+        )
+
+    def test_cache_does_not_affect_equality(self) -> None:
+        options = GameOptions()
+        options.get_scored_patterns()
+        self.assertEqual(options, GameOptions())
+
+
+class ScoringCacheTest(unittest.TestCase):
+    win = ScoringThresholdTest.seven_pairs_win
+
+    def setUp(self) -> None:
+        scoring_cache.clear()
+
+    def test_repeated_score_hits(self) -> None:
+        options = GameOptions()
+        scoring = Scorer.score(self.win, options)
+        self.assertEqual(scoring_cache.misses, 1)
+        self.assertEqual(Scorer.score(self.win, options), scoring)
+        self.assertEqual(scoring_cache.hits, 1)
+
+    def test_same_values_hit(self) -> None:
+        options = GameOptions()
+        Scorer.reaches_han(self.win, options, 1)
+        other_win = self.win.model_copy(
+            update={"hand": [31, 30, 41, 40] + self.win.hand[4:]}
+        )
+        Scorer.reaches_han(other_win, options, 1)
+        self.assertEqual(scoring_cache.hits, 1)
+
+    def test_different_options_miss(self) -> None:
+        Scorer.score(self.win, GameOptions())
+        Scorer.score(self.win, GameOptions(calculate_fu=True))
+        self.assertEqual(scoring_cache.misses, 2)
+
+    def test_copied_options_miss(self) -> None:
+        options = GameOptions()
+        player_scores = Scorer.score(self.win, options).player_scores
+        copied_options = options.model_copy(update={"score_dealer_ron_multiplier": 100})
+        self.assertNotEqual(
+            Scorer.score(self.win, copied_options).player_scores, player_scores
+        )
+        self.assertEqual(scoring_cache.misses, 2)
+
+    def test_options_changed_in_place_miss(self) -> None:
+        options = GameOptions()
+        player_scores = Scorer.score(self.win, options).player_scores
+        options.pattern_data["SEVEN_PAIRS"].han += 1
+        self.assertNotEqual(
+            Scorer.score(self.win, options).player_scores, player_scores
+        )
+        self.assertEqual(scoring_cache.misses, 2)
+
+    def test_returned_scoring_is_a_copy(self) -> None:
+        options = GameOptions()
+        Scorer.score(self.win, options).player_scores[0] = 0.0
+        self.assertNotEqual(Scorer.score(self.win, options).player_scores[0], 0.0)
+
+    def test_least_recently_used_evicted(self) -> None:
+        cache = ScoringCache(maxsize=2)
+        options = GameOptions()
+        for query in ["a", "b", "a", "c", "a", "b"]:
+
+            def calculate(query: str = query) -> str:
+                return query
+
+            cache.get(self.win, options, query, calculate)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(cache.misses, 4)
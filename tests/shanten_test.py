@@ -0,0 +1,96 @@
+import unittest
+from collections.abc import Sequence
+
+from tests.decks import test_deck2
+from zundamahjong.mahjong.game_options import GameOptions
+from zundamahjong.mahjong.round import Round
+from zundamahjong.mahjong.shanten import ShantenInfo, get_shanten, get_shanten_info
+from zundamahjong.mahjong.tile import (
+    N,
+    TileValue,
+    get_tile_value,
+    tile_id_is_flower,
+)
+
+
+class ShantenTest(unittest.TestCase):
+    def get_values_shanten_info(
+        self, values: list[TileValue], visible_values: Sequence[TileValue] = ()
+    ) -> ShantenInfo:
+        return get_shanten_info(
+            [value * N for value in values], [value * N for value in visible_values]
+        )
+
+    def test_complete(self) -> None:
+        self.assertEqual(
+            get_shanten([1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 12, 13, 31, 31]), -1
+        )
+
+    def test_tenpai(self) -> None:
+        info = self.get_values_shanten_info([1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 12, 31, 31])
+        self.assertEqual(info.shanten, 0)
+        self.assertSetEqual(info.useful_tiles, {13})
+        self.assertEqual(info.ukeire, 4)
+
+    def test_one_shanten(self) -> None:
+        info = self.get_values_shanten_info([1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 12, 31, 32])
+        self.assertEqual(info.shanten, 1)
+        self.assertSetEqual(info.useful_tiles, {13, 31, 32})
+
+    def test_calls(self) -> None:
+        info = self.get_values_shanten_info([4, 5, 31, 31])
+        self.assertEqual(info.shanten, 0)
+        self.assertSetEqual(info.useful_tiles, {3, 6})
+
+    def test_seven_pairs(self) -> None:
+        info = self.get_values_shanten_info(
+            [1, 1, 3, 3, 5, 5, 8, 8, 11, 11, 14, 14, 37]
+        )
+        self.assertEqual(info.shanten, 0)
+        self.assertSetEqual(info.useful_tiles, {37})
+
+    def test_thirteen_orphans(self) -> None:
+        info = self.get_values_shanten_info(
+            [1, 9, 11, 19, 21, 29, 31, 32, 33, 34, 35, 36, 36]
+        )
+        self.assertEqual(info.shanten, 0)
+        self.assertSetEqual(info.useful_tiles, {37})
+
+    def test_isolated_tiles(self) -> None:
+        self.assertEqual(
+            get_shanten([1, 4, 7, 12, 15, 18, 23, 26, 29, 31, 32, 33, 34]), 6
+        )
+
+    def test_four_of_a_kind_not_useful(self) -> None:
+        info = self.get_values_shanten_info([2, 2, 2, 2])
+        self.assertEqual(info.shanten, 1)
+        self.assertNotIn(2, info.useful_tiles)
+
+    def test_visible_tiles(self) -> None:
+        info = self.get_values_shanten_info(
+            [1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 13, 31, 31], [12, 12, 31]
+        )
+        self.assertSetEqual(info.useful_tiles, {12})
+        self.assertEqual(info.ukeire, 2)
+
+    def test_round_shanten_info(self) -> None:
+        round = Round(tiles=test_deck2)
+        info = round.get_shanten_info(2)
+        self.assertEqual(info.shanten, 0)
+        self.assertSetEqual(info.useful_tiles, {13, 16})
+
+    def test_round_shanten_info_with_flowers(self) -> None:
+        round = Round(tiles=test_deck2, options=GameOptions(auto_replace_flowers=False))
+        hand_tiles = round.get_hand(0)
+        self.assertTrue(any(tile_id_is_flower(tile) for tile in hand_tiles))
+        info = round.get_shanten_info(0)
+        self.assertEqual(
+            info.shanten,
+            get_shanten(
+                [
+                    get_tile_value(tile)
+                    for tile in hand_tiles
+                    if not tile_id_is_flower(tile)
+                ]
+            ),
+        )
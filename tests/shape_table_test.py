@@ -0,0 +1,125 @@
+import hashlib
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from zundamahjong.mahjong.meld import MeldType
+from zundamahjong.mahjong.shape_table import (
+    get_standard_waits,
+    get_suit_decompositions,
+    get_suit_shapes,
+    honour_suit_table,
+    is_complete_hand,
+    load_shape_table_file,
+    number_suit_table,
+    number_suit_waits_table,
+    shape_table_file_version,
+    write_shape_table_file,
+)
+from zundamahjong.mahjong.tile import TileValue
+
+shape_table_file_digests = {
+    1: "312cb04d06201a161c861dd44acfc3e6af8352c2cc7b3cf21ff8041af2a885e4",
+}
+"""
+The SHA-256 digest of the shape table file written for each file version.
+
+When the format or the contents of the tables change, increase
+``shape_table_file_version`` and add the digest of the new file here.
+"""
+
+
+def suit_key(tile_values: list[TileValue]) -> int:
+    suit_shapes = get_suit_shapes(tile_values)
+    assert suit_shapes is not None
+    return sum(suit_shapes[0])
+
+
+class ShapeTableTest(unittest.TestCase):
+    def test_flowers_have_no_shape(self) -> None:
+        self.assertIsNone(get_suit_shapes([1, 2, 3, 41]))
+
+    def test_suit_shapes(self) -> None:
+        self.assertEqual(
+            get_suit_shapes([1, 1, 9, 12, 31, 37]),
+            ([2 + (1 << 24), 1 << 3, 0, 1 + (1 << 18)], [3, 1, 0, 2]),
+        )
+
+    def test_empty_shape(self) -> None:
+        self.assertEqual(get_suit_decompositions(0, 0), ((),))
+
+    def test_incomplete_shape(self) -> None:
+        self.assertNotIn(suit_key([1, 2, 4]), number_suit_table)
+        self.assertNotIn(suit_key([1, 1, 1, 1]), number_suit_table)
+
+    def test_triple_sequence_shape(self) -> None:
+        self.assertEqual(
+            get_suit_decompositions(0, suit_key([1, 1, 1, 2, 2, 2, 3, 3, 3])),
+            (
+                ((MeldType.PON, 0), (MeldType.PON, 1), (MeldType.PON, 2)),
+                ((MeldType.CHI, 0), (MeldType.CHI, 0), (MeldType.CHI, 0)),
+            ),
+        )
+
+    def test_pair_shape(self) -> None:
+        self.assertEqual(
+            get_suit_decompositions(1, suit_key([11, 12, 13, 13, 13])),
+            (((MeldType.PAIR, 2), (MeldType.CHI, 0)),),
+        )
+
+    def test_honours_have_no_sequences(self) -> None:
+        self.assertIn(suit_key([31, 31, 31]), honour_suit_table)
+        self.assertNotIn(suit_key([31, 32, 33]), honour_suit_table)
+
+    def test_complete_hand_needs_one_pair(self) -> None:
+        suit_shapes = get_suit_shapes([1, 1, 2, 3, 4, 11, 11, 31, 31, 31, 35, 35])
+        assert suit_shapes is not None
+        self.assertFalse(is_complete_hand(*suit_shapes))
+
+    def test_waits_table(self) -> None:
+        self.assertEqual(number_suit_waits_table[suit_key([2, 3])], 0b1001)
+        self.assertEqual(number_suit_waits_table[suit_key([1, 1, 1, 2])], 0b110)
+        self.assertNotIn(suit_key([1, 5]), number_suit_waits_table)
+
+    def test_standard_waits_across_suits(self) -> None:
+        suit_shapes = get_suit_shapes([2, 2, 12, 13, 14, 35, 35])
+        assert suit_shapes is not None
+        self.assertCountEqual(get_standard_waits(*suit_shapes), [2, 35])
+
+
+class ShapeTableFileTest(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "shape_table.bin"
+            write_shape_table_file(path)
+            tables = load_shape_table_file(path)
+        assert tables is not None
+        mapped_table, _, mapped_waits_table, _ = tables
+        self.assertEqual(len(mapped_table), len(number_suit_table))
+        key = suit_key([1, 1, 1, 2, 2, 2, 3, 3, 3])
+        self.assertEqual(mapped_table[key], number_suit_table[key])
+        self.assertNotIn(suit_key([1, 2, 4]), mapped_table)
+        self.assertEqual(mapped_table.get(suit_key([1, 2, 4]), ()), ())
+        self.assertEqual(mapped_waits_table[suit_key([2, 3])], 0b1001)
+
+    def test_missing_file(self) -> None:
+        with TemporaryDirectory() as directory:
+            self.assertIsNone(load_shape_table_file(Path(directory) / "missing.bin"))
+
+    def test_wrong_file(self) -> None:
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "shape_table.bin"
+            path.write_bytes(b"not a shape table")
+            self.assertIsNone(load_shape_table_file(path))
+
+    def test_file_version_matches_contents(self) -> None:
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "shape_table.bin"
+            write_shape_table_file(path)
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self.assertEqual(
+            digest,
+            shape_table_file_digests.get(shape_table_file_version),
+            "the shape table file changed; increase shape_table_file_version "
+            "and record the new digest",
+        )
@@ -0,0 +1,79 @@
+import unittest
+from random import Random
+
+from zundamahjong.mahjong.action import Action
+from zundamahjong.mahjong.game_options import GameOptions
+from zundamahjong.mahjong.round import Round, RoundStatus
+from zundamahjong.mahjong.simulator import (
+    policies,
+    run_simulation,
+    simulate_game,
+)
+
+
+class SimulatorTest(unittest.TestCase):
+    def test_games_are_reproducible(self) -> None:
+        options = GameOptions(use_flowers=True)
+        self.assertListEqual(
+            simulate_game(
+                2, seed=5, options=options, policy_names=["greedy", "random"]
+            ),
+            simulate_game(
+                2, seed=5, options=options, policy_names=["greedy", "random"]
+            ),
+        )
+
+    def test_run_simulation(self) -> None:
+        options = GameOptions(player_count=3)
+        games = list(
+            run_simulation(
+                3, seed=1, options=options, policy_names=["greedy"], workers=1
+            )
+        )
+        self.assertListEqual([results[0].game_index for results in games], [0, 1, 2])
+        for results in games:
+            self.assertListEqual(
+                [result.round_index for result in results],
+                list(range(len(results))),
+            )
+            for result in results:
+                self.assertEqual(sum(result.player_scores), 0)
+                self.assertEqual(result.win_player is None, result.han is None)
+                if result.win_player is None:
+                    self.assertListEqual(result.patterns, [])
+                else:
+                    self.assertNotEqual(result.win_player, result.lose_player)
+
+    def test_max_rounds(self) -> None:
+        results = simulate_game(
+            0,
+            seed=0,
+            options=GameOptions(),
+            policy_names=["tsumogiri"],
+            max_rounds=3,
+        )
+        self.assertLessEqual(len(results), 3)
+
+    def test_unknown_policy(self) -> None:
+        with self.assertRaises(ValueError):
+            list(
+                run_simulation(
+                    1, seed=0, options=GameOptions(), policy_names=["unknown"]
+                )
+            )
+
+    def test_policies_choose_allowed_actions(self) -> None:
+        rng = Random(0)
+        for name, policy in policies.items():
+            with self.subTest(policy=name):
+                round = Round(options=GameOptions(use_flowers=True))
+                while round.status != RoundStatus.END:
+                    actions: list[Action] = []
+                    for player in range(round.player_count):
+                        allowed_actions = round.allowed_actions[player].actions
+                        action = policy(round, player, allowed_actions, rng)
+                        self.assertIn(action, allowed_actions)
+                        actions.append(action)
+                    player_action = round.get_priority_action(actions)
+                    assert player_action is not None
+                    round.do_action(*player_action)
@@ -1,6 +1,6 @@
 import unittest
 
-from zundamahjong.mahjong.form_hand import get_waits
+from zundamahjong.mahjong.form_hand import get_discard_waits, get_waits
 from zundamahjong.mahjong.tile import N, TileValue
 
 
@@ -140,6 +140,12 @@ class TenpaiTest(unittest.TestCase):
             {15},
         )
 
+    def test_seven_pairs_four_of_a_kind(self) -> None:
+        self.assertSetEqual(
+            self.get_values_waits([1, 1, 1, 1, 3, 3, 5, 5, 8, 8, 11, 11, 14]),
+            frozenset(),
+        )
+
     def test_thirteen_orphans(self) -> None:
         self.assertSetEqual(
             self.get_values_waits([1, 9, 9, 11, 19, 21, 31, 32, 33, 34, 35, 36, 37]),
@@ -151,3 +157,27 @@ class TenpaiTest(unittest.TestCase):
             self.get_values_waits([1, 9, 11, 19, 21, 29, 31, 32, 33, 34, 35, 36, 37]),
             {1, 9, 11, 19, 21, 29, 31, 32, 33, 34, 35, 36, 37},
         )
+
+
+class DiscardWaitsTest(unittest.TestCase):
+    def test_discard_waits(self) -> None:
+        tiles = [value * N for value in [1, 2, 3, 4, 5, 6, 7, 8, 9, 9, 9, 31, 31, 35]]
+        discard_waits = get_discard_waits(tiles)
+        self.assertSetEqual(discard_waits[35], {3, 6, 9, 31})
+        self.assertSetEqual(discard_waits[31], frozenset())
+        self.assertSetEqual(discard_waits[1], frozenset())
+        self.assertEqual(len(discard_waits), 11)
+
+    def test_discard_waits_match_waits(self) -> None:
+        tiles = [value * N for value in [2, 2, 3, 3, 4, 4, 5, 6, 7, 15, 15, 16, 17, 18]]
+        discard_waits = get_discard_waits(tiles)
+        for index, tile in enumerate(tiles):
+            self.assertSetEqual(
+                discard_waits[tile // N], get_waits(tiles[:index] + tiles[index + 1 :])
+            )
+
+    def test_discard_flower(self) -> None:
+        tiles = [value * N for value in [1, 2, 3, 4, 5, 6, 7, 8, 9, 9, 9, 31, 31, 41]]
+        discard_waits = get_discard_waits(tiles)
+        self.assertSetEqual(discard_waits[41], {3, 6, 9, 31})
+        self.assertSetEqual(discard_waits[31], frozenset())
@@ -0,0 +1,73 @@
+import unittest
+
+from zundamahjong.mahjong.tile import (
+    all_tiles,
+    dragons,
+    flower_flag,
+    get_tile_counts,
+    get_tile_id_counts,
+    get_tile_value_mask,
+    get_tile_values,
+    green_flag,
+    green_mask,
+    green_tiles,
+    honour_flag,
+    honour_mask,
+    number_flag,
+    number_suit_masks,
+    orphan_flag,
+    orphans,
+    simple_mask,
+    terminal_mask,
+    tile_value_flags,
+    tile_value_ranks,
+    tile_value_suits,
+)
+
+
+class TileTest(unittest.TestCase):
+    def test_orphan_flags(self) -> None:
+        self.assertSetEqual(
+            {tile for tile in all_tiles if tile_value_flags[tile] & orphan_flag},
+            set(orphans),
+        )
+
+    def test_green_flags(self) -> None:
+        self.assertSetEqual(
+            {tile for tile in all_tiles if tile_value_flags[tile] & green_flag},
+            set(green_tiles),
+        )
+
+    def test_suit_flags(self) -> None:
+        self.assertEqual(tile_value_flags[15] & number_flag, number_flag)
+        self.assertEqual(tile_value_flags[15] & honour_flag, 0)
+        for tile in dragons:
+            self.assertEqual(tile_value_flags[tile] & honour_flag, honour_flag)
+        self.assertEqual(tile_value_flags[41], flower_flag)
+        self.assertEqual(tile_value_flags[10], 0)
+
+    def test_ranks_and_suits(self) -> None:
+        self.assertEqual(tile_value_ranks[27], 7)
+        self.assertEqual(tile_value_suits[27], 2)
+        self.assertEqual(tile_value_ranks[34], 4)
+        self.assertEqual(tile_value_suits[34], 3)
+
+    def test_tile_id_counts(self) -> None:
+        tiles = [10, 11, 12, 30, 315, 410]
+        self.assertEqual(
+            get_tile_id_counts(tiles), get_tile_counts(get_tile_values(tiles))
+        )
+
+    def test_tile_value_mask(self) -> None:
+        self.assertEqual(get_tile_value_mask([1, 3, 3]), 0b1010)
+        self.assertEqual(get_tile_value_mask(green_tiles), green_mask)
+
+    def test_masks_partition_tiles(self) -> None:
+        self.assertEqual(
+            terminal_mask | honour_mask | simple_mask, get_tile_value_mask(all_tiles)
+        )
+        self.assertEqual(terminal_mask & honour_mask, 0)
+        self.assertEqual(terminal_mask & simple_mask, 0)
+        self.assertEqual(
+            sum(number_suit_masks) | honour_mask, get_tile_value_mask(all_tiles)
+        )